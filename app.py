@@ -1,14 +1,127 @@
 import streamlit as st
-from supabase import create_client, Client
-import os
-from dotenv import load_dotenv
 from datetime import date
+from typing import Any, Callable, Dict, List
+from src.config import METRICS
+from src.dao.customer_dao import CustomerDAO
+from src.dao.event_dao import EventDAO
+from src.dao.booking_dao import BookingDAO
+from src.dao.payment_dao import PaymentDAO
+from src.dao.rollup_dao import RollupDAO
+from src.services.booking_service import BookingService, BookingError
+from src.services.payment_service import PaymentService
+from src.services.customer_service import CustomerService, CustomerError
+from src.services.event_service import EventService
+from src.services.search_index import PrefixIndex
 
 # ---------------- SUPABASE SETUP ----------------
-load_dotenv()
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# DAOs share the pooled client: reruns reuse the same connections instead of reconnecting
+@st.cache_resource
+def get_daos():
+    return CustomerDAO(), EventDAO(), BookingDAO(), PaymentDAO()
+
+@st.cache_resource
+def get_services():
+    # Kept across reruns so the seat inventory and known-email set survive widget interactions
+    customer_dao, event_dao, booking_dao, payment_dao = get_daos()
+    rollups = RollupDAO()
+    payment_service = PaymentService(payment_dao, booking_dao, rollups)
+    return (payment_service, BookingService(booking_dao, event_dao, customer_dao, payment_service, rollups=rollups),
+            CustomerService(customer_dao))
+
+customer_dao, event_dao, booking_dao, payment_dao = get_daos()
+payment_service, booking_service, customer_service = get_services()
+event_service = EventService(event_dao)
+
+TABLE_DAOS = {"customers": customer_dao, "events": event_dao, "bookings": booking_dao, "payments": payment_dao}
+
+# ---------------- CACHED QUERIES ----------------
+# Streamlit reruns the script on every interaction; these keep reads off the
+# database until the TTL expires or a write below clears them.
+CACHE_TTL_SECONDS = 60
+
+# Selectbox search: one projected scan per TTL builds an in-memory prefix index,
+# then every keystroke is answered from memory and only matches reach the browser
+AUTOCOMPLETE_LIMIT = 50
+
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_customer_index():
+    rows = customer_dao.iter_customers(columns=["cust_id", "name", "email", "city"])
+    return PrefixIndex.build(rows, "cust_id", ["name", "email", "city"],
+                             label=lambda c: f"{c['name']} ({c['email']})" if c.get("email") else c["name"])
+
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_event_index():
+    rows = event_dao.iter_events(columns=["event_id", "title", "date", "location", "price"])
+    return PrefixIndex.build(rows, "event_id", ["title", "location", "date"],
+                             label=lambda e: f"{e['title']} ({e['date']})")
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_active_bookings(after, page_size: int):
+    return booking_dao.fetch_page(after, page_size, ["booking_id", "cust_id", "event_id", "seats"],
+                                  where={"status": "BOOKED"})
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def load_page(table: str, after, page_size: int):
+    return TABLE_DAOS[table].fetch_page(after, page_size)
+
+# Cached loaders that read each table
+TABLE_LOADERS = {
+    "customers": [load_customer_index],
+    "events": [load_event_index],
+    "bookings": [load_active_bookings],
+    "payments": [],
+}
+
+def invalidate(*tables: str):
+    """
+    Drop cached reads of the given tables after a write to them.
+    """
+    for table in tables:
+        for loader in TABLE_LOADERS[table]:
+            loader.clear()
+    load_page.clear()
+
+def search_select(label: str, index: PrefixIndex, key: str):
+    """
+    Type-ahead selectbox: a search box narrows the options through the prefix index.
+    """
+    query = st.text_input(f"Search {label.lower()}", key=f"{key}_query", placeholder="Type to filter")
+    ids = [row[index.key] for row in index.search(query, AUTOCOMPLETE_LIMIT)]
+    if not ids:
+        # No empty selectbox: it would keep its None selection once matches reappear
+        st.info(f"No matches for '{query}'")
+        return None
+    return st.selectbox(label, ids, format_func=index.label, key=key)
+
+PAGE_SIZES = [25, 50, 100, 500]
+
+def show_paged_table(table: str):
+    """
+    Show one keyset page of a table instead of loading the whole table.
+    """
+    rows = paged_rows(f"{table}_page", lambda after, page_size: load_page(table, after, page_size),
+                      TABLE_DAOS[table].pk)
+    st.dataframe(rows)
+
+def paged_rows(key: str, load: Callable[[Any, int], List[Dict]], pk: str) -> List[Dict]:
+    """
+    Previous/Next buttons over a keyset-paged loader (`load(after, page_size)`);
+    returns the current page. The start key of every page visited is kept in
+    session state so Previous can step back.
+    """
+    state = st.session_state.setdefault(key, {"cursors": [None], "last": None, "page_size": None})
+    page_size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+    if page_size != state["page_size"]:
+        state.update(cursors=[None], last=None, page_size=page_size)
+    prev_col, next_col = st.columns(2)
+    if prev_col.button("◀ Previous", key=f"{key}_prev", disabled=len(state["cursors"]) == 1) and len(state["cursors"]) > 1:
+        state["cursors"].pop()
+    if next_col.button("Next ▶", key=f"{key}_next", disabled=state["last"] is None) and state["last"] is not None:
+        state["cursors"].append(state["last"])
+    rows = load(state["cursors"][-1], page_size)
+    # A full page means there may be more rows after it
+    state["last"] = rows[-1][pk] if len(rows) == page_size else None
+    return rows
 
 # ---------------- PAGE CONFIG ----------------
 st.set_page_config(
@@ -17,6 +130,13 @@ st.set_page_config(
     layout="wide"
 )
 
+# ---------------- DIAGNOSTICS TOGGLE ----------------
+# Recording is process-wide (DB_METRICS) and shared by every session, so the
+# checkbox only shows or hides this session's diagnostics panel
+show_metrics = st.sidebar.checkbox("Show database metrics", value=METRICS.enabled, key="db_metrics",
+                                   disabled=not METRICS.enabled, help="Recording is enabled with DB_METRICS=1")
+calls_before_rerun = METRICS.total_requests()
+
 # ---------------- CUSTOM CSS ----------------
 st.markdown("""
 <style>
@@ -85,10 +205,11 @@ st.title("🎫 Event Management System")
 tabs = ["Add Customer", "View Customers", "Add Event", "View Events", "Delete Event",
         "Book Event", "View Bookings", "Cancel Booking", "Payments"]
 
-tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs(tabs)
+# Only the selected view runs (st.tabs would execute, and query for, all nine on every rerun)
+view = st.radio("View", tabs, horizontal=True, label_visibility="collapsed")
 
 # ---------------- ADD CUSTOMER ----------------
-with tab1:
+if view == "Add Customer":
     st.subheader("Add Customer")
     name = st.text_input("Name")
     email = st.text_input("Email")
@@ -96,27 +217,25 @@ with tab1:
     city = st.text_input("City")
     if st.button("Save Customer"):
         try:
-            supabase.table("customers").insert({
-                "name": name,
-                "email": email,
-                "phone": phone,
-                "city": city
-            }).execute()
+            # Duplicate emails are rejected by the service (locally or by the unique constraint)
+            customer_service.add_customer(name, email, phone, city or None)
+            invalidate("customers")
             st.success(f"✅ Customer {name} added successfully!")
+        except CustomerError as e:
+            st.warning(f"⚠️ {e}")
         except Exception as e:
             st.error(f"Error: {e}")
 
 # ---------------- VIEW CUSTOMERS ----------------
-with tab2:
+if view == "View Customers":
     st.subheader("All Customers")
     try:
-        customers = supabase.table("customers").select("*").execute()
-        st.dataframe(customers.data)
+        show_paged_table("customers")
     except Exception as e:
         st.error(f"Error fetching customers: {e}")
 
 # ---------------- ADD EVENT ----------------
-with tab3:
+if view == "Add Event":
     st.subheader("Add Event")
     title = st.text_input("Event Title", key="event_title")
     date_input = st.date_input("Event Date", min_value=date.today(), key="event_date")
@@ -125,130 +244,97 @@ with tab3:
     price = st.number_input("Price (₹)", min_value=0.0, step=0.01, format="%.2f", key="event_price")
     if st.button("Save Event"):
         try:
-            supabase.table("events").insert({
-                "title": title,
-                "date": str(date_input),
-                "location": location,
-                "capacity": int(capacity),
-                "price": float(price)
-            }).execute()
+            event_service.add_event(title, str(date_input), location, int(capacity), float(price))
+            invalidate("events")
             st.success(f"✅ Event '{title}' added successfully!")
         except Exception as e:
             st.error(f"Error: {e}")
 
 # ---------------- VIEW EVENTS ----------------
-with tab4:
+if view == "View Events":
     st.subheader("All Events")
     try:
-        events = supabase.table("events").select("*").execute()
-        st.dataframe(events.data)
+        show_paged_table("events")
     except Exception as e:
         st.error(f"Error fetching events: {e}")
 
 # ---------------- DELETE EVENT ----------------
-with tab5:
+if view == "Delete Event":
     st.subheader("Delete Event")
     try:
-        events = supabase.table("events").select("*").execute()
-        if events.data:
-            event_list = {e["event_id"]: e["title"] for e in events.data}
-            event_id = st.selectbox("Select Event", list(event_list.keys()), format_func=lambda x: event_list[x])
-            if st.button("Delete Event"):
-                bookings = supabase.table("bookings").select("*").eq("event_id", event_id).execute()
-                if bookings.data:
-                    for b in bookings.data:
-                        payments = supabase.table("payments").select("*").eq("booking_id", b["booking_id"]).execute()
-                        if payments.data:
-                            for p in payments.data:
-                                if p["status"] == "PAID":
-                                    supabase.table("payments").update({"status": "REFUNDED"}).eq("payment_id", p["payment_id"]).execute()
-                                supabase.table("payments").delete().eq("payment_id", p["payment_id"]).execute()
-                    supabase.table("bookings").delete().eq("event_id", event_id).execute()
-                supabase.table("events").delete().eq("event_id", event_id).execute()
-                st.warning(f"🗑️ Event '{event_list[event_id]}' deleted. Bookings cancelled & payments refunded/deleted.")
+        event_index = load_event_index()
+        if len(event_index):
+            event_id = search_select("Select Event", event_index, "delete_event")
+            if st.button("Delete Event", disabled=event_id is None):
+                title = event_index.get(event_id)["title"]
+                # Set-based cascade: a handful of statements regardless of bookings/payments count
+                result = booking_service.delete_event_cascade(event_id)
+                invalidate("events", "bookings", "payments")
+                st.warning(f"🗑️ Event '{title}' deleted. {result['bookings_deleted']} bookings cancelled & "
+                           f"{result['payments_refunded']} payments refunded, {result['payments_deleted']} deleted.")
         else:
             st.info("No events available.")
     except Exception as e:
         st.error(f"Error deleting event: {e}")
 
 # ---------------- BOOK EVENT ----------------
-with tab6:
+if view == "Book Event":
     st.subheader("Book Event")
     try:
-        customers = supabase.table("customers").select("*").execute()
-        events = supabase.table("events").select("*").execute()
-        if customers.data and events.data:
-            cust_list = {c["cust_id"]: c["name"] for c in customers.data}
-            event_list = {e["event_id"]: f"{e['title']} ({e['date']})" for e in events.data}
-
-            cust_id = st.selectbox("Select Customer", list(cust_list.keys()), format_func=lambda x: cust_list[x])
-            event_id = st.selectbox("Select Event", list(event_list.keys()), format_func=lambda x: event_list[x])
+        customer_index = load_customer_index()
+        event_index = load_event_index()
+        if len(customer_index) and len(event_index):
+            cust_id = search_select("Select Customer", customer_index, "book_customer")
+            event_id = search_select("Select Event", event_index, "book_event")
             seats = st.number_input("Number of Seats", min_value=1, step=1)
             payment_method = st.selectbox("Payment Method", ["Cash", "Card", "UPI"])
+            seats_left = booking_service.inventory.seats_left(event_id) if event_id is not None else None
+            if seats_left is not None:
+                st.caption("Sold out" if seats_left == 0 else f"{seats_left} seats left")
 
-            if st.button("Book Tickets"):
-                selected_event = next((e for e in events.data if e["event_id"] == event_id), None)
+            if st.button("Book Tickets", disabled=cust_id is None or event_id is None):
+                selected_event = event_index.get(event_id)
                 if selected_event:
-                    booked_resp = supabase.table("bookings").select("seats").eq("event_id", event_id).execute()
-                    total_booked = sum([b["seats"] for b in booked_resp.data]) if booked_resp.data else 0
-                    available = selected_event["capacity"] - total_booked
-
-                    if seats <= available:
-                        # Create booking
-                        booking_resp = supabase.table("bookings").insert({
-                            "cust_id": cust_id,
-                            "event_id": event_id,
-                            "seats": seats,
-                            "status": "BOOKED"
-                        }).execute()
-
-                        booking_id = booking_resp.data[0]["booking_id"]
+                    try:
+                        # Atomic reservation: capacity check, seat decrement, booking and
+                        # pending payment happen together, so concurrent clicks cannot oversell
+                        booking = booking_service.book_event(cust_id, event_id, int(seats))
                         amount = float(selected_event["price"]) * seats
 
                         # Determine payment status
                         payment_status = "PAID" if payment_method in ["Card", "UPI"] else "PENDING"
-
-                        # Insert payment with chosen method and status
-                        supabase.table("payments").insert({
-                            "booking_id": booking_id,
-                            "amount": amount,
-                            "method": payment_method,
-                            "status": payment_status
-                        }).execute()
+                        if payment_status == "PAID":
+                            payment_service.process_payment(booking["booking_id"], payment_method)
+                        invalidate("events", "bookings", "payments")
 
                         st.success(f"✅ {seats} seats booked for '{selected_event['title']}'! Payment ({payment_method}): ₹{amount} - {payment_status}")
-                    else:
-                        st.error(f"⚠️ Only {available} seats left. Cannot book {seats} seats.")
+                    except BookingError as e:
+                        st.error(f"⚠️ {e}. Cannot book {seats} seats.")
         else:
             st.warning("Please add customers and events first.")
     except Exception as e:
         st.error(f"Error booking event: {e}")
 
 # ---------------- VIEW BOOKINGS ----------------
-with tab7:
+if view == "View Bookings":
     st.subheader("All Bookings")
     try:
-        bookings = supabase.table("bookings").select("*").execute()
-        st.dataframe(bookings.data)
+        show_paged_table("bookings")
     except Exception as e:
         st.error(f"Error fetching bookings: {e}")
 
 # ---------------- CANCEL BOOKING ----------------
-with tab8:
+if view == "Cancel Booking":
     st.subheader("Cancel Booking")
     try:
-        bookings = supabase.table("bookings").select("*").eq("status", "BOOKED").execute()
-        if bookings.data:
-            booking_list = {b["booking_id"]: f"Cust {b['cust_id']} - Event {b['event_id']} ({b['seats']} seats)" for b in bookings.data}
+        bookings = paged_rows("active_bookings_page", load_active_bookings, "booking_id")
+        if bookings:
+            booking_list = {b["booking_id"]: f"Cust {b['cust_id']} - Event {b['event_id']} ({b['seats']} seats)" for b in bookings}
             booking_id = st.selectbox("Select Booking to Cancel", list(booking_list.keys()), format_func=lambda x: booking_list[x])
             if st.button("Cancel Booking"):
-                payments = supabase.table("payments").select("*").eq("booking_id", booking_id).execute()
-                if payments.data:
-                    for p in payments.data:
-                        if p["status"] == "PAID":
-                            supabase.table("payments").update({"status": "REFUNDED"}).eq("payment_id", p["payment_id"]).execute()
-                        supabase.table("payments").delete().eq("payment_id", p["payment_id"]).execute()
-                supabase.table("bookings").update({"status": "CANCELLED"}).eq("booking_id", booking_id).execute()
+                # Cancels, refunds and gives the seats back to the event
+                booking_service.cancel_bookings([booking_id])
+                invalidate("events", "bookings", "payments")
                 st.warning("Booking cancelled & payment refunded if paid.")
         else:
             st.info("No active bookings to cancel.")
@@ -256,10 +342,21 @@ with tab8:
         st.error(f"Error cancelling booking: {e}")
 
 # ---------------- PAYMENTS ----------------
-with tab9:
+if view == "Payments":
     st.subheader("Payments")
     try:
-        payments = supabase.table("payments").select("*").execute()
-        st.dataframe(payments.data)
+        show_paged_table("payments")
     except Exception as e:
         st.error(f"Error fetching payments: {e}")
+
+# ---------------- DIAGNOSTICS ----------------
+if show_metrics and METRICS.enabled:
+    with st.sidebar:
+        st.subheader("Diagnostics")
+        # Other sessions' queries made while this rerun ran are counted too
+        st.caption(f"{METRICS.total_requests() - calls_before_rerun} database calls during this rerun")
+        st.dataframe([{k: r[k] for k in ("table", "op", "requests", "avg_ms", "p95_ms", "rows")}
+                      for r in METRICS.snapshot()])
+        st.download_button("Prometheus metrics", METRICS.prometheus(), file_name="metrics.prom")
+        if st.button("Reset metrics"):
+            METRICS.reset()
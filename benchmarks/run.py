@@ -0,0 +1,284 @@
+# benchmarks/run.py
+"""
+Microbenchmarks for the service and DAO hot paths on the local SQLite backend.
+
+    python -m benchmarks.run                          # 1k, 10k and 100k bookings
+    python -m benchmarks.run --scales 1000000 --db /tmp/bench.db
+    python -m benchmarks.run --baseline benchmarks/results/<earlier run>.json
+
+Each scale seeds a fresh database with synthetic customers, events, bookings
+and payments, then times every case and counts its database round trips.
+Results are written as JSON; --baseline prints the change against an earlier run.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from src.config import DAO_CACHE_SIZE
+from src.dao.lookup_cache import LookupCache
+from src.dao.customer_dao import CustomerDAO
+from src.dao.event_dao import EventDAO
+from src.dao.booking_dao import BookingDAO
+from src.dao.payment_dao import PaymentDAO
+from src.dao.report_dao import ReportDAO
+from src.dao.rollup_dao import RollupDAO
+from src.services.booking_service import BookingService
+from src.services.payment_service import PaymentService
+from src.services.reporting_service import ReportingService
+from src.services.analytics import ColumnarUnavailableError
+from src.services.customer_service import CustomerService
+from src.services.event_service import EventService
+from src.storage.sqlite_client import SQLiteClient
+
+DEFAULT_SCALES = [1_000, 10_000, 100_000]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+SEED_BATCH = 5_000
+# Payments settled per process_payments call
+SETTLE_BATCH = 1_000
+# Relative slowdown reported as a regression by --baseline
+REGRESSION_THRESHOLD = 0.10
+
+CITIES = ["Pune", "Mumbai", "Delhi", "Chennai", "Kolkata", "Bengaluru", "Hyderabad", "Jaipur"]
+METHODS = ["Cash", "Card", "UPI"]
+
+class CountingClient:
+    """
+    Wraps a storage client and counts executed requests (round trips).
+    """
+    def __init__(self, client: Any):
+        self._client = client
+        self.round_trips = 0
+
+    def table(self, name: str) -> "_CountingQuery":
+        return _CountingQuery(self, self._client.table(name))
+
+    def rpc(self, fn: str, params: Dict | None = None) -> "_CountingQuery":
+        return _CountingQuery(self, self._client.rpc(fn, params))
+
+class _CountingQuery:
+    def __init__(self, counter: CountingClient, query: Any):
+        self._counter = counter
+        self._query = query
+
+    def __getattr__(self, name: str):
+        method = getattr(self._query, name)
+
+        def chain(*args, **kwargs):
+            self._query = method(*args, **kwargs)
+            return self
+        return chain
+
+    def execute(self) -> Any:
+        self._counter.round_trips += 1
+        return self._query.execute()
+
+def seed(client: SQLiteClient, bookings: int, rng: random.Random) -> Dict[str, int]:
+    """
+    Fill an empty database: one customer per 10 bookings, one event per 100
+    (at least 10 of each) and one payment per booking.
+    """
+    customers = max(10, bookings // 10)
+    events = max(10, bookings // 100)
+    now = datetime.now()
+
+    def created_at() -> str:
+        return (now - timedelta(minutes=rng.randrange(90 * 24 * 60))).isoformat(timespec="milliseconds")
+
+    def insert(table: str, rows: List[Dict]) -> None:
+        for start in range(0, len(rows), SEED_BATCH):
+            client.table(table).insert(rows[start:start + SEED_BATCH]).execute()
+
+    insert("customers", [{"name": f"Customer {i}", "email": f"customer{i}@example.com", "phone": f"9{i:09d}",
+                          "city": rng.choice(CITIES), "created_at": created_at()} for i in range(1, customers + 1)])
+    insert("events", [{"title": f"Event {i}", "date": (now + timedelta(days=rng.randrange(365))).date().isoformat(),
+                       "location": rng.choice(CITIES), "capacity": 10 * bookings, "price": float(rng.randrange(100, 5000)),
+                       "created_at": created_at()} for i in range(1, events + 1)])
+    for start in range(0, bookings, SEED_BATCH):
+        rows, payments = [], []
+        for booking_id in range(start + 1, min(start + SEED_BATCH, bookings) + 1):
+            cancelled = rng.random() < 0.1
+            seats = rng.randint(1, 6)
+            stamp = created_at()
+            rows.append({"booking_id": booking_id, "cust_id": rng.randint(1, customers),
+                         "event_id": rng.randint(1, events), "seats": seats,
+                         "status": "CANCELLED" if cancelled else "BOOKED", "created_at": stamp})
+            status = "REFUNDED" if cancelled else rng.choice(["PAID", "PAID", "PENDING"])
+            payments.append({"booking_id": booking_id, "amount": seats * 100.0, "created_at": stamp,
+                             "method": None if status == "PENDING" else rng.choice(METHODS), "status": status})
+        client.table("bookings").insert(rows).execute()
+        client.table("payments").insert(payments).execute()
+    return {"customers": customers, "events": events, "bookings": bookings, "payments": bookings}
+
+def measure(name: str, counter: CountingClient, fn: Callable[[int], Any], iterations: int) -> Dict:
+    """
+    Time `fn(i)` for each iteration; latencies in milliseconds.
+    """
+    latencies: List[float] = []
+    trips_before = counter.round_trips
+    try:
+        for i in range(iterations):
+            start = time.perf_counter()
+            fn(i)
+            latencies.append((time.perf_counter() - start) * 1000)
+    except (NotImplementedError, ColumnarUnavailableError) as e:
+        # The backend lacks the feature (an RPC, or numpy); anything else fails the run
+        return {"name": name, "skipped": f"{type(e).__name__}: {e}"}
+    latencies.sort()
+    total_ms = sum(latencies)
+    return {
+        "name": name,
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(latencies), 4),
+        "p50_ms": round(latencies[len(latencies) // 2], 4),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 4),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 4),
+        "max_ms": round(latencies[-1], 4),
+        "ops_per_sec": round(iterations / (total_ms / 1000), 2) if total_ms else None,
+        "round_trips_per_op": round((counter.round_trips - trips_before) / iterations, 2),
+    }
+
+def run_scale(bookings: int, iterations: int, report_iterations: int, db: str, seed_value: int) -> Dict:
+    rng = random.Random(seed_value)
+    if db != ":memory:" and os.path.exists(db):
+        os.remove(db)
+    client = SQLiteClient(db)
+    seed_start = time.perf_counter()
+    counts = seed(client, bookings, rng)
+    RollupDAO(client).rebuild()
+    seed_seconds = time.perf_counter() - seed_start
+
+    counter = CountingClient(client)
+    cache = LookupCache(max_size=DAO_CACHE_SIZE) if DAO_CACHE_SIZE > 0 else None
+    customer_dao, event_dao = CustomerDAO(counter, cache), EventDAO(counter, cache)
+    booking_dao, payment_dao = BookingDAO(counter, cache), PaymentDAO(counter, cache)
+    rollups = RollupDAO(counter)
+    payment_service = PaymentService(payment_dao, booking_dao, rollups)
+    booking_service = BookingService(booking_dao, event_dao, customer_dao, payment_service, rollups=rollups)
+    reporting = ReportingService(booking_dao, event_dao, customer_dao, ReportDAO(counter), rollups)
+    columnar = ReportingService(booking_dao, event_dao, customer_dao, ReportDAO(counter), rollups, columnar=True,
+                                snapshot_ttl=float("inf"))
+    customer_service, event_service = CustomerService(customer_dao), EventService(event_dao)
+
+    def random_customer() -> int:
+        return rng.randint(1, counts["customers"])
+
+    def random_event() -> int:
+        return rng.randint(1, counts["events"])
+
+    booked: List[int] = []
+
+    def settle(i: int) -> None:
+        first = (i * SETTLE_BATCH) % bookings
+        payment_service.process_payments({"booking_id": booking_id, "method": rng.choice(METHODS)}
+                                         for booking_id in range(first + 1, first + SETTLE_BATCH + 1))
+
+    def book(_: int) -> None:
+        booked.append(booking_service.book_event(random_customer(), random_event(), rng.randint(1, 4))["booking_id"])
+
+    cases = [
+        measure("book_event", counter, book, iterations),
+        measure("process_payment", counter, lambda i: payment_service.process_payment(booked[i], "UPI"), iterations),
+        measure("process_payments_batch", counter, settle, report_iterations),
+        measure("cancel_booking", counter, lambda i: booking_service.cancel_booking(booked[i]), iterations),
+        measure("get_booking", counter, lambda _: booking_service.get_booking(rng.randint(1, bookings)), iterations),
+        measure("list_customers", counter, lambda _: customer_service.list_customers(100), iterations),
+        measure("list_events", counter, lambda _: event_service.list_events(100), iterations),
+        measure("fetch_page_bookings", counter,
+                lambda _: booking_dao.fetch_page(rng.randint(0, max(0, bookings - 100)), 100), iterations),
+        measure("search_customers", counter,
+                lambda _: customer_service.search_customers(city=rng.choice(CITIES)), iterations),
+        measure("search_events", counter,
+                lambda _: event_service.search_events(title=f"Event {random_event()}"), iterations),
+        measure("top_selling_events", counter, lambda _: reporting.top_selling_events(), report_iterations),
+        measure("total_revenue_last_month", counter, lambda _: reporting.total_revenue_last_month(), report_iterations),
+        measure("total_bookings_per_customer", counter,
+                lambda _: reporting.total_bookings_per_customer(), report_iterations),
+        measure("customers_with_multiple_bookings", counter,
+                lambda _: reporting.customers_with_multiple_bookings(), report_iterations),
+        # Columnar mode: the snapshot load, then reports answered from memory
+        measure("columnar_snapshot_load", counter, lambda _: columnar.snapshot(refresh=True), report_iterations),
+        measure("columnar_top_selling_events", counter, lambda _: columnar.top_selling_events(), iterations),
+        measure("columnar_multi_booking_customers", counter,
+                lambda _: columnar.customers_with_multiple_bookings(), iterations),
+    ]
+    client.close()
+    return {"bookings": bookings, "rows": counts, "seed_seconds": round(seed_seconds, 3), "cases": cases}
+
+def compare(results: Dict, baseline: Dict) -> List[str]:
+    """
+    One line per case present in both runs: median latency and round trips, old -> new.
+    """
+    old = {(s["bookings"], c["name"]): c for s in baseline["scales"] for c in s["cases"] if "p50_ms" in c}
+    lines = []
+    for scale in results["scales"]:
+        for case in scale["cases"]:
+            before = old.get((scale["bookings"], case["name"]))
+            if before is None or "p50_ms" not in case:
+                continue
+            change = (case["p50_ms"] - before["p50_ms"]) / before["p50_ms"] if before["p50_ms"] else 0.0
+            flag = "  REGRESSION" if change > REGRESSION_THRESHOLD or \
+                case["round_trips_per_op"] > before["round_trips_per_op"] else ""
+            lines.append(f"{scale['bookings']:>9} {case['name']:<34} p50 {before['p50_ms']:>10.3f} -> {case['p50_ms']:>10.3f} ms "
+                         f"({change:+.1%})  trips {before['round_trips_per_op']} -> {case['round_trips_per_op']}{flag}")
+    return lines
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Service/DAO microbenchmarks")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="comma separated booking counts to seed (default: %(default)s)")
+    parser.add_argument("--iterations", type=int, default=200, help="iterations per point operation")
+    parser.add_argument("--report-iterations", type=int, default=3, help="iterations per report")
+    parser.add_argument("--db", default=":memory:", help="SQLite file to seed, or :memory: (default)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the synthetic data")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/bench-<timestamp>.json)")
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    results = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "backend": "sqlite" if args.db == ":memory:" else f"sqlite:{args.db}",
+        "scales": [],
+    }
+    for bookings in (int(s) for s in args.scales.split(",") if s.strip()):
+        print(f"Seeding {bookings} bookings...", flush=True)
+        scale = run_scale(bookings, args.iterations, args.report_iterations, args.db, args.seed)
+        results["scales"].append(scale)
+        for case in scale["cases"]:
+            if "skipped" in case:
+                print(f"  {case['name']:<34} skipped ({case['skipped']})")
+            else:
+                print(f"  {case['name']:<34} mean {case['mean_ms']:>10.3f} ms  p95 {case['p95_ms']:>10.3f} ms  "
+                      f"{case['round_trips_per_op']:>8} trips/op")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            lines = compare(results, json.load(f))
+        print("\n".join(lines) if lines else "No cases in common with the baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+-- sql/booking.sql
+-- Atomic booking used by BookingDAO.reserve_booking / reserve_bookings.
+-- Apply once in the Supabase SQL editor (or psql); safe to re-run.
+
+-- Reserve seats, create the booking and its pending payment in one transaction.
+-- The capacity check and decrement are a single conditional UPDATE, so concurrent
+-- bookings can never oversell and only hold the event row lock for this call.
+create or replace function reserve_booking(p_cust_id bigint, p_event_id bigint, p_seats int)
+returns bookings
+language plpgsql as $$
+declare
+    v_price numeric;
+    v_booking bookings;
+begin
+    if p_seats <= 0 then
+        raise exception 'Seats must be greater than 0';
+    end if;
+    perform 1 from customers where cust_id = p_cust_id;
+    if not found then
+        raise exception 'Customer not found: %', p_cust_id;
+    end if;
+
+    update events set capacity = capacity - p_seats
+     where event_id = p_event_id and capacity >= p_seats
+    returning price into v_price;
+    if not found then
+        if exists (select 1 from events where event_id = p_event_id) then
+            raise exception 'Not enough seats available';
+        end if;
+        raise exception 'Event not found: %', p_event_id;
+    end if;
+
+    insert into bookings (cust_id, event_id, seats, status)
+    values (p_cust_id, p_event_id, p_seats, 'BOOKED')
+    returning * into v_booking;
+
+    insert into payments (booking_id, amount, status)
+    values (v_booking.booking_id, p_seats * v_price, 'PENDING');
+
+    return v_booking;
+end;
+$$;
+
+-- Group booking: reserve every item of p_items ([{"cust_id", "event_id", "seats"}, ...])
+-- in one transaction. Either all bookings (and pending payments) are created, in
+-- input order, or an exception rolls the whole batch back.
+create or replace function reserve_bookings(p_items jsonb)
+returns setof bookings
+language plpgsql as $$
+declare
+    v_item record;
+    v_booking bookings;
+    v_events int;
+    v_reserved int;
+begin
+    create temp table _items on commit drop as
+    select (i->>'cust_id')::bigint as cust_id,
+           (i->>'event_id')::bigint as event_id,
+           (i->>'seats')::int as seats,
+           ord
+      from jsonb_array_elements(p_items) with ordinality as t(i, ord);
+
+    if exists (select 1 from _items where seats is null or seats <= 0) then
+        raise exception 'Seats must be greater than 0';
+    end if;
+    if exists (select 1 from _items i where not exists (select 1 from customers c where c.cust_id = i.cust_id)) then
+        raise exception 'Customer not found';
+    end if;
+    if exists (select 1 from _items i where not exists (select 1 from events e where e.event_id = i.event_id)) then
+        raise exception 'Event not found';
+    end if;
+
+    -- Lock the events in a fixed order so concurrent batches cannot deadlock
+    perform 1 from events where event_id in (select event_id from _items) order by event_id for update;
+    select count(distinct event_id) into v_events from _items;
+    update events e set capacity = e.capacity - s.seats
+      from (select event_id, sum(seats) as seats from _items group by event_id) s
+     where e.event_id = s.event_id and e.capacity >= s.seats;
+    get diagnostics v_reserved = row_count;
+    if v_reserved < v_events then
+        raise exception 'Not enough seats available';
+    end if;
+
+    for v_item in select i.*, e.price from _items i join events e using (event_id) order by i.ord loop
+        insert into bookings (cust_id, event_id, seats, status)
+        values (v_item.cust_id, v_item.event_id, v_item.seats, 'BOOKED')
+        returning * into v_booking;
+        insert into payments (booking_id, amount, status)
+        values (v_booking.booking_id, v_item.seats * v_item.price, 'PENDING');
+        return next v_booking;
+    end loop;
+end;
+$$;
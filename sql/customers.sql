@@ -0,0 +1,13 @@
+-- sql/customers.sql
+-- Unique customer emails, relied on by CustomerDAO's conflict-aware writes (DuplicateKeyError).
+-- Apply once in the Supabase SQL editor (or psql); safe to re-run.
+-- Existing duplicates must be merged first; this lists them:
+--   select lower(trim(email)), count(*) from customers group by 1 having count(*) > 1;
+
+-- CustomerService and ImportService store emails trimmed and lower-cased
+update customers set email = lower(trim(email)) where email <> lower(trim(email));
+
+create unique index if not exists customers_email_key on customers (email);
+
+-- The unique index also serves get_customer_by_email (sql/search.sql created a plain one)
+drop index if exists customers_email_idx;
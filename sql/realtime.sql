@@ -0,0 +1,22 @@
+-- sql/realtime.sql
+-- Lets src/dao/change_feed.py (RealtimeChangeFeed) follow row changes.
+-- Apply once in the Supabase SQL editor (or psql); safe to re-run.
+
+-- Publish the tables to Supabase Realtime
+do $$
+declare
+    t text;
+begin
+    foreach t in array array['customers', 'events', 'bookings', 'payments'] loop
+        if not exists (select 1 from pg_publication_tables
+                       where pubname = 'supabase_realtime' and schemaname = 'public' and tablename = t) then
+            execute format('alter publication supabase_realtime add table public.%I', t);
+        end if;
+    end loop;
+end $$;
+
+-- Send the whole previous row with updates and deletes (otherwise only the primary key)
+alter table customers replica identity full;
+alter table events replica identity full;
+alter table bookings replica identity full;
+alter table payments replica identity full;
@@ -0,0 +1,51 @@
+-- sql/reporting.sql
+-- Server-side aggregations used by src/dao/report_dao.py.
+-- Apply once in the Supabase SQL editor (or psql); safe to re-run.
+
+create index if not exists bookings_event_id_idx on bookings (event_id);
+create index if not exists bookings_cust_id_idx on bookings (cust_id);
+create index if not exists bookings_created_at_idx on bookings (created_at);
+
+-- Seats sold per event, best sellers first
+create or replace function report_event_seats(p_limit int default 5)
+returns table (event_id bigint, title text, seats_sold bigint)
+language sql stable as $$
+    select b.event_id, e.title, sum(b.seats)::bigint as seats_sold
+    from bookings b
+    join events e on e.event_id = b.event_id
+    group by b.event_id, e.title
+    order by seats_sold desc
+    limit p_limit;
+$$;
+
+-- Booking revenue (seats * event price) for bookings created on/after p_since
+create or replace function report_revenue_since(p_since timestamptz)
+returns numeric
+language sql stable as $$
+    select coalesce(sum(b.seats * e.price), 0)
+    from bookings b
+    join events e on e.event_id = b.event_id
+    where b.created_at >= p_since;
+$$;
+
+-- Paid revenue (net of refunds) of bookings made on/after day p_since, counted like the sales rollups
+create or replace function report_paid_revenue_since(p_since date)
+returns numeric
+language sql stable as $$
+    select coalesce(sum(p.amount), 0)
+    from bookings b
+    join payments p on p.booking_id = b.booking_id
+    where b.created_at >= p_since and p.status = 'PAID';
+$$;
+
+-- Booking count per customer, keeping customers with more than p_min_bookings
+create or replace function report_customer_bookings(p_min_bookings int default 0)
+returns table (cust_id bigint, name text, bookings bigint)
+language sql stable as $$
+    select b.cust_id, c.name, count(*)::bigint as bookings
+    from bookings b
+    join customers c on c.cust_id = b.cust_id
+    group by b.cust_id, c.name
+    having count(*) > p_min_bookings
+    order by b.cust_id;
+$$;
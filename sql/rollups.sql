@@ -0,0 +1,76 @@
+-- sql/rollups.sql
+-- Daily per-event sales rollups maintained by src/dao/rollup_dao.py.
+-- Apply once in the Supabase SQL editor (or psql), then run
+--   python -m src.cli.main rollups rebuild
+-- to fill the table from existing bookings; safe to re-run.
+
+-- One bucket per (booking day, event). Every measure is attributed to the day the
+-- booking was made, so a rebuild from bookings/payments reproduces the live counters.
+create table if not exists event_daily_stats (
+    id bigint generated always as identity primary key,
+    day date not null,
+    event_id bigint not null,
+    bookings int not null default 0,
+    seats_booked int not null default 0,
+    cancellations int not null default 0,
+    seats_cancelled int not null default 0,
+    revenue numeric not null default 0,  -- amount of PAID payments (refunds subtract)
+    unique (day, event_id)
+);
+create index if not exists event_daily_stats_event_id_idx on event_daily_stats (event_id);
+
+-- Add deltas ([{"day", "event_id", "bookings", "seats_booked", ...}, ...]) to their buckets;
+-- returns the number of buckets written. A void result would come back as null, which
+-- the client cannot tell from a missing function (earlier versions returned void).
+drop function if exists bump_event_daily_stats(jsonb);
+create function bump_event_daily_stats(p_deltas jsonb)
+returns int
+language plpgsql as $$
+declare
+    v_buckets int;
+begin
+    insert into event_daily_stats as s (day, event_id, bookings, seats_booked, cancellations, seats_cancelled, revenue)
+    select (d->>'day')::date, (d->>'event_id')::bigint,
+           coalesce((d->>'bookings')::int, 0), coalesce((d->>'seats_booked')::int, 0),
+           coalesce((d->>'cancellations')::int, 0), coalesce((d->>'seats_cancelled')::int, 0),
+           coalesce((d->>'revenue')::numeric, 0)
+      from jsonb_array_elements(p_deltas) as d
+    on conflict (day, event_id) do update set
+        bookings = s.bookings + excluded.bookings,
+        seats_booked = s.seats_booked + excluded.seats_booked,
+        cancellations = s.cancellations + excluded.cancellations,
+        seats_cancelled = s.seats_cancelled + excluded.seats_cancelled,
+        revenue = s.revenue + excluded.revenue;
+    get diagnostics v_buckets = row_count;
+    return v_buckets;
+end;
+$$;
+
+-- Recompute every bucket from bookings and payments; returns the number of buckets
+create or replace function rebuild_event_daily_stats()
+returns bigint
+language plpgsql as $$
+declare
+    v_buckets bigint;
+begin
+    delete from event_daily_stats where true;
+    insert into event_daily_stats (day, event_id, bookings, seats_booked, cancellations, seats_cancelled, revenue)
+    select b.created_at::date, b.event_id,
+           count(*), sum(b.seats),
+           count(*) filter (where b.status = 'CANCELLED'),
+           coalesce(sum(b.seats) filter (where b.status = 'CANCELLED'), 0),
+           coalesce(sum(p.amount) filter (where p.status = 'PAID'), 0)
+      from bookings b
+      left join payments p on p.booking_id = b.booking_id
+     group by 1, 2;
+    get diagnostics v_buckets = row_count;
+    return v_buckets;
+end;
+$$;
+
+-- Revenue of bookings made between two days (inclusive)
+create or replace function report_rollup_revenue(p_from date, p_to date)
+returns numeric
+language sql stable as $$
+    select coalesce(sum(revenue), 0) from event_daily_stats where day between p_from and p_to;
+$$;
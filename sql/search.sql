@@ -0,0 +1,14 @@
+-- sql/search.sql
+-- Indexes behind CustomerDAO.search_customers / get_customer_by_email and EventDAO.search_events.
+-- Apply once in the Supabase SQL editor (or psql); safe to re-run.
+
+-- Trigram indexes let ilike '%text%' / 'text%' filters use an index instead of a scan
+create extension if not exists pg_trgm;
+
+create index if not exists events_title_trgm_idx on events using gin (title gin_trgm_ops);
+create index if not exists events_location_trgm_idx on events using gin (location gin_trgm_ops);
+create index if not exists events_date_idx on events (date);
+
+create index if not exists customers_email_idx on customers (email);
+create index if not exists customers_email_trgm_idx on customers using gin (email gin_trgm_ops);
+create index if not exists customers_city_trgm_idx on customers using gin (city gin_trgm_ops);
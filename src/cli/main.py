@@ -1,36 +1,53 @@
 # src/cli/main.py
+import argparse
+from collections import Counter
 from src.dao.customer_dao import CustomerDAO
 from src.dao.event_dao import EventDAO
 from src.dao.booking_dao import BookingDAO
+from src.dao.payment_dao import PaymentDAO
+from src.dao.rollup_dao import RollupDAO
+from src.dao.lookup_cache import LookupCache
 from src.services.customer_service import CustomerService
 from src.services.event_service import EventService
 from src.services.booking_service import BookingService
-from src.services.payment_service import PaymentService
+from src.services.payment_service import PaymentService, OUTCOME_PAID, OUTCOME_REFUNDED
 from src.services.reporting_service import ReportingService, ReportingError
+from src.services.report_cache import ReportCache
+from src.services.import_service import (ImportService, DataImportError, DEFAULT_BATCH_SIZE, DEFAULT_WORKERS,
+                                         read_rows)
+from src.services.export_service import ExportService, ExportError, EXPORT_TABLES, EXPORT_FORMATS
+from src.config import close_supabase, DAO_CACHE_SIZE, METRICS, REPORT_CACHE_TTL, REPORT_CACHE_DIR
 
-from datetime import datetime
+from datetime import date
 
 class EventManagementCLI:
-    def __init__(self):
-        # DAOs
-        self.customer_dao = CustomerDAO()
-        self.event_dao = EventDAO()
-        self.booking_dao = BookingDAO()
+    def __init__(self, columnar_reports: bool = False):
+        # DAOs (sharing one lookup cache so writes invalidate reads across services)
+        self.lookup_cache = LookupCache(DAO_CACHE_SIZE) if DAO_CACHE_SIZE > 0 else None
+        self.customer_dao = CustomerDAO(cache=self.lookup_cache)
+        self.event_dao = EventDAO(cache=self.lookup_cache)
+        self.booking_dao = BookingDAO(cache=self.lookup_cache)
+        self.payment_dao = PaymentDAO(cache=self.lookup_cache)
         
         # Services
         self.customer_service = CustomerService(self.customer_dao)
         self.event_service = EventService(self.event_dao)
-        self.payment_service = PaymentService()
+        self.rollup_dao = RollupDAO()
+        self.payment_service = PaymentService(self.payment_dao, self.booking_dao, self.rollup_dao)
         self.booking_service = BookingService(
             booking_dao=self.booking_dao,
             event_dao=self.event_dao,
             customer_dao=self.customer_dao,
-            payment_service=self.payment_service
+            payment_service=self.payment_service,
+            rollups=self.rollup_dao
         )
         self.reporting_service = ReportingService(
             booking_dao=self.booking_dao,
             event_dao=self.event_dao,
-            customer_dao=self.customer_dao
+            customer_dao=self.customer_dao,
+            rollups=self.rollup_dao,
+            columnar=columnar_reports,
+            cache=ReportCache(REPORT_CACHE_TTL, directory=REPORT_CACHE_DIR)
         )
 
     def run(self):
@@ -41,6 +58,7 @@ class EventManagementCLI:
             print("3. Book Event")
             print("4. Payment Processing")
             print("5. Reports")
+            print("6. Diagnostics")
             print("0. Exit")
             choice = input("Enter choice: ").strip()
             if choice == "1":
@@ -53,6 +71,8 @@ class EventManagementCLI:
                 self.payment_menu()
             elif choice == "5":
                 self.reporting_menu()
+            elif choice == "6":
+                self.diagnostics_menu()
             elif choice == "0":
                 break
             else:
@@ -67,6 +87,7 @@ class EventManagementCLI:
             print("3. Get Customer by ID")
             print("4. Update Customer")
             print("5. Delete Customer")
+            print("6. Search Customers")
             print("0. Back")
             choice = input("Choice: ").strip()
             if choice == "1":
@@ -74,8 +95,11 @@ class EventManagementCLI:
                 email = input("Email: ")
                 phone = input("Phone: ")
                 city = input("City (optional): ").strip() or None
-                customer = self.customer_service.create_customer(name, email, phone, city)
-                print("Customer added:", customer)
+                try:
+                    customer = self.customer_service.add_customer(name, email, phone, city)
+                    print("Customer added:", customer)
+                except Exception as e:
+                    print("Error:", e)
             elif choice == "2":
                 customers = self.customer_service.list_customers()
                 for c in customers:
@@ -101,6 +125,11 @@ class EventManagementCLI:
                 cust_id = int(input("Customer ID to delete: "))
                 deleted = self.customer_service.delete_customer(cust_id)
                 print("Deleted:", deleted if deleted else "Customer not found")
+            elif choice == "6":
+                email = input("Email starts with (blank for any): ").strip() or None
+                city = input("City (blank for any): ").strip() or None
+                for c in self.customer_service.search_customers(email=email, city=city):
+                    print(c)
             elif choice == "0":
                 break
             else:
@@ -115,6 +144,7 @@ class EventManagementCLI:
             print("3. Get Event by ID")
             print("4. Update Event")
             print("5. Delete Event")
+            print("6. Search Events")
             print("0. Back")
             choice = input("Choice: ").strip()
             if choice == "1":
@@ -150,8 +180,20 @@ class EventManagementCLI:
                 print("Updated:", updated)
             elif choice == "5":
                 eid = int(input("Event ID to delete: "))
-                deleted = self.event_service.delete_event(eid)
-                print("Deleted:", deleted)
+                try:
+                    # Removes the event's bookings and payments (refunding them) too
+                    deleted = self.booking_service.delete_event_cascade(eid)
+                    print("Deleted:", deleted)
+                except Exception as e:
+                    print("Error:", e)
+            elif choice == "6":
+                title = input("Title contains (blank for any): ").strip() or None
+                location = input("Location contains (blank for any): ").strip() or None
+                date_from = input("From date (YYYY-MM-DD, blank for any): ").strip() or None
+                date_to = input("To date (YYYY-MM-DD, blank for any): ").strip() or None
+                for e in self.event_service.search_events(title=title, location=location,
+                                                          date_from=date_from, date_to=date_to):
+                    print(e)
             elif choice == "0":
                 break
             else:
@@ -164,6 +206,8 @@ class EventManagementCLI:
             print("1. Book Event")
             print("2. View Booking by ID")
             print("3. Cancel Booking")
+            print("4. Cancel Multiple Bookings")
+            print("5. Group Booking")
             print("0. Back")
             choice = input("Choice: ").strip()
             if choice == "1":
@@ -189,6 +233,26 @@ class EventManagementCLI:
                     print("Booking cancelled:", cancelled)
                 except Exception as e:
                     print("Error:", e)
+            elif choice == "4":
+                ids = input("Booking IDs to cancel (comma separated): ")
+                try:
+                    booking_ids = [int(x) for x in ids.split(",") if x.strip()]
+                    cancelled = self.booking_service.cancel_bookings(booking_ids)
+                    print(f"Cancelled {len(cancelled)} of {len(booking_ids)} bookings")
+                except Exception as e:
+                    print("Error:", e)
+            elif choice == "5":
+                cust_id = int(input("Customer ID: "))
+                items = input("Event:seats pairs (e.g. 3:2, 7:4): ")
+                try:
+                    requests = [{"cust_id": cust_id, "event_id": int(e), "seats": int(n)}
+                                for e, n in (x.split(":") for x in items.split(",") if x.strip())]
+                    for result in self.booking_service.book_many(requests):
+                        req = result["request"]
+                        outcome = result["booking"] or f"Error: {result['error']}"
+                        print(f"Event {req['event_id']} ({req['seats']} seats):", outcome)
+                except Exception as e:
+                    print("Error:", e)
             elif choice == "0":
                 break
             else:
@@ -200,6 +264,8 @@ class EventManagementCLI:
             print("\n--- Payment Menu ---")
             print("1. Process Payment")
             print("2. Back")
+            print("3. Process Payments in Bulk")
+            print("4. Refund Payments in Bulk")
             choice = input("Choice: ").strip()
             if choice == "1":
                 booking_id = int(input("Booking ID: "))
@@ -209,6 +275,18 @@ class EventManagementCLI:
                     print("Payment successful:", payment)
                 except Exception as e:
                     print("Error:", e)
+            elif choice in ("3", "4"):
+                booking_ids = [s.strip() for s in input("Booking IDs (comma-separated): ").split(",") if s.strip()]
+                try:
+                    if choice == "3":
+                        method = input("Payment Method (Cash/Card/UPI): ").strip()
+                        results = self.payment_service.process_payments(
+                            {"booking_id": booking_id, "method": method} for booking_id in booking_ids)
+                    else:
+                        results = self.payment_service.refund_payments(booking_ids)
+                    self.print_settlement(results)
+                except Exception as e:
+                    print("Error:", e)
             elif choice == "2":
                 break
             else:
@@ -222,6 +300,10 @@ class EventManagementCLI:
             print("2. Total Revenue Last Month")
             print("3. Total Bookings per Customer")
             print("4. Customers with >2 Bookings")
+            print("5. Revenue Between Dates")
+            print("6. Rebuild Sales Rollups")
+            print("7. Revenue by Event")
+            print("8. Daily Sales")
             print("0. Back")
             choice = input("Choice: ").strip()
             try:
@@ -240,6 +322,23 @@ class EventManagementCLI:
                     customers = self.reporting_service.customers_with_multiple_bookings()
                     for c in customers:
                         print(c)
+                elif choice in ("5", "8"):
+                    try:
+                        start = date.fromisoformat(input("From (YYYY-MM-DD): ").strip())
+                        end = date.fromisoformat(input("To (YYYY-MM-DD): ").strip())
+                    except ValueError:
+                        print("Invalid date")
+                        continue
+                    if choice == "5":
+                        print("Revenue:", self.reporting_service.revenue_between(start, end))
+                    else:
+                        for d in self.reporting_service.daily_sales(start, end):
+                            print(d)
+                elif choice == "6":
+                    self.rebuild_rollups()
+                elif choice == "7":
+                    for e in self.reporting_service.revenue_by_event():
+                        print(e)
                 elif choice == "0":
                     break
                 else:
@@ -247,7 +346,154 @@ class EventManagementCLI:
             except ReportingError as e:
                 print("Reporting error:", e)
 
+    def rebuild_rollups(self):
+        try:
+            buckets = self.reporting_service.rebuild_rollups()
+            print(f"Rebuilt {buckets} daily sales buckets")
+        except ReportingError as e:
+            print("Reporting error:", e)
+
+    # ---------------- DIAGNOSTICS ----------------
+    def diagnostics_menu(self):
+        while True:
+            print("\n--- Diagnostics Menu ---")
+            print(f"Request metrics are {'ON' if METRICS.enabled else 'OFF'}")
+            print("1. Show Database Calls")
+            print("2. Turn Metrics On/Off")
+            print("3. Reset Metrics")
+            print("4. Save Prometheus Metrics to File")
+            print("0. Back")
+            choice = input("Choice: ").strip()
+            if choice == "1":
+                self.print_metrics()
+            elif choice == "2":
+                METRICS.enabled = not METRICS.enabled
+            elif choice == "3":
+                METRICS.reset()
+            elif choice == "4":
+                path = input("File path: ").strip()
+                try:
+                    self.write_metrics(path)
+                    print("Metrics written to", path)
+                except OSError as e:
+                    print("Error:", e)
+            elif choice == "0":
+                break
+            else:
+                print("Invalid choice")
+
+    def print_metrics(self):
+        rows = METRICS.snapshot()
+        if not rows:
+            print("No database calls recorded")
+            return
+        print(f"{'table':<16}{'op':<8}{'calls':>7}{'errors':>7}{'avg ms':>10}{'p95 ms':>10}{'rows':>9}{'bytes':>11}")
+        for r in rows:
+            print(f"{r['table']:<16}{r['op']:<8}{r['requests']:>7}{r['errors']:>7}{r['avg_ms']:>10.2f}"
+                  f"{r['p95_ms']:>10.2f}{r['rows']:>9}{r['sent_bytes'] + r['received_bytes']:>11}")
+        if self.lookup_cache is not None:
+            print("Lookup cache:", self.lookup_cache.stats())
+        print("Report cache:", self.reporting_service.cache.stats())
+
+    def write_metrics(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(METRICS.prometheus())
+
+    # ---------------- BULK IMPORT ----------------
+    def import_file(self, kind: str, path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                    workers: int = DEFAULT_WORKERS, max_errors: int = 20):
+        importer = ImportService(self.customer_dao, self.event_dao, self.booking_dao,
+                                 batch_size=batch_size, workers=workers, emails=self.customer_service.emails,
+                                 booking_service=self.booking_service)
+        try:
+            result = importer.import_file(kind, path)
+        except (DataImportError, OSError) as e:
+            print("Import error:", e)
+            return
+        print(f"Imported {result['inserted']} {kind}, {result['failed']} failed")
+        for err in result["errors"][:max_errors]:
+            print(f"  line {err['line']}: {err['error']}")
+        if len(result["errors"]) > max_errors:
+            print(f"  ... {len(result['errors']) - max_errors} more errors")
+
+    # ---------------- SETTLEMENT ----------------
+    def settle_payments(self, action: str, path: str):
+        """
+        Pay (booking_id, method rows) or refund (booking_id rows) the payments listed in a CSV/JSONL file.
+        """
+        try:
+            rows = [row for _, row in read_rows(path)]
+            if action == "pay":
+                results = self.payment_service.process_payments(rows)
+            else:
+                results = self.payment_service.refund_payments(row.get("booking_id") for row in rows)
+        except (DataImportError, OSError) as e:
+            print("Settlement error:", e)
+            return
+        self.print_settlement(results)
+
+    def print_settlement(self, results, max_lines: int = 20):
+        counts = Counter(r["outcome"] for r in results)
+        print(", ".join(f"{count} {outcome}" for outcome, count in counts.most_common()) or "Nothing to settle")
+        problems = [r for r in results if r["outcome"] not in (OUTCOME_PAID, OUTCOME_REFUNDED)]
+        for r in problems[:max_lines]:
+            print(f"  booking {r['booking_id']}: {r['outcome']}")
+        if len(problems) > max_lines:
+            print(f"  ... {len(problems) - max_lines} more")
+
+    # ---------------- EXPORT ----------------
+    def export_table(self, table: str, path: str, fmt: str | None = None, since: str | None = None):
+        exporter = ExportService(self.customer_dao, self.event_dao, self.booking_dao, self.payment_dao)
+        try:
+            count = exporter.export(table, path, fmt, since)
+            print(f"Exported {count} {table} to {path}")
+        except (ExportError, OSError) as e:
+            print("Export error:", e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Event Management System")
+    sub = parser.add_subparsers(dest="command")
+    imp = sub.add_parser("import", help="Bulk import customers, events or bookings from a CSV/JSONL file")
+    imp.add_argument("kind", choices=["customers", "events", "bookings"])
+    imp.add_argument("path", help="Input file (.csv, .jsonl or .ndjson)")
+    imp.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per multi-row insert")
+    imp.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent insert workers")
+    exp = sub.add_parser("export", help="Stream a table to CSV, JSONL or Parquet")
+    exp.add_argument("table", choices=EXPORT_TABLES)
+    exp.add_argument("path", help="Output file; the format defaults to its extension")
+    exp.add_argument("--format", choices=EXPORT_FORMATS, help="Output format (overrides the extension)")
+    exp.add_argument("--since", help="Only rows created on/after this date (YYYY-MM-DD)")
+    rollups = sub.add_parser("rollups", help="Maintain the daily sales rollups (sql/rollups.sql)")
+    rollups.add_argument("action", choices=["rebuild"])
+    settle = sub.add_parser("payments", help="Pay or refund the payments listed in a CSV/JSONL settlement file")
+    settle.add_argument("action", choices=["pay", "refund"])
+    settle.add_argument("path", help="Rows with booking_id (and method, to pay)")
+    parser.add_argument("--columnar-reports", action="store_true",
+                        help="Answer reports from an in-memory NumPy snapshot (needs numpy)")
+    parser.add_argument("--metrics-out", help="Record database calls and write them to this file "
+                                              "(Prometheus text format) on exit")
+    args = parser.parse_args(argv)
+
+    if args.metrics_out:
+        METRICS.enabled = True
+    cli = EventManagementCLI(columnar_reports=args.columnar_reports)
+    try:
+        if args.command == "import":
+            cli.import_file(args.kind, args.path, args.batch_size, args.workers)
+        elif args.command == "export":
+            cli.export_table(args.table, args.path, args.format, args.since)
+        elif args.command == "rollups":
+            cli.rebuild_rollups()
+        elif args.command == "payments":
+            cli.settle_payments(args.action, args.path)
+        else:
+            cli.run()
+    finally:
+        if args.metrics_out:
+            cli.write_metrics(args.metrics_out)
+        close_supabase()
+
 
 if __name__ == "__main__":
-    cli = EventManagementCLI()
-    cli.run()
+    main()
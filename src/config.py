@@ -1,19 +1,151 @@
 # src/config.py
+import asyncio
+import atexit
 import os
+import threading
+from typing import Any, Dict, Tuple
+
+import httpx
 from dotenv import load_dotenv
-from supabase import create_client, Client
- 
+from supabase import create_client, Client, ClientOptions
+from supabase import acreate_client, AsyncClient, AsyncClientOptions
+from src.storage.backend import StorageClient
+from src.storage.sqlite_client import SQLiteClient, AsyncClientAdapter
+from src.storage.instrumentation import InstrumentedClient, AsyncInstrumentedClient, METRICS
+
 load_dotenv()  # loads .env from project root
- 
+
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
- 
-def get_supabase() -> Client:
-    """
-    Return a supabase client. Raises RuntimeError if config missing.
-    """
+
+# Storage backend: "supabase", "sqlite" (a local file at SQLITE_PATH) or "memory" (SQLite in RAM)
+DB_BACKEND = os.getenv("DB_BACKEND", "supabase").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "event_management.db")
+DB_BACKENDS = ("supabase", "sqlite", "memory")
+
+# Connection pool shared by every DAO/service in the process
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "20"))
+SUPABASE_MAX_KEEPALIVE = int(os.getenv("SUPABASE_MAX_KEEPALIVE", "10"))
+SUPABASE_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_KEEPALIVE_EXPIRY", "30"))
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "30"))
+# Max in-flight requests per process for the async DAOs
+SUPABASE_MAX_CONCURRENCY = int(os.getenv("SUPABASE_MAX_CONCURRENCY", str(SUPABASE_MAX_CONNECTIONS)))
+
+# Record per-request latency/row/byte metrics (see src/storage/instrumentation.py);
+# can also be switched at runtime through METRICS.enabled
+DB_METRICS = os.getenv("DB_METRICS", "0").lower() in ("1", "true", "yes", "on")
+METRICS.enabled = DB_METRICS
+
+# Entries in the DAO point-lookup cache (0 disables caching)
+DAO_CACHE_SIZE = int(os.getenv("DAO_CACHE_SIZE", "10000"))
+
+# Report result cache (src/services/report_cache.py): seconds an entry may be served
+# without a local write invalidating it (bounds staleness from other processes), and
+# an optional directory that keeps results across restarts
+REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL", "300"))
+REPORT_CACHE_DIR = os.getenv("REPORT_CACHE_DIR") or None
+
+# (url, key) or (backend, path) -> (client, resource to close)
+_clients: Dict[Tuple[str, str], Tuple[StorageClient, Any]] = {}
+_clients_lock = threading.Lock()
+# (url, key, event loop id) -> (async supabase client, underlying httpx client)
+_async_clients: Dict[Tuple[str, str, int], Tuple[AsyncInstrumentedClient, httpx.AsyncClient]] = {}
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=SUPABASE_MAX_CONNECTIONS,
+        max_keepalive_connections=SUPABASE_MAX_KEEPALIVE,
+        keepalive_expiry=SUPABASE_KEEPALIVE_EXPIRY,
+    )
+
+
+def _build_client(url: str, key: str) -> Tuple[Client, httpx.Client]:
+    http = httpx.Client(limits=_pool_limits(), timeout=SUPABASE_TIMEOUT, follow_redirects=True, http2=True)
+    return create_client(url, key, options=ClientOptions(httpx_client=http)), http
+
+
+def _build_local_client(path: str) -> Tuple[SQLiteClient, SQLiteClient]:
+    client = SQLiteClient(path)
+    return client, client
+
+
+def _registry_key() -> Tuple[str, str]:
+    if DB_BACKEND not in DB_BACKENDS:
+        raise RuntimeError(f"DB_BACKEND must be one of {', '.join(DB_BACKENDS)} (got {DB_BACKEND!r})")
+    if DB_BACKEND == "sqlite":
+        return ("sqlite", SQLITE_PATH)
+    if DB_BACKEND == "memory":
+        return ("sqlite", ":memory:")
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise RuntimeError("SUPABASE_URL and SUPABASE_KEY must be set in environment (.env)")
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
- 
- 
\ No newline at end of file
+    return (SUPABASE_URL, SUPABASE_KEY)
+
+
+def get_supabase() -> StorageClient:
+    """
+    Return the process-wide client of the configured backend (DB_BACKEND).
+    Raises RuntimeError if config missing.
+    The client (and its keep-alive connection pool) is created once and shared
+    by every caller; it is safe to use from multiple threads. Its requests are
+    recorded in METRICS while metrics are enabled.
+    """
+    registry_key = _registry_key()
+    entry = _clients.get(registry_key)
+    if entry is None:
+        with _clients_lock:
+            entry = _clients.get(registry_key)
+            if entry is None:
+                if registry_key[0] == "sqlite":
+                    client, closer = _build_local_client(registry_key[1])
+                else:
+                    client, closer = _build_client(*registry_key)
+                entry = (InstrumentedClient(client, METRICS), closer)
+                _clients[registry_key] = entry
+    return entry[0]
+
+
+def close_supabase() -> None:
+    """
+    Close every pooled client. The next get_supabase() call builds a fresh one.
+    """
+    with _clients_lock:
+        entries = list(_clients.values())
+        _clients.clear()
+    for _, http in entries:
+        http.close()
+
+
+atexit.register(close_supabase)
+
+
+async def get_async_supabase() -> AsyncClient:
+    """
+    Return the shared async supabase client for the running event loop.
+    httpx async pools are bound to a loop, so there is one client per loop.
+    Local backends hand out the sync client behind an async adapter.
+    """
+    url, key = _registry_key()
+    if url == "sqlite":
+        # Requests are recorded by the instrumented sync client underneath
+        return AsyncClientAdapter(get_supabase())
+    registry_key = (url, key, id(asyncio.get_running_loop()))
+    entry = _async_clients.get(registry_key)
+    if entry is None:
+        http = httpx.AsyncClient(limits=_pool_limits(), timeout=SUPABASE_TIMEOUT, follow_redirects=True, http2=True)
+        client = await acreate_client(url, key, options=AsyncClientOptions(httpx_client=http))
+        # Another coroutine may have won the race while we awaited
+        entry = _async_clients.setdefault(registry_key, (AsyncInstrumentedClient(client, METRICS), http))
+        if entry[1] is not http:
+            await http.aclose()
+    return entry[0]
+
+
+async def aclose_supabase() -> None:
+    """
+    Close the async client of the running event loop.
+    """
+    loop_id = id(asyncio.get_running_loop())
+    for registry_key in [k for k in _async_clients if k[2] == loop_id]:
+        _, http = _async_clients.pop(registry_key)
+        await http.aclose()
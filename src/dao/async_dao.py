@@ -0,0 +1,457 @@
+# src/dao/async_dao.py
+import asyncio
+from typing import Optional, Dict, Any, Iterable, List, Callable, Awaitable, Hashable, Sequence, AsyncIterator
+from datetime import date, datetime
+from postgrest.exceptions import APIError
+from supabase import AsyncClient
+from src.config import get_async_supabase, SUPABASE_MAX_CONCURRENCY
+from src.dao.base_dao import (BaseDAO, DAOError, ConflictError, DuplicateKeyError, SCAN_PAGE_SIZE, IN_CHUNK_SIZE,
+                              RPC_NOT_FOUND, RAISE_EXCEPTION, TRANSIENT_CODES, UNIQUE_VIOLATION)
+from src.dao.lookup_cache import LookupCache
+from src.dao.change_bus import CHANGE_BUS
+
+# event loop id -> semaphore bounding in-flight requests of every async DAO on that loop
+_request_limits: Dict[int, asyncio.Semaphore] = {}
+
+def _request_limit() -> asyncio.Semaphore:
+    loop_id = id(asyncio.get_running_loop())
+    limit = _request_limits.get(loop_id)
+    if limit is None:
+        limit = _request_limits.setdefault(loop_id, asyncio.Semaphore(SUPABASE_MAX_CONCURRENCY))
+    return limit
+
+class AsyncBaseDAO:
+    """
+    Async counterpart of BaseDAO on the async Supabase client.
+    Every request goes through `_execute`, which holds the process-wide
+    concurrency limit (SUPABASE_MAX_CONCURRENCY) while it is in flight.
+    """
+    table: str = ""
+    pk: str = ""
+
+    _select = staticmethod(BaseDAO._select)
+    _first = staticmethod(BaseDAO._first)
+    _chunks = staticmethod(BaseDAO._chunks)
+
+    def __init__(self, client: AsyncClient | None = None, cache: LookupCache | None = None):
+        self._sb = client  # resolved to the shared async client on first use
+        self._cache = cache
+        self._missing_rpcs: set = set()
+
+    async def _client(self) -> AsyncClient:
+        if self._sb is None:
+            self._sb = await get_async_supabase()
+        return self._sb
+
+    async def _query(self, table: str | None = None):
+        return (await self._client()).table(table or self.table)
+
+    @staticmethod
+    async def _execute(query) -> Any:
+        async with _request_limit():
+            return await query.execute()
+
+    async def _cached(self, key: Hashable, load: Callable[[], Awaitable[Optional[Dict]]],
+                      columns: Sequence[str] | None = None) -> Optional[Dict]:
+        if self._cache is None:
+            return await load()
+        row = self._cache.get(self.table, key)
+        if row is not None:
+            return {c: row.get(c) for c in columns} if columns else row
+        row = await load()
+        if row is not None and not columns:
+            self._cache.put(self.table, key, row)
+        return row
+
+    _invalidate = BaseDAO._invalidate
+    _refresh = BaseDAO._refresh
+    _written = BaseDAO._written
+    _watched = BaseDAO._watched
+    _peek = BaseDAO._peek
+    _changed = BaseDAO._changed
+
+    async def _rpc(self, fn: str, params: Dict) -> Any:
+        """
+        Call a SQL function (see sql/); returns None when this backend does not provide it.
+        """
+        if fn in self._missing_rpcs:
+            return None
+        try:
+            return (await self._execute((await self._client()).rpc(fn, params))).data
+        except NotImplementedError:
+            pass
+        except APIError as e:
+            if e.code != RPC_NOT_FOUND:
+                raise
+        self._missing_rpcs.add(fn)
+        return None
+
+    async def _get_one(self, column: str, value: Any, columns: Sequence[str] | None = None) -> Optional[Dict]:
+        query = (await self._query()).select(self._select(columns)).eq(column, value).limit(1)
+        return self._first(await self._execute(query))
+
+    async def _get_by_ids(self, pk: str, ids: Iterable[int], columns: Sequence[str] | None = None,
+                          chunk_size: int = IN_CHUNK_SIZE) -> Dict[int, Dict]:
+        """
+        Fetch many rows by primary key; the per-chunk queries run concurrently.
+        """
+        select = self._select(columns, pk)
+        queries = [(await self._query()).select(select).in_(pk, chunk) for chunk in self._chunks(ids, chunk_size)]
+        rows: Dict[int, Dict] = {}
+        for resp in await asyncio.gather(*(self._execute(q) for q in queries)):
+            for row in resp.data or []:
+                rows[row[pk]] = row
+        return rows
+
+    async def _list(self, limit: int, columns: Sequence[str] | None = None) -> List[Dict]:
+        query = (await self._query()).select(self._select(columns)).order(self.pk).limit(limit)
+        return (await self._execute(query)).data or []
+
+    async def fetch_page(self, after: int | None = None, page_size: int = SCAN_PAGE_SIZE,
+                         columns: Sequence[str] | None = None, since: str | None = None,
+                         where: Dict[str, Any] | None = None) -> List[Dict]:
+        """
+        One keyset page of rows in primary-key order (see BaseDAO.fetch_page).
+        """
+        query = (await self._query()).select(self._select(columns, self.pk))
+        for column, value in (where or {}).items():
+            query = query.eq(column, value)
+        if since is not None:
+            query = query.gte("created_at", since)
+        if after is not None:
+            query = query.gt(self.pk, after)
+        return (await self._execute(query.order(self.pk).limit(page_size))).data or []
+
+    async def _iter_rows(self, page_size: int = SCAN_PAGE_SIZE, columns: Sequence[str] | None = None,
+                         since: str | None = None, where: Dict[str, Any] | None = None) -> AsyncIterator[Dict]:
+        """
+        Stream the whole table one keyset page at a time; the next page is
+        requested while the caller consumes the current one.
+        """
+        pending = asyncio.ensure_future(self.fetch_page(None, page_size, columns, since, where))
+        try:
+            while pending is not None:
+                page = await pending
+                pending = None
+                if len(page) == page_size:
+                    pending = asyncio.ensure_future(
+                        self.fetch_page(page[-1][self.pk], page_size, columns, since, where))
+                for row in page:
+                    yield row
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def _insert(self, payload: Dict | List[Dict]) -> List[Dict]:
+        rows = (await self._execute((await self._query()).insert(payload))).data or []
+        self._changed("insert", rows)
+        return rows
+
+    async def _update_eq(self, fields: Dict, column: str, value: Any, key: Hashable = None,
+                         where: Dict[str, Any] | None = None) -> Optional[Dict]:
+        """
+        Update by `column`; `key` is the row's cache key when it is not `value`, and
+        `where` adds equality conditions ({column: value}) the row must also meet.
+        """
+        old = self._peek(value if key is None else key) if self._watched() else None
+        query = (await self._query()).update(fields).eq(column, value)
+        for condition, expected in (where or {}).items():
+            query = query.eq(condition, expected)
+        resp = await self._execute(query)
+        self._changed("update", resp.data, lambda row: old)
+        return self._first(resp)
+
+    async def _delete_eq(self, column: str, value: Any) -> List[Dict]:
+        rows = (await self._execute((await self._query()).delete().eq(column, value))).data or []
+        self._changed("delete", rows)
+        return rows
+
+class AsyncCustomerDAO(AsyncBaseDAO):
+    table = "customers"
+    pk = "cust_id"
+
+    async def create_customer(self, name: str, email: str, phone: str, city: str | None = None) -> Optional[Dict]:
+        payload = {"name": name, "email": email, "phone": phone}
+        if city:
+            payload["city"] = city
+        rows = await self._unique(self._insert(payload))
+        return rows[0] if rows else None
+
+    async def create_customers(self, rows: List[Dict]) -> List[Dict]:
+        return await self._unique(self._insert(rows)) if rows else []
+
+    @staticmethod
+    async def _unique(write: Awaitable[Any]) -> Any:
+        """
+        Await a write, reporting a unique-email violation as DuplicateKeyError.
+        """
+        try:
+            return await write
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise DuplicateKeyError(e.message)
+            raise
+
+    async def get_customer_by_id(self, cust_id: int, columns: Sequence[str] | None = None) -> Optional[Dict]:
+        return await self._cached(cust_id, lambda: self._get_one("cust_id", cust_id, columns), columns)
+
+    async def get_customers_by_ids(self, cust_ids: Iterable[int],
+                                   columns: Sequence[str] | None = None) -> Dict[int, Dict]:
+        return await self._get_by_ids("cust_id", cust_ids, columns)
+
+    async def list_customers(self, limit: int = 100, columns: Sequence[str] | None = None) -> List[Dict]:
+        return await self._list(limit, columns)
+
+    def iter_customers(self, page_size: int = SCAN_PAGE_SIZE, columns: Sequence[str] | None = None,
+                       since: str | None = None) -> AsyncIterator[Dict]:
+        return self._iter_rows(page_size, columns, since)
+
+    async def update_customer(self, cust_id: int, fields: Dict) -> Optional[Dict]:
+        return self._refresh(cust_id, await self._unique(self._update_eq(fields, "cust_id", cust_id)))
+
+    async def delete_customer(self, cust_id: int) -> Optional[Dict]:
+        rows = await self._delete_eq("cust_id", cust_id)
+        self._invalidate(cust_id)
+        return rows[0] if rows else None
+
+class AsyncEventDAO(AsyncBaseDAO):
+    table = "events"
+    pk = "event_id"
+
+    async def create_event(self, title: str, date: str, location: str, capacity: int, price: float) -> Optional[Dict]:
+        rows = await self._insert({"title": title, "date": date, "location": location,
+                                   "capacity": capacity, "price": price})
+        return rows[0] if rows else None
+
+    async def create_events(self, rows: List[Dict]) -> List[Dict]:
+        return await self._insert(rows) if rows else []
+
+    async def get_event_by_id(self, event_id: int, columns: Sequence[str] | None = None) -> Optional[Dict]:
+        return await self._cached(event_id, lambda: self._get_one("event_id", event_id, columns), columns)
+
+    async def get_events_by_ids(self, event_ids: Iterable[int],
+                                columns: Sequence[str] | None = None) -> Dict[int, Dict]:
+        return await self._get_by_ids("event_id", event_ids, columns)
+
+    async def list_events(self, limit: int = 100, columns: Sequence[str] | None = None) -> List[Dict]:
+        return await self._list(limit, columns)
+
+    def iter_events(self, page_size: int = SCAN_PAGE_SIZE, columns: Sequence[str] | None = None,
+                    since: str | None = None) -> AsyncIterator[Dict]:
+        return self._iter_rows(page_size, columns, since)
+
+    async def update_event(self, event_id: int, fields: Dict) -> Optional[Dict]:
+        return self._refresh(event_id, await self._update_eq(fields, "event_id", event_id))
+
+    async def compare_and_set_capacity(self, event_id: int, expected: int, new_capacity: int) -> Optional[Dict]:
+        """
+        Set capacity only if it still equals `expected`; None if another writer changed it first.
+        """
+        query = (await self._query()).update({"capacity": new_capacity})\
+                    .eq("event_id", event_id).eq("capacity", expected)
+        updated = self._first(await self._execute(query))
+        if updated:
+            self._changed("update", [updated], lambda row: {**row, "capacity": expected})
+        return self._refresh(event_id, updated)
+
+    async def delete_event(self, event_id: int) -> Optional[Dict]:
+        rows = await self._delete_eq("event_id", event_id)
+        self._invalidate(event_id)
+        return rows[0] if rows else None
+
+class AsyncBookingDAO(AsyncBaseDAO):
+    table = "bookings"
+    pk = "booking_id"
+
+    async def create_booking(self, cust_id: int, event_id: int, seats: int) -> Optional[Dict]:
+        rows = await self._insert({"cust_id": cust_id, "event_id": event_id, "seats": seats, "status": "BOOKED"})
+        return rows[0] if rows else None
+
+    async def create_bookings(self, rows: List[Dict]) -> List[Dict]:
+        return await self._insert([{"status": "BOOKED", **row} for row in rows]) if rows else []
+
+    async def reserve_booking(self, cust_id: int, event_id: int, seats: int) -> Optional[Dict]:
+        """
+        Atomic reservation through sql/booking.sql (see BookingDAO.reserve_booking).
+        """
+        try:
+            booking = await self._rpc("reserve_booking",
+                                      {"p_cust_id": cust_id, "p_event_id": event_id, "p_seats": seats})
+            if booking is not None:
+                self._written("events", "payments")
+                self._changed("insert", [booking])
+                self._invalidate(event_id, "events")
+                await self._publish_reserved(booking)
+            return booking
+        except APIError as e:
+            if e.code == RAISE_EXCEPTION:
+                raise DAOError(e.message)
+            if e.code in TRANSIENT_CODES:
+                raise ConflictError(e.message)
+            raise
+
+    async def _publish_reserved(self, booking: Dict) -> None:
+        """
+        Publish the event update and payment insert made by reserve_booking (see BookingDAO).
+        """
+        if CHANGE_BUS.wants("events"):
+            query = (await self._query("events")).select("*").eq("event_id", booking["event_id"]).limit(1)
+            CHANGE_BUS.publish_rows("events", "event_id", "update", (await self._execute(query)).data,
+                                    lambda row: {**row, "capacity": row["capacity"] + booking["seats"]})
+        if CHANGE_BUS.wants("payments"):
+            query = (await self._query("payments")).select("*").eq("booking_id", booking["booking_id"])
+            CHANGE_BUS.publish_rows("payments", "payment_id", "insert", (await self._execute(query)).data)
+
+    async def get_booking_by_id(self, booking_id: int, columns: Sequence[str] | None = None) -> Optional[Dict]:
+        return await self._cached(booking_id, lambda: self._get_one("booking_id", booking_id, columns), columns)
+
+    async def get_bookings_by_ids(self, booking_ids: Iterable[int],
+                                  columns: Sequence[str] | None = None) -> Dict[int, Dict]:
+        return await self._get_by_ids("booking_id", booking_ids, columns)
+
+    async def list_bookings(self, limit: int = 100, columns: Sequence[str] | None = None) -> List[Dict]:
+        return await self._list(limit, columns)
+
+    def iter_bookings(self, page_size: int = SCAN_PAGE_SIZE, since: str | None = None,
+                      columns: Sequence[str] | None = None) -> AsyncIterator[Dict]:
+        return self._iter_rows(page_size, columns, since)
+
+    def iter_bookings_for_event(self, event_id: int, columns: Sequence[str] | None = None,
+                                page_size: int = SCAN_PAGE_SIZE) -> AsyncIterator[Dict]:
+        return self._iter_rows(page_size, columns, where={"event_id": event_id})
+
+    async def update_booking(self, booking_id: int, fields: Dict) -> Optional[Dict]:
+        return self._refresh(booking_id, await self._update_eq(fields, "booking_id", booking_id))
+
+    async def cancel_bookings(self, booking_ids: Iterable[int]) -> List[Dict]:
+        """
+        Mark many BOOKED bookings as CANCELLED; the per-chunk updates run concurrently.
+        """
+        queries = [(await self._query()).update({"status": "CANCELLED"}).in_("booking_id", chunk).eq("status", "BOOKED")
+                   for chunk in self._chunks(booking_ids)]
+        cancelled: List[Dict] = []
+        for resp in await asyncio.gather(*(self._execute(q) for q in queries)):
+            for row in resp.data or []:
+                cancelled.append(self._refresh(row["booking_id"], row))
+        self._changed("update", cancelled, lambda row: {**row, "status": "BOOKED"})
+        return cancelled
+
+    async def delete_bookings_for_event(self, event_id: int) -> List[Dict]:
+        rows = await self._delete_eq("event_id", event_id)
+        for row in rows:
+            self._invalidate(row["booking_id"])
+        return rows
+
+    async def delete_booking(self, booking_id: int) -> Optional[Dict]:
+        rows = await self._delete_eq("booking_id", booking_id)
+        self._invalidate(booking_id)
+        return rows[0] if rows else None
+
+class AsyncPaymentDAO(AsyncBaseDAO):
+    table = "payments"
+    pk = "payment_id"
+
+    async def create_payment(self, booking_id: int, amount: float, method: str | None = None) -> Optional[Dict]:
+        rows = await self._insert({"booking_id": booking_id, "amount": amount, "method": method, "status": "PENDING"})
+        return self._refresh(("booking", booking_id), rows[0] if rows else None)
+
+    async def mark_paid(self, booking_id: int, method: str, status: str | None = None) -> Optional[Dict]:
+        """
+        See PaymentDAO.mark_paid: with `status`, only a payment currently in that status is paid.
+        """
+        row = await self._update_eq({"status": "PAID", "method": method}, "booking_id", booking_id,
+                                    ("booking", booking_id), {"status": status} if status else None)
+        return self._refresh(("booking", booking_id), row)
+
+    async def refund_payment(self, booking_id: int, status: str | None = None) -> Optional[Dict]:
+        row = await self._update_eq({"status": "REFUNDED"}, "booking_id", booking_id, ("booking", booking_id),
+                                    {"status": status} if status else None)
+        return self._refresh(("booking", booking_id), row)
+
+    async def refund_payments_for_bookings(self, booking_ids: Iterable[int], status: str | None = None) -> List[Dict]:
+        """
+        Mark the payments of many bookings as REFUNDED; the per-chunk updates run concurrently.
+        `status` limits the refund to payments currently in that status.
+        """
+        queries = []
+        for chunk in self._chunks(booking_ids):
+            query = (await self._query()).update({"status": "REFUNDED"}).in_("booking_id", chunk)
+            queries.append(query.eq("status", status) if status else query.neq("status", "REFUNDED"))
+        refunded: List[Dict] = []
+        for resp in await asyncio.gather(*(self._execute(q) for q in queries)):
+            for row in resp.data or []:
+                refunded.append(self._refresh(("booking", row["booking_id"]), row))
+        self._changed("update", refunded, (lambda row: {**row, "status": status}) if status else None)
+        return refunded
+
+    async def delete_payments_for_bookings(self, booking_ids: Iterable[int]) -> List[Dict]:
+        queries = [(await self._query()).delete().in_("booking_id", chunk) for chunk in self._chunks(booking_ids)]
+        deleted: List[Dict] = []
+        for resp in await asyncio.gather(*(self._execute(q) for q in queries)):
+            for row in resp.data or []:
+                self._invalidate(("booking", row["booking_id"]))
+                deleted.append(row)
+        self._changed("delete", deleted)
+        return deleted
+
+    def iter_payments(self, page_size: int = SCAN_PAGE_SIZE, since: str | None = None,
+                      columns: Sequence[str] | None = None) -> AsyncIterator[Dict]:
+        return self._iter_rows(page_size, columns, since)
+
+    async def get_payments_by_bookings(self, booking_ids: Iterable[int],
+                                       columns: Sequence[str] | None = None) -> Dict[int, Dict]:
+        return await self._get_by_ids("booking_id", booking_ids, columns)
+
+    async def get_payment_by_booking(self, booking_id: int, columns: Sequence[str] | None = None) -> Optional[Dict]:
+        return await self._cached(("booking", booking_id),
+                                  lambda: self._get_one("booking_id", booking_id, columns), columns)
+
+class AsyncReportDAO(AsyncBaseDAO):
+    """
+    Async counterpart of ReportDAO: SQL functions from sql/reporting.sql when
+    deployed, otherwise a paged scan aggregated in Python.
+    """
+    table = "bookings"
+    pk = "booking_id"
+
+    async def _sum_by(self, key: str, value: str | None = None, since: str | None = None) -> Dict[int, int]:
+        columns = [key, value] if value else [key]
+        totals: Dict[int, int] = {}
+        async for b in self._iter_rows(columns=columns, since=since):
+            totals[b[key]] = totals.get(b[key], 0) + (b[value] if value else 1)
+        return totals
+
+    async def event_seats(self, limit: int = 5) -> List[Dict]:
+        rows = await self._rpc("report_event_seats", {"p_limit": limit})
+        if rows is not None:
+            return rows
+        seats = await self._sum_by("event_id", "seats")
+        top_eids = sorted(seats, key=seats.get, reverse=True)[:limit]
+        events = await AsyncEventDAO(self._sb).get_events_by_ids(top_eids, ["title"])
+        return [{"event_id": eid, "title": events[eid]["title"], "seats_sold": seats[eid]}
+                for eid in top_eids if eid in events]
+
+    async def revenue_since(self, since: datetime) -> float:
+        total = await self._rpc("report_revenue_since", {"p_since": since.isoformat()})
+        if total is not None:
+            return float(total)
+        seats = await self._sum_by("event_id", "seats", since=since.date().isoformat())
+        events = await AsyncEventDAO(self._sb).get_events_by_ids(seats, ["price"])
+        return float(sum(n * events[eid]["price"] for eid, n in seats.items() if eid in events))
+
+    async def paid_revenue_since(self, since: date) -> float:
+        total = await self._rpc("report_paid_revenue_since", {"p_since": since.isoformat()})
+        if total is not None:
+            return float(total)
+        booking_ids = [b["booking_id"] async for b in self._iter_rows(columns=["booking_id"], since=since.isoformat())]
+        payments = await AsyncPaymentDAO(self._sb).get_payments_by_bookings(booking_ids, ["amount", "status"])
+        return float(sum(p["amount"] for p in payments.values() if p["status"] == "PAID"))
+
+    async def customer_bookings(self, min_bookings: int = 0) -> List[Dict]:
+        rows = await self._rpc("report_customer_bookings", {"p_min_bookings": min_bookings})
+        if rows is not None:
+            return rows
+        counts = {cid: n for cid, n in (await self._sum_by("cust_id")).items() if n > min_bookings}
+        customers = await AsyncCustomerDAO(self._sb).get_customers_by_ids(counts, ["name"])
+        return [{"cust_id": cid, "name": customers[cid]["name"], "bookings": counts[cid]}
+                for cid in sorted(counts) if cid in customers]
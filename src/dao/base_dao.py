@@ -0,0 +1,230 @@
+# src/dao/base_dao.py
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Callable, Hashable, Sequence
+from postgrest.exceptions import APIError
+from supabase import Client
+from src.config import get_supabase
+from src.dao.lookup_cache import LookupCache
+from src.dao.table_versions import TABLE_VERSIONS
+from src.dao.change_bus import CHANGE_BUS
+
+# Max ids per `in` filter; keeps the request URL well under PostgREST limits
+IN_CHUNK_SIZE = 200
+# Default rows per keyset page when walking a whole table
+SCAN_PAGE_SIZE = 1000
+# PostgREST error code for "function not found in the schema cache"
+RPC_NOT_FOUND = "PGRST202"
+# Postgres error code for exceptions raised from our SQL functions (RAISE EXCEPTION)
+RAISE_EXCEPTION = "P0001"
+# Postgres serialization failure / deadlock: the transaction can simply be retried
+TRANSIENT_CODES = ("40001", "40P01")
+# Postgres unique_violation
+UNIQUE_VIOLATION = "23505"
+
+class DAOError(Exception):
+    """Raised when the database rejects an operation (constraint or business rule)."""
+    pass
+
+class ConflictError(DAOError):
+    """Raised on a transient write conflict; the operation is safe to retry."""
+    pass
+
+class DuplicateKeyError(DAOError):
+    """Raised when a write would break a unique constraint."""
+    pass
+
+def pages(rows: Iterable[Dict], page_size: int) -> Iterator[List[Dict]]:
+    """
+    Lists of up to `page_size` rows from any iterable (e.g. a DAO scan), consumed lazily.
+    """
+    rows = iter(rows)
+    while True:
+        page = list(islice(rows, page_size))
+        if not page:
+            return
+        yield page
+
+class BaseDAO:
+    """
+    Shared plumbing for the table DAOs.
+    Every mutation returns the affected row straight from the write response
+    (PostgREST `return=representation`), so no DAO needs a follow-up select.
+    """
+    table: str = ""
+    pk: str = ""
+
+    def __init__(self, client: Client | None = None, cache: LookupCache | None = None):
+        self._sb = client or get_supabase()  # shared, pooled Supabase client
+        self._cache = cache  # optional read-through cache for point lookups
+        self._missing_rpcs: set = set()
+
+    @property
+    def client(self) -> Client:
+        """The storage client this DAO talks to, for building sibling DAOs on the same backend."""
+        return self._sb
+
+    @staticmethod
+    def _select(columns: Sequence[str] | None, *required: str) -> str:
+        """
+        PostgREST select list for a projection; None means every column.
+        `required` columns (e.g. keys the DAO itself needs) are always included.
+        """
+        if not columns:
+            return "*"
+        return ",".join(dict.fromkeys((*required, *columns)))
+
+    def _cached(self, key: Hashable, load: Callable[[], Optional[Dict]],
+                columns: Sequence[str] | None = None) -> Optional[Dict]:
+        """
+        Read-through lookup: serve `key` from the cache, else load it and remember it.
+        A cached full row also answers projected reads; projected rows are never cached.
+        """
+        if self._cache is None:
+            return load()
+        row = self._cache.get(self.table, key)
+        if row is not None:
+            return {c: row.get(c) for c in columns} if columns else row
+        row = load()
+        if row is not None and not columns:
+            self._cache.put(self.table, key, row)
+        return row
+
+    def _invalidate(self, key: Hashable, table: str | None = None) -> None:
+        if self._cache is not None:
+            self._cache.invalidate(table or self.table, key)
+
+    def _written(self, *tables: str) -> None:
+        """
+        After a write: bump the version of the tables it changed (default: this DAO's).
+        """
+        TABLE_VERSIONS.bump(*(tables or (self.table,)))
+
+    def _watched(self) -> bool:
+        """
+        Whether anyone subscribes to changes of this DAO's table (worth capturing old rows).
+        """
+        return CHANGE_BUS.wants(self.table)
+
+    def _peek(self, key: Hashable) -> Optional[Dict]:
+        """
+        The cached row for `key` if there is one, to report as the old row of an update.
+        """
+        return self._cache.peek(self.table, key) if self._cache is not None else None
+
+    def _changed(self, op: str, rows: Iterable[Dict] | None,
+                 old: Callable[[Dict], Optional[Dict]] | None = None) -> None:
+        """
+        After a write to this DAO's table: bump its version and publish one change
+        event per affected row. `rows` are the rows the write returned (the deleted
+        rows for a delete); `old` maps an updated row to its previous state, if known.
+        """
+        self._written()
+        CHANGE_BUS.publish_rows(self.table, self.pk, op, rows, old)
+
+    def _refresh(self, key: Hashable, row: Optional[Dict]) -> Optional[Dict]:
+        """
+        After a write: cache the row the database returned (or drop the key if none).
+        """
+        if self._cache is not None:
+            if row is None:
+                self._cache.invalidate(self.table, key)
+            else:
+                self._cache.put(self.table, key, row)
+        return row
+
+    def _rpc(self, fn: str, params: Dict) -> Any:
+        """
+        Call a SQL function (see sql/); returns None when this backend does not provide it.
+        """
+        if fn in self._missing_rpcs:
+            return None
+        try:
+            return self._sb.rpc(fn, params).execute().data
+        except NotImplementedError:
+            pass
+        except APIError as e:
+            if e.code != RPC_NOT_FOUND:
+                raise
+        self._missing_rpcs.add(fn)
+        return None
+
+    @staticmethod
+    def _like(text: str, match: str = "prefix") -> str:
+        """
+        ilike pattern for values that start with ("prefix"), contain ("contains")
+        or equal ("exact") `text`; wildcard characters typed by the user are dropped.
+        """
+        term = text.strip().replace("%", "").replace("*", "")
+        return {"prefix": f"{term}%", "contains": f"%{term}%", "exact": term}[match]
+
+    @staticmethod
+    def _first(resp: Any) -> Optional[Dict]:
+        return resp.data[0] if resp.data else None
+
+    @staticmethod
+    def _chunks(ids: Iterable[int], chunk_size: int = IN_CHUNK_SIZE) -> Iterator[List[int]]:
+        """
+        Distinct, non-null ids split into lists small enough for one `in` filter.
+        """
+        unique_ids = list(dict.fromkeys(i for i in ids if i is not None))
+        for start in range(0, len(unique_ids), chunk_size):
+            yield unique_ids[start:start + chunk_size]
+
+    def _get_by_ids(self, pk: str, ids: Iterable[int], columns: Sequence[str] | None = None,
+                    chunk_size: int = IN_CHUNK_SIZE) -> Dict[int, Dict]:
+        """
+        Fetch many rows by primary key with one `in`-filtered query per chunk.
+        Returns {pk: row}; ids that do not exist are simply absent.
+        """
+        select = self._select(columns, pk)
+        rows: Dict[int, Dict] = {}
+        for chunk in self._chunks(ids, chunk_size):
+            resp = self._sb.table(self.table).select(select).in_(pk, chunk).execute()
+            for row in resp.data or []:
+                rows[row[pk]] = row
+        return rows
+
+    def fetch_page(self, after: int | None = None, page_size: int = SCAN_PAGE_SIZE,
+                   columns: Sequence[str] | None = None, since: str | None = None,
+                   where: Dict[str, Any] | None = None) -> List[Dict]:
+        """
+        One page of rows in primary-key order, starting after the key `after`.
+        Uses `pk > after` instead of OFFSET so every page is an index seek.
+        `since` keeps only rows with created_at >= since; `where` adds equality
+        filters ({column: value}). The pk is always selected.
+        """
+        query = self._sb.table(self.table).select(self._select(columns, self.pk))
+        for column, value in (where or {}).items():
+            query = query.eq(column, value)
+        if since is not None:
+            query = query.gte("created_at", since)
+        if after is not None:
+            query = query.gt(self.pk, after)
+        resp = query.order(self.pk).limit(page_size).execute()
+        return resp.data or []
+
+    def _iter_rows(self, page_size: int = SCAN_PAGE_SIZE, columns: Sequence[str] | None = None,
+                   since: str | None = None, prefetch: bool = True,
+                   where: Dict[str, Any] | None = None) -> Iterator[Dict]:
+        """
+        Stream the whole table in constant memory, one keyset page at a time.
+        With `prefetch`, the next page is requested in the background while the
+        caller consumes the current one.
+        """
+        if not prefetch:
+            after = None
+            while True:
+                page = self.fetch_page(after, page_size, columns, since, where)
+                yield from page
+                if len(page) < page_size:
+                    return
+                after = page[-1][self.pk]
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(self.fetch_page, None, page_size, columns, since, where)
+            while pending is not None:
+                page = pending.result()
+                pending = None
+                if len(page) == page_size:
+                    pending = pool.submit(self.fetch_page, page[-1][self.pk], page_size, columns, since, where)
+                yield from page
@@ -1,10 +1,12 @@
 # src/dao/bookings_dao.py
-from typing import Optional, List, Dict
-from src.config import get_supabase
+from typing import Optional, List, Dict, Iterable, Iterator, Sequence
+from postgrest.exceptions import APIError
+from src.dao.base_dao import BaseDAO, SCAN_PAGE_SIZE, DAOError, ConflictError, RAISE_EXCEPTION, TRANSIENT_CODES
+from src.dao.change_bus import CHANGE_BUS
 
-class BookingDAO:
-    def __init__(self):
-        self._sb = get_supabase()
+class BookingDAO(BaseDAO):
+    table = "bookings"
+    pk = "booking_id"
 
     def create_booking(self, cust_id: int, event_id: int, seats: int) -> Optional[Dict]:
         payload = {
@@ -13,26 +15,141 @@ class BookingDAO:
             "seats": seats,
             "status": "BOOKED"
         }
-        self._sb.table("bookings").insert(payload).execute()
-        resp = self._sb.table("bookings").select("*")\
-                   .eq("cust_id", cust_id).eq("event_id", event_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        resp = self._sb.table("bookings").insert(payload).execute()
+        self._changed("insert", resp.data)
+        return self._first(resp)
+
+    def create_bookings(self, rows: List[Dict]) -> List[Dict]:
+        """
+        Insert many bookings with one multi-row insert; returns the created rows.
+        Rows without a status are created as BOOKED.
+        """
+        if not rows:
+            return []
+        payload = [{"status": "BOOKED", **row} for row in rows]
+        resp = self._sb.table("bookings").insert(payload).execute()
+        self._changed("insert", resp.data)
+        return resp.data or []
+
+    def reserve_booking(self, cust_id: int, event_id: int, seats: int) -> Optional[Dict]:
+        """
+        Atomically reserve seats and create the booking plus its pending payment
+        (sql/booking.sql). Returns None when the backend lacks the function;
+        raises DAOError when the reservation is rejected (e.g. not enough seats).
+        """
+        return self._reserve("reserve_booking", {"p_cust_id": cust_id, "p_event_id": event_id, "p_seats": seats},
+                             [event_id])
+
+    def reserve_bookings(self, items: List[Dict]) -> Optional[List[Dict]]:
+        """
+        Reserve many bookings ({"cust_id", "event_id", "seats"}) all-or-nothing in one
+        call (sql/booking.sql). Returns the bookings in input order, None when the
+        backend lacks the function; raises DAOError if any item is rejected.
+        """
+        if not items:
+            return []
+        return self._reserve("reserve_bookings", {"p_items": items}, [i["event_id"] for i in items])
+
+    def _reserve(self, fn: str, params: Dict, event_ids: List[int]):
+        try:
+            result = self._rpc(fn, params)
+            if result is not None:
+                bookings = [result] if isinstance(result, dict) else result
+                self._written("events", "payments")
+                self._changed("insert", bookings)
+                # The function also changed the events' capacity
+                for event_id in set(event_ids):
+                    self._invalidate(event_id, "events")
+                self._publish_reserved(bookings)
+            return result
+        except APIError as e:
+            if e.code == RAISE_EXCEPTION:
+                raise DAOError(e.message)
+            if e.code in TRANSIENT_CODES:
+                raise ConflictError(e.message)
+            raise
+
+    def _publish_reserved(self, bookings: List[Dict]) -> None:
+        """
+        The reservation functions also update events and insert payments without
+        returning them: re-read those rows for the tables someone watches and publish them.
+        """
+        seats_by_event: Dict[int, int] = {}
+        for b in bookings:
+            seats_by_event[b["event_id"]] = seats_by_event.get(b["event_id"], 0) + b["seats"]
+        if CHANGE_BUS.wants("events"):
+            events: List[Dict] = []
+            for chunk in self._chunks(seats_by_event):
+                events.extend(self._sb.table("events").select("*").in_("event_id", chunk).execute().data or [])
+            CHANGE_BUS.publish_rows("events", "event_id", "update", events,
+                                    lambda row: {**row, "capacity": row["capacity"] + seats_by_event[row["event_id"]]})
+        if CHANGE_BUS.wants("payments"):
+            payments: List[Dict] = []
+            for chunk in self._chunks(b["booking_id"] for b in bookings):
+                payments.extend(self._sb.table("payments").select("*").in_("booking_id", chunk).execute().data or [])
+            CHANGE_BUS.publish_rows("payments", "payment_id", "insert", payments)
+
+    def get_booking_by_id(self, booking_id: int, columns: Sequence[str] | None = None) -> Optional[Dict]:
+        return self._cached(booking_id, lambda: self._fetch_booking(booking_id, columns), columns)
 
-    def get_booking_by_id(self, booking_id: int) -> Optional[Dict]:
-        resp = self._sb.table("bookings").select("*").eq("booking_id", booking_id).limit(1).execute()
+    def _fetch_booking(self, booking_id: int, columns: Sequence[str] | None = None) -> Optional[Dict]:
+        resp = self._sb.table("bookings").select(self._select(columns)).eq("booking_id", booking_id).limit(1).execute()
         return resp.data[0] if resp.data else None
 
-    def list_bookings(self, limit: int = 100) -> List[Dict]:
-        resp = self._sb.table("bookings").select("*").order("booking_id").limit(limit).execute()
+    def get_bookings_by_ids(self, booking_ids: Iterable[int], columns: Sequence[str] | None = None) -> Dict[int, Dict]:
+        return self._get_by_ids("booking_id", booking_ids, columns)
+
+    def list_bookings(self, limit: int = 100, columns: Sequence[str] | None = None) -> List[Dict]:
+        resp = self._sb.table("bookings").select(self._select(columns)).order("booking_id").limit(limit).execute()
         return resp.data or []
 
+    def iter_bookings(self, page_size: int = SCAN_PAGE_SIZE, since: str | None = None,
+                      columns: Sequence[str] | None = None, prefetch: bool = True) -> Iterator[Dict]:
+        return self._iter_rows(page_size, columns, since, prefetch)
+
+    def iter_bookings_for_event(self, event_id: int, columns: Sequence[str] | None = None,
+                                page_size: int = SCAN_PAGE_SIZE) -> Iterator[Dict]:
+        return self._iter_rows(page_size, columns, prefetch=False, where={"event_id": event_id})
+
     def update_booking(self, booking_id: int, fields: Dict) -> Optional[Dict]:
-        self._sb.table("bookings").update(fields).eq("booking_id", booking_id).execute()
-        resp = self._sb.table("bookings").select("*").eq("booking_id", booking_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        old = self._peek(booking_id) if self._watched() else None
+        resp = self._sb.table("bookings").update(fields).eq("booking_id", booking_id).execute()
+        self._changed("update", resp.data, lambda row: old)
+        return self._refresh(booking_id, self._first(resp))
+
+    def cancel_bookings(self, booking_ids: Iterable[int]) -> List[Dict]:
+        """
+        Mark many BOOKED bookings as CANCELLED, one update per chunk of ids.
+        Returns only the rows this call cancelled (already-cancelled ones are skipped).
+        """
+        cancelled: List[Dict] = []
+        for chunk in self._chunks(booking_ids):
+            resp = self._sb.table("bookings").update({"status": "CANCELLED"})\
+                       .in_("booking_id", chunk).eq("status", "BOOKED").execute()
+            for row in resp.data or []:
+                cancelled.append(self._refresh(row["booking_id"], row))
+        self._changed("update", cancelled, lambda row: {**row, "status": "BOOKED"})
+        return cancelled
+
+    def delete_bookings_for_event(self, event_id: int) -> List[Dict]:
+        resp = self._sb.table("bookings").delete().eq("event_id", event_id).execute()
+        self._changed("delete", resp.data)
+        for row in resp.data or []:
+            self._invalidate(row["booking_id"])
+        return resp.data or []
+
+    def delete_bookings(self, booking_ids: Iterable[int]) -> List[Dict]:
+        deleted: List[Dict] = []
+        for chunk in self._chunks(booking_ids):
+            resp = self._sb.table("bookings").delete().in_("booking_id", chunk).execute()
+            for row in resp.data or []:
+                self._invalidate(row["booking_id"])
+                deleted.append(row)
+        self._changed("delete", deleted)
+        return deleted
 
     def delete_booking(self, booking_id: int) -> Optional[Dict]:
-        resp_before = self._sb.table("bookings").select("*").eq("booking_id", booking_id).limit(1).execute()
-        row = resp_before.data[0] if resp_before.data else None
-        self._sb.table("bookings").delete().eq("booking_id", booking_id).execute()
-        return row
+        resp = self._sb.table("bookings").delete().eq("booking_id", booking_id).execute()
+        self._changed("delete", resp.data)
+        self._invalidate(booking_id)
+        return self._first(resp)
@@ -0,0 +1,206 @@
+# src/dao/change_bus.py
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+OPS = ("insert", "update", "delete")
+# Events a background subscriber may have waiting before new ones are dropped
+DEFAULT_QUEUE_SIZE = 10_000
+
+class ChangeEvent:
+    """
+    One row changed in `table`: op is "insert", "update" or "delete"; `key`
+    is the row's primary key; `old` / `new` are the row before / after
+    (None for an insert's old and a delete's new, and for an update's old
+    when the writer did not know it). `source` is "dao" for writes made
+    by this process's DAOs, "realtime" for database notifications.
+    """
+    __slots__ = ("table", "op", "key", "old", "new", "source", "at")
+
+    def __init__(self, table: str, op: str, key: Hashable, old: Optional[Dict] = None,
+                 new: Optional[Dict] = None, source: str = "dao", at: float | None = None):
+        self.table = table
+        self.op = op
+        self.key = key
+        self.old = old
+        self.new = new
+        self.source = source
+        self.at = time.time() if at is None else at
+
+    @property
+    def row(self) -> Optional[Dict]:
+        """The row as it is now, or as it was for a delete."""
+        return self.new if self.new is not None else self.old
+
+    def __repr__(self) -> str:
+        return f"ChangeEvent({self.table}.{self.op} key={self.key!r} source={self.source})"
+
+class Subscription:
+    """
+    A handler and the events it wants; None filters match everything.
+    Synchronous subscriptions run the handler inside publish(), on the
+    writer's thread, so handlers must be quick and must not write through the DAOs.
+    """
+    def __init__(self, bus: "ChangeBus", handler: Callable[[ChangeEvent], Any],
+                 tables: Iterable[str] | None = None, ops: Iterable[str] | None = None,
+                 sources: Iterable[str] | None = None):
+        self._bus = bus
+        self.handler = handler
+        self.tables = frozenset(tables) if tables is not None else None
+        self.ops = frozenset(ops) if ops is not None else None
+        self.sources = frozenset(sources) if sources is not None else None
+        self.delivered = 0
+        self.errors = 0
+
+    def matches(self, event: ChangeEvent) -> bool:
+        return (self.tables is None or event.table in self.tables) and \
+               (self.ops is None or event.op in self.ops) and \
+               (self.sources is None or event.source in self.sources)
+
+    def _call(self, event: ChangeEvent) -> None:
+        try:
+            self.handler(event)
+            self.delivered += 1
+        except Exception as e:
+            self.errors += 1
+            print("Change subscriber error:", e)
+
+    def deliver(self, event: ChangeEvent) -> None:
+        self._call(event)
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+class BackgroundSubscription(Subscription):
+    """
+    Runs the handler on its own daemon thread, fed through a bounded queue.
+    When the queue is full the writer is never held up: the event is dropped
+    and counted in `dropped` (with `block`, the writer waits for room instead).
+    A subscriber that sees drops should rebuild its state from the tables.
+    """
+    _STOP = object()
+
+    def __init__(self, bus: "ChangeBus", handler: Callable[[ChangeEvent], Any],
+                 tables: Iterable[str] | None = None, ops: Iterable[str] | None = None,
+                 sources: Iterable[str] | None = None, max_queue: int = DEFAULT_QUEUE_SIZE,
+                 block: bool = False):
+        super().__init__(bus, handler, tables, ops, sources)
+        self.block = block
+        self.dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="change-subscriber", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            event = self._queue.get()
+            try:
+                if event is self._STOP:
+                    return
+                self._call(event)
+            finally:
+                self._queue.task_done()
+
+    def deliver(self, event: ChangeEvent) -> None:
+        if self.block:
+            self._queue.put(event)
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def drain(self) -> None:
+        """Wait until every queued event has been handled."""
+        self._queue.join()
+
+    def close(self, drain: bool = True) -> None:
+        super().close()
+        if drain:
+            self._queue.put(self._STOP)
+            self._thread.join()
+        else:
+            try:
+                self._queue.put_nowait(self._STOP)
+            except queue.Full:
+                pass
+
+class ChangeBus:
+    """
+    In-process publish/subscribe for row changes. The DAOs publish after
+    every write they make; change feeds (src/dao/change_feed.py) publish
+    database notifications. Publishing to a table nobody watches costs one
+    set lookup, and the DAOs skip building events altogether.
+    """
+    def __init__(self):
+        self._subs: List[Subscription] = []  # replaced, never mutated, so publish needs no lock
+        self._tables: frozenset = frozenset()
+        self._all = False
+        self._lock = threading.Lock()
+
+    def _update(self, subs: List[Subscription]) -> None:
+        self._subs = subs
+        self._all = any(s.tables is None for s in subs)
+        self._tables = frozenset(t for s in subs if s.tables is not None for t in s.tables)
+
+    def _add(self, sub: Subscription) -> Subscription:
+        with self._lock:
+            self._update(self._subs + [sub])
+        return sub
+
+    def subscribe(self, handler: Callable[[ChangeEvent], Any], tables: Iterable[str] | None = None,
+                  ops: Iterable[str] | None = None, sources: Iterable[str] | None = None) -> Subscription:
+        """
+        Call `handler` synchronously for each matching event.
+        """
+        return self._add(Subscription(self, handler, tables, ops, sources))
+
+    def subscribe_background(self, handler: Callable[[ChangeEvent], Any], tables: Iterable[str] | None = None,
+                             ops: Iterable[str] | None = None, sources: Iterable[str] | None = None,
+                             max_queue: int = DEFAULT_QUEUE_SIZE, block: bool = False) -> BackgroundSubscription:
+        """
+        Call `handler` on a background thread for each matching event (bounded queue).
+        """
+        return self._add(BackgroundSubscription(self, handler, tables, ops, sources, max_queue, block))
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._update([s for s in self._subs if s is not sub])
+
+    def wants(self, table: str) -> bool:
+        return self._all or table in self._tables
+
+    def publish(self, event: ChangeEvent) -> None:
+        for sub in self._subs:
+            if sub.matches(event):
+                sub.deliver(event)
+
+    def publish_many(self, events: Iterable[ChangeEvent]) -> None:
+        for event in events:
+            self.publish(event)
+
+    def publish_rows(self, table: str, pk: str, op: str, rows: Iterable[Dict] | None,
+                     old: Callable[[Dict], Optional[Dict]] | None = None) -> None:
+        """
+        Publish one event per row written to `table` (keyed by its `pk` column);
+        `rows` are the deleted rows for a delete, and `old` maps an updated row to
+        its previous state when known. Does nothing if nobody watches the table.
+        """
+        if not rows or not self.wants(table):
+            return
+        for row in rows:
+            if op == "delete":
+                self.publish(ChangeEvent(table, op, row.get(pk), old=row))
+            else:
+                self.publish(ChangeEvent(table, op, row.get(pk), old=old(row) if old else None, new=row))
+
+    def close(self) -> None:
+        for sub in list(self._subs):
+            sub.close()
+
+# Process-wide bus the DAOs publish to
+CHANGE_BUS = ChangeBus()
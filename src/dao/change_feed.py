@@ -0,0 +1,127 @@
+# src/dao/change_feed.py
+import asyncio
+import threading
+from typing import Any, Dict, Iterable, Optional
+from src.config import DB_BACKEND, get_async_supabase
+from src.dao.change_bus import CHANGE_BUS, ChangeBus, ChangeEvent
+
+# Primary key of each table a feed can follow
+TABLE_KEYS = {
+    "customers": "cust_id",
+    "events": "event_id",
+    "bookings": "booking_id",
+    "payments": "payment_id",
+}
+# Seconds RealtimeChangeFeed.start() waits for the subscription to be confirmed
+SUBSCRIBE_TIMEOUT = 10.0
+
+class ChangeFeedError(Exception):
+    pass
+
+class ChangeFeed:
+    """
+    Turns database change notifications (realtime postgres_changes payloads)
+    into ChangeEvents with source "realtime" on a bus. Writes made by this
+    process arrive twice, once from its DAOs and once from the feed;
+    subscribers pick one with `sources=`.
+    """
+    def __init__(self, bus: ChangeBus = None, tables: Iterable[str] | None = None):
+        self.bus = bus or CHANGE_BUS
+        self.tables = tuple(tables) if tables is not None else tuple(TABLE_KEYS)
+        unknown = [t for t in self.tables if t not in TABLE_KEYS]
+        if unknown:
+            raise ChangeFeedError(f"No change feed for table(s): {', '.join(unknown)}")
+        self.received = 0
+
+    def _handle(self, payload: Dict) -> None:
+        data = payload.get("data", payload)
+        table = data.get("table")
+        if table not in self.tables:
+            return
+        op = str(getattr(data.get("type"), "value", data.get("type"))).lower()
+        # Without REPLICA IDENTITY FULL old_record only holds the primary key
+        new = data.get("record") or None
+        old = data.get("old_record") or None
+        if op == "delete":
+            new = None
+        elif op == "insert":
+            old = None
+        key = (new or old or {}).get(TABLE_KEYS[table])
+        self.received += 1
+        self.bus.publish(ChangeEvent(table, op, key, old=old, new=new, source="realtime"))
+
+class RealtimeChangeFeed(ChangeFeed):
+    """
+    Follows the tables through Supabase Realtime on a background thread with its
+    own event loop. The tables must be in the supabase_realtime publication, and
+    need REPLICA IDENTITY FULL for full old rows (sql/realtime.sql).
+    """
+    def __init__(self, bus: ChangeBus = None, tables: Iterable[str] | None = None,
+                 channel_name: str = "db-changes"):
+        super().__init__(bus, tables)
+        self.channel_name = channel_name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Any = None
+        self._channel: Any = None
+
+    async def _subscribe(self) -> None:
+        self._client = await get_async_supabase()
+        channel = self._client.channel(self.channel_name)
+        for table in self.tables:
+            channel.on_postgres_changes("*", schema="public", table=table, callback=self._handle)
+        self._channel = await channel.subscribe()
+
+    def start(self, timeout: float = SUBSCRIBE_TIMEOUT) -> "RealtimeChangeFeed":
+        if self._thread is not None:
+            return self
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="change-feed", daemon=True)
+        self._thread.start()
+        try:
+            asyncio.run_coroutine_threadsafe(self._subscribe(), self._loop).result(timeout)
+        except Exception as e:
+            self.stop()
+            raise ChangeFeedError(f"Could not subscribe to database changes: {e}")
+        return self
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        if self._channel is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self._client.remove_channel(self._channel), self._loop).result(5)
+            except Exception as e:
+                print("Change feed warning:", e)
+            self._channel = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._thread = self._loop = None
+
+class LocalChangeFeed(ChangeFeed):
+    """
+    Stand-in for RealtimeChangeFeed in tests and on the sqlite/memory backends:
+    payloads handed to emit() go through the same conversion as realtime ones.
+    """
+    def start(self) -> "LocalChangeFeed":
+        return self
+
+    def stop(self) -> None:
+        pass
+
+    def emit(self, payload: Dict) -> None:
+        self._handle(payload)
+
+    def emit_row(self, table: str, op: str, record: Optional[Dict] = None,
+                 old_record: Optional[Dict] = None) -> None:
+        self._handle({"data": {"schema": "public", "table": table, "type": op.upper(),
+                               "record": record or {}, "old_record": old_record or {}}})
+
+def change_feed(bus: ChangeBus = None, tables: Iterable[str] | None = None) -> ChangeFeed:
+    """
+    The feed for the configured backend: Realtime on supabase, LocalChangeFeed otherwise.
+    """
+    if DB_BACKEND == "supabase":
+        return RealtimeChangeFeed(bus, tables)
+    return LocalChangeFeed(bus, tables)
@@ -1,63 +1,83 @@
 # src/dao/customer_dao.py
-from typing import Optional, List, Dict
-from src.config import get_supabase
+from typing import Optional, List, Dict, Iterable, Iterator, Sequence
+from postgrest.exceptions import APIError
+from src.dao.base_dao import BaseDAO, SCAN_PAGE_SIZE, DuplicateKeyError, UNIQUE_VIOLATION
 
-class CustomerDAO:
-    def __init__(self):
-        self._sb = get_supabase()  # instance variable for Supabase client
+class CustomerDAO(BaseDAO):
+    table = "customers"
+    pk = "cust_id"
 
     def create_customer(self, name: str, email: str, phone: str, city: str | None = None) -> Optional[Dict]:
         payload = {"name": name, "email": email, "phone": phone}
         if city:
             payload["city"] = city
-        self._sb.table("customers").insert(payload).execute()
-        resp = self._sb.table("customers").select("*").eq("email", email).limit(1).execute()
+        return self._first(self._execute_unique(self._sb.table("customers").insert(payload), "insert"))
+
+    def create_customers(self, rows: List[Dict]) -> List[Dict]:
+        """
+        Insert many customers with one multi-row insert; returns the created rows.
+        The whole batch is rejected (DuplicateKeyError) if any email already exists.
+        """
+        if not rows:
+            return []
+        return self._execute_unique(self._sb.table("customers").insert(rows), "insert").data or []
+
+    def _execute_unique(self, query, op: str, old: Optional[Dict] = None):
+        """
+        Run an `op` write, reporting a unique-email violation as DuplicateKeyError.
+        """
+        try:
+            resp = query.execute()
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise DuplicateKeyError(e.message)
+            raise
+        self._changed(op, resp.data, lambda row: old)
+        return resp
+
+    def get_customer_by_id(self, cust_id: int, columns: Sequence[str] | None = None) -> Optional[Dict]:
+        return self._cached(cust_id, lambda: self._fetch_customer(cust_id, columns), columns)
+
+    def _fetch_customer(self, cust_id: int, columns: Sequence[str] | None = None) -> Optional[Dict]:
+        resp = self._sb.table("customers").select(self._select(columns)).eq("cust_id", cust_id).limit(1).execute()
         return resp.data[0] if resp.data else None
 
-    def get_customer_by_id(self, cust_id: int) -> Optional[Dict]:
-        resp = self._sb.table("customers").select("*").eq("cust_id", cust_id).limit(1).execute()
+    def get_customer_by_email(self, email: str, columns: Sequence[str] | None = None) -> Optional[Dict]:
+        resp = self._sb.table("customers").select(self._select(columns)).eq("email", email).limit(1).execute()
         return resp.data[0] if resp.data else None
 
-    def list_customers(self, limit: int = 100) -> List[Dict]:
-        resp = self._sb.table("customers").select("*").order("cust_id").limit(limit).execute()
+    def search_customers(self, email: str | None = None, city: str | None = None, limit: int = 100,
+                         columns: Sequence[str] | None = None) -> List[Dict]:
+        """
+        Customers whose email starts with `email` and/or whose city is `city`
+        (both case-insensitive), filtered in the database (see sql/search.sql).
+        """
+        query = self._sb.table("customers").select(self._select(columns))
+        if email:
+            query = query.ilike("email", self._like(email))
+        if city:
+            query = query.ilike("city", self._like(city, "exact"))
+        resp = query.order("cust_id").limit(limit).execute()
         return resp.data or []
 
-    def update_customer(self, cust_id: int, fields: Dict) -> Optional[Dict]:
-        self._sb.table("customers").update(fields).eq("cust_id", cust_id).execute()
-        resp = self._sb.table("customers").select("*").eq("cust_id", cust_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
-
-    def delete_customer(self, cust_id: int) -> Optional[Dict]:
-        resp_before = self._sb.table("customers").select("*").eq("cust_id", cust_id).limit(1).execute()
-        row = resp_before.data[0] if resp_before.data else None
-        self._sb.table("customers").delete().eq("cust_id", cust_id).execute()
-        return row
-        
-
-
-        
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+    def get_customers_by_ids(self, cust_ids: Iterable[int], columns: Sequence[str] | None = None) -> Dict[int, Dict]:
+        return self._get_by_ids("cust_id", cust_ids, columns)
 
+    def list_customers(self, limit: int = 100, columns: Sequence[str] | None = None) -> List[Dict]:
+        resp = self._sb.table("customers").select(self._select(columns)).order("cust_id").limit(limit).execute()
+        return resp.data or []
 
+    def iter_customers(self, page_size: int = SCAN_PAGE_SIZE, columns: Sequence[str] | None = None,
+                       prefetch: bool = True, since: str | None = None) -> Iterator[Dict]:
+        return self._iter_rows(page_size, columns, since, prefetch)
 
+    def update_customer(self, cust_id: int, fields: Dict) -> Optional[Dict]:
+        old = self._peek(cust_id) if self._watched() else None
+        resp = self._execute_unique(self._sb.table("customers").update(fields).eq("cust_id", cust_id), "update", old)
+        return self._refresh(cust_id, self._first(resp))
 
+    def delete_customer(self, cust_id: int) -> Optional[Dict]:
+        resp = self._sb.table("customers").delete().eq("cust_id", cust_id).execute()
+        self._changed("delete", resp.data)
+        self._invalidate(cust_id)
+        return self._first(resp)
@@ -1,10 +1,10 @@
 # src/dao/event_dao.py
-from typing import Optional, List, Dict
-from src.config import get_supabase
+from typing import Optional, List, Dict, Iterable, Iterator, Sequence
+from src.dao.base_dao import BaseDAO, SCAN_PAGE_SIZE
 
-class EventDAO:
-    def __init__(self):
-        self._sb = get_supabase()
+class EventDAO(BaseDAO):
+    table = "events"
+    pk = "event_id"
 
     def create_event(self, title: str, date: str, location: str, capacity: int, price: float) -> Optional[Dict]:
         payload = {
@@ -14,26 +14,79 @@ class EventDAO:
             "capacity": capacity,
             "price": price
         }
-        self._sb.table("events").insert(payload).execute()
-        resp = self._sb.table("events").select("*").eq("title", title).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        resp = self._sb.table("events").insert(payload).execute()
+        self._changed("insert", resp.data)
+        return self._first(resp)
+
+    def create_events(self, rows: List[Dict]) -> List[Dict]:
+        """
+        Insert many events with one multi-row insert; returns the created rows.
+        """
+        if not rows:
+            return []
+        resp = self._sb.table("events").insert(rows).execute()
+        self._changed("insert", resp.data)
+        return resp.data or []
 
-    def get_event_by_id(self, event_id: int) -> Optional[Dict]:
-        resp = self._sb.table("events").select("*").eq("event_id", event_id).limit(1).execute()
+    def get_event_by_id(self, event_id: int, columns: Sequence[str] | None = None) -> Optional[Dict]:
+        return self._cached(event_id, lambda: self._fetch_event(event_id, columns), columns)
+
+    def _fetch_event(self, event_id: int, columns: Sequence[str] | None = None) -> Optional[Dict]:
+        resp = self._sb.table("events").select(self._select(columns)).eq("event_id", event_id).limit(1).execute()
         return resp.data[0] if resp.data else None
 
-    def list_events(self, limit: int = 100) -> List[Dict]:
-        resp = self._sb.table("events").select("*").order("event_id").limit(limit).execute()
+    def get_events_by_ids(self, event_ids: Iterable[int], columns: Sequence[str] | None = None) -> Dict[int, Dict]:
+        return self._get_by_ids("event_id", event_ids, columns)
+
+    def search_events(self, title: str | None = None, date: str | None = None, location: str | None = None,
+                      date_from: str | None = None, date_to: str | None = None, limit: int = 100,
+                      columns: Sequence[str] | None = None) -> List[Dict]:
+        """
+        Events whose title/location contain the given text (case-insensitive), on
+        `date` or within [date_from, date_to], filtered in the database (see sql/search.sql).
+        """
+        query = self._sb.table("events").select(self._select(columns))
+        if title:
+            query = query.ilike("title", self._like(title, "contains"))
+        if location:
+            query = query.ilike("location", self._like(location, "contains"))
+        if date:
+            query = query.eq("date", date)
+        if date_from:
+            query = query.gte("date", date_from)
+        if date_to:
+            query = query.lte("date", date_to)
+        resp = query.order("date").order("event_id").limit(limit).execute()
         return resp.data or []
 
+    def list_events(self, limit: int = 100, columns: Sequence[str] | None = None) -> List[Dict]:
+        resp = self._sb.table("events").select(self._select(columns)).order("event_id").limit(limit).execute()
+        return resp.data or []
+
+    def iter_events(self, page_size: int = SCAN_PAGE_SIZE, columns: Sequence[str] | None = None,
+                    prefetch: bool = True, since: str | None = None) -> Iterator[Dict]:
+        return self._iter_rows(page_size, columns, since, prefetch)
+
     def update_event(self, event_id: int, fields: Dict) -> Optional[Dict]:
-        self._sb.table("events").update(fields).eq("event_id", event_id).execute()
-        resp = self._sb.table("events").select("*").eq("event_id", event_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        old = self._peek(event_id) if self._watched() else None
+        resp = self._sb.table("events").update(fields).eq("event_id", event_id).execute()
+        self._changed("update", resp.data, lambda row: old)
+        return self._refresh(event_id, self._first(resp))
 
-    def delete_event(self, event_id: int) -> Optional[Dict]:
-        resp_before = self._sb.table("events").select("*").eq("event_id", event_id).limit(1).execute()
-        row = resp_before.data[0] if resp_before.data else None
-        self._sb.table("events").delete().eq("event_id", event_id).execute()
-        return row
+    def compare_and_set_capacity(self, event_id: int, expected: int, new_capacity: int) -> Optional[Dict]:
+        """
+        Set capacity only if it still equals `expected` (optimistic concurrency).
+        Returns the updated event, or None if another writer changed it first.
+        """
+        resp = self._sb.table("events").update({"capacity": new_capacity})\
+                   .eq("event_id", event_id).eq("capacity", expected).execute()
+        if resp.data:
+            self._changed("update", resp.data, lambda row: {**row, "capacity": expected})
+        # On a lost race the cached capacity is what went stale, so it is dropped
+        return self._refresh(event_id, self._first(resp))
 
+    def delete_event(self, event_id: int) -> Optional[Dict]:
+        resp = self._sb.table("events").delete().eq("event_id", event_id).execute()
+        self._changed("delete", resp.data)
+        self._invalidate(event_id)
+        return self._first(resp)
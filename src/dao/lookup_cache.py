@@ -0,0 +1,82 @@
+# src/dao/lookup_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Seconds a cached row is served before it is re-read, per table
+DEFAULT_TTLS = {
+    "customers": 300.0,
+    "events": 10.0,
+    "bookings": 30.0,
+    "payments": 10.0,
+}
+DEFAULT_MAX_SIZE = 10_000
+
+class LookupCache:
+    """
+    Bounded LRU cache with per-table TTLs for DAO point lookups.
+    Keys are (table, key). Misses (None rows) are never cached, so a freshly
+    created row is always visible. DAOs replace entries with the row returned by
+    their own updates and drop them on deletes.
+    """
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, ttls: Dict[str, float] | None = None,
+                 default_ttl: float = 30.0):
+        self.max_size = max_size
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self._rows: "OrderedDict[Tuple[str, Hashable], Tuple[Dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, table: str, key: Hashable) -> Optional[Dict]:
+        with self._lock:
+            entry = self._rows.get((table, key))
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._rows[(table, key)]
+                self.misses += 1
+                return None
+            self._rows.move_to_end((table, key))
+            self.hits += 1
+            return dict(entry[0])
+
+    def peek(self, table: str, key: Hashable) -> Optional[Dict]:
+        """
+        Like get(), but leaves the LRU order and the hit/miss counters alone.
+        """
+        with self._lock:
+            entry = self._rows.get((table, key))
+            if entry is None or entry[1] < time.monotonic():
+                return None
+            return dict(entry[0])
+
+    def put(self, table: str, key: Hashable, row: Dict) -> None:
+        expires = time.monotonic() + self.ttls.get(table, self.default_ttl)
+        with self._lock:
+            self._rows[(table, key)] = (dict(row), expires)
+            self._rows.move_to_end((table, key))
+            while len(self._rows) > self.max_size:
+                self._rows.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, table: str, key: Hashable) -> None:
+        with self._lock:
+            self._rows.pop((table, key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rows.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._rows),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -1,9 +1,9 @@
-from typing import Optional, Dict, List
-from src.config import get_supabase
+from typing import Optional, Dict, List, Iterable, Iterator, Sequence
+from src.dao.base_dao import BaseDAO, SCAN_PAGE_SIZE
 
-class PaymentDAO:
-    def __init__(self):
-        self._sb = get_supabase()
+class PaymentDAO(BaseDAO):
+    table = "payments"
+    pk = "payment_id"
 
     def create_payment(self, booking_id: int, amount: float, method: str | None = None) -> Optional[Dict]:
         payload = {
@@ -12,20 +12,100 @@ class PaymentDAO:
             "method": method,
             "status": "PENDING"
         }
-        self._sb.table("payments").insert(payload).execute()
-        resp = self._sb.table("payments").select("*").eq("booking_id", booking_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+        resp = self._sb.table("payments").insert(payload).execute()
+        self._changed("insert", resp.data)
+        return self._refresh(("booking", booking_id), self._first(resp))
 
-    def mark_paid(self, booking_id: int, method: str) -> Optional[Dict]:
-        self._sb.table("payments").update({"status": "PAID", "method": method}).eq("booking_id", booking_id).execute()
-        resp = self._sb.table("payments").select("*").eq("booking_id", booking_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+    def create_payments(self, rows: List[Dict]) -> List[Dict]:
+        """
+        Insert many PENDING payments ({"booking_id", "amount"}) with one multi-row insert.
+        """
+        if not rows:
+            return []
+        payload = [{"method": None, "status": "PENDING", **row} for row in rows]
+        resp = self._sb.table("payments").insert(payload).execute()
+        self._changed("insert", resp.data)
+        return [self._refresh(("booking", row["booking_id"]), row) for row in resp.data or []]
 
-    def refund_payment(self, booking_id: int) -> Optional[Dict]:
-        self._sb.table("payments").update({"status": "REFUNDED"}).eq("booking_id", booking_id).execute()
-        resp = self._sb.table("payments").select("*").eq("booking_id", booking_id).limit(1).execute()
-        return resp.data[0] if resp.data else None
+    def mark_paid(self, booking_id: int, method: str, status: str | None = None) -> Optional[Dict]:
+        """
+        Mark a booking's payment as PAID; with `status`, only if it is currently in that
+        status (None, and the cached row dropped, when it is not).
+        """
+        old = self._peek(("booking", booking_id)) if self._watched() else None
+        query = self._sb.table("payments").update({"status": "PAID", "method": method}).eq("booking_id", booking_id)
+        resp = (query.eq("status", status) if status else query).execute()
+        self._changed("update", resp.data, lambda row: old)
+        return self._refresh(("booking", booking_id), self._first(resp))
+
+    def mark_paid_many(self, booking_ids: Iterable[int], method: str, status: str | None = None) -> List[Dict]:
+        """
+        Mark the payments of many bookings as PAID by `method`, one update per chunk of ids.
+        `status` limits it to payments currently in that status (otherwise any not PAID).
+        Returns only the payments this call marked paid.
+        """
+        paid: List[Dict] = []
+        for chunk in self._chunks(booking_ids):
+            query = self._sb.table("payments").update({"status": "PAID", "method": method}).in_("booking_id", chunk)
+            query = query.eq("status", status) if status else query.neq("status", "PAID")
+            resp = query.execute()
+            for row in resp.data or []:
+                paid.append(self._refresh(("booking", row["booking_id"]), row))
+        self._changed("update", paid, (lambda row: {**row, "status": status}) if status else None)
+        return paid
+
+    def refund_payment(self, booking_id: int, status: str | None = None) -> Optional[Dict]:
+        """
+        Mark a booking's payment as REFUNDED; with `status`, only if it is currently in
+        that status (None, and the cached row dropped, when it is not).
+        """
+        old = self._peek(("booking", booking_id)) if self._watched() else None
+        query = self._sb.table("payments").update({"status": "REFUNDED"}).eq("booking_id", booking_id)
+        resp = (query.eq("status", status) if status else query).execute()
+        self._changed("update", resp.data, lambda row: old)
+        return self._refresh(("booking", booking_id), self._first(resp))
+
+    def refund_payments_for_bookings(self, booking_ids: Iterable[int], status: str | None = None) -> List[Dict]:
+        """
+        Mark the payments of many bookings as REFUNDED, one update per chunk of ids.
+        `status` limits the refund to payments currently in that status.
+        Returns only the payments this call refunded.
+        """
+        refunded: List[Dict] = []
+        for chunk in self._chunks(booking_ids):
+            query = self._sb.table("payments").update({"status": "REFUNDED"}).in_("booking_id", chunk)
+            query = query.eq("status", status) if status else query.neq("status", "REFUNDED")
+            resp = query.execute()
+            for row in resp.data or []:
+                refunded.append(self._refresh(("booking", row["booking_id"]), row))
+        self._changed("update", refunded, (lambda row: {**row, "status": status}) if status else None)
+        return refunded
+
+    def delete_payments_for_bookings(self, booking_ids: Iterable[int]) -> List[Dict]:
+        deleted: List[Dict] = []
+        for chunk in self._chunks(booking_ids):
+            resp = self._sb.table("payments").delete().in_("booking_id", chunk).execute()
+            for row in resp.data or []:
+                self._invalidate(("booking", row["booking_id"]))
+                deleted.append(row)
+        self._changed("delete", deleted)
+        return deleted
+
+    def iter_payments(self, page_size: int = SCAN_PAGE_SIZE, since: str | None = None,
+                      columns: Sequence[str] | None = None, prefetch: bool = True) -> Iterator[Dict]:
+        return self._iter_rows(page_size, columns, since, prefetch)
+
+    def get_payments_by_bookings(self, booking_ids: Iterable[int],
+                                 columns: Sequence[str] | None = None) -> Dict[int, Dict]:
+        """
+        {booking_id: payment} for many bookings, one `in` query per chunk of ids.
+        """
+        return self._get_by_ids("booking_id", booking_ids, columns)
+
+    def get_payment_by_booking(self, booking_id: int, columns: Sequence[str] | None = None) -> Optional[Dict]:
+        return self._cached(("booking", booking_id),
+                            lambda: self._fetch_payment_by_booking(booking_id, columns), columns)
 
-    def get_payment_by_booking(self, booking_id: int) -> Optional[Dict]:
-        resp = self._sb.table("payments").select("*").eq("booking_id", booking_id).limit(1).execute()
+    def _fetch_payment_by_booking(self, booking_id: int, columns: Sequence[str] | None = None) -> Optional[Dict]:
+        resp = self._sb.table("payments").select(self._select(columns)).eq("booking_id", booking_id).limit(1).execute()
         return resp.data[0] if resp.data else None
@@ -0,0 +1,74 @@
+# src/dao/report_dao.py
+from typing import List, Dict
+from datetime import date, datetime
+from src.dao.base_dao import BaseDAO
+from src.dao.event_dao import EventDAO
+from src.dao.customer_dao import CustomerDAO
+from src.dao.payment_dao import PaymentDAO
+
+class ReportDAO(BaseDAO):
+    """
+    Aggregations over the bookings table.
+    Uses the SQL functions in sql/reporting.sql when they are deployed, so the
+    database does the group-by/sum and only result rows cross the wire.
+    Backends without those functions fall back to a paged scan aggregated in Python.
+    """
+    table = "bookings"
+    pk = "booking_id"
+
+    def _sum_by(self, key: str, value: str | None = None, since: str | None = None) -> Dict[int, int]:
+        """
+        Python fallback: sum `value` (or count rows) per `key` over all bookings.
+        """
+        columns = [key, value] if value else [key]
+        totals: Dict[int, int] = {}
+        for b in self._iter_rows(columns=columns, since=since):
+            totals[b[key]] = totals.get(b[key], 0) + (b[value] if value else 1)
+        return totals
+
+    def event_seats(self, limit: int = 5) -> List[Dict]:
+        """
+        [{"event_id", "title", "seats_sold"}] for the best-selling events.
+        """
+        rows = self._rpc("report_event_seats", {"p_limit": limit})
+        if rows is not None:
+            return rows
+        seats = self._sum_by("event_id", "seats")
+        top_eids = sorted(seats, key=seats.get, reverse=True)[:limit]
+        events = EventDAO(self._sb).get_events_by_ids(top_eids, ["title"])
+        return [{"event_id": eid, "title": events[eid]["title"], "seats_sold": seats[eid]}
+                for eid in top_eids if eid in events]
+
+    def revenue_since(self, since: datetime) -> float:
+        """
+        Sum of seats * event price for bookings created on/after `since`.
+        """
+        total = self._rpc("report_revenue_since", {"p_since": since.isoformat()})
+        if total is not None:
+            return float(total)
+        seats = self._sum_by("event_id", "seats", since=since.date().isoformat())
+        events = EventDAO(self._sb).get_events_by_ids(seats, ["price"])
+        return float(sum(n * events[eid]["price"] for eid, n in seats.items() if eid in events))
+
+    def paid_revenue_since(self, since: date) -> float:
+        """
+        Sum of PAID payment amounts for bookings made on/after day `since`.
+        """
+        total = self._rpc("report_paid_revenue_since", {"p_since": since.isoformat()})
+        if total is not None:
+            return float(total)
+        booking_ids = [b["booking_id"] for b in self._iter_rows(columns=["booking_id"], since=since.isoformat())]
+        payments = PaymentDAO(self._sb).get_payments_by_bookings(booking_ids, ["amount", "status"])
+        return float(sum(p["amount"] for p in payments.values() if p["status"] == "PAID"))
+
+    def customer_bookings(self, min_bookings: int = 0) -> List[Dict]:
+        """
+        [{"cust_id", "name", "bookings"}] for customers with more than `min_bookings` bookings.
+        """
+        rows = self._rpc("report_customer_bookings", {"p_min_bookings": min_bookings})
+        if rows is not None:
+            return rows
+        counts = {cid: n for cid, n in self._sum_by("cust_id").items() if n > min_bookings}
+        customers = CustomerDAO(self._sb).get_customers_by_ids(counts, ["name"])
+        return [{"cust_id": cid, "name": customers[cid]["name"], "bookings": counts[cid]}
+                for cid in sorted(counts) if cid in customers]
@@ -0,0 +1,170 @@
+# src/dao/rollup_dao.py
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+from postgrest.exceptions import APIError
+from src.dao.base_dao import BaseDAO, DAOError, SCAN_PAGE_SIZE, UNIQUE_VIOLATION
+from src.dao.booking_dao import BookingDAO
+from src.dao.payment_dao import PaymentDAO
+
+# Counters kept per (day, event) bucket
+MEASURES = ("bookings", "seats_booked", "cancellations", "seats_cancelled", "revenue")
+# PostgREST / Postgres codes for "relation does not exist": sql/rollups.sql not applied yet
+TABLE_NOT_FOUND = ("PGRST205", "42P01")
+# Compare-and-set attempts per bucket in the Python fallback
+MAX_BUMP_RETRIES = 10
+
+def booking_delta(booking: Dict, **measures: float) -> Dict:
+    """
+    A delta for the bucket of `booking` (needs event_id and created_at): the day
+    the booking was made, whichever day the change to it happens.
+    """
+    return {"day": str(booking["created_at"])[:10], "event_id": booking["event_id"], **measures}
+
+class RollupDAO(BaseDAO):
+    """
+    Daily per-event sales buckets (sql/rollups.sql): bookings and seats sold,
+    cancellations and net paid revenue, keyed by the day the booking was made.
+    The services add deltas as they book, cancel, pay and refund, so date-range
+    reports sum a few buckets instead of scanning bookings; rebuild() recomputes
+    everything from bookings and payments.
+    """
+    table = "event_daily_stats"
+    pk = "id"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.available = True  # False once the table turns out not to be deployed
+
+    def _check_table(self, e: APIError) -> None:
+        if e.code in TABLE_NOT_FOUND:
+            self.available = False
+        else:
+            raise e
+
+    @staticmethod
+    def _merge(deltas: Iterable[Dict]) -> List[Dict]:
+        """
+        Sum deltas per (day, event_id), dropping empty ones.
+        """
+        buckets: Dict[tuple, Dict] = {}
+        for d in deltas:
+            bucket = buckets.setdefault((d["day"], d["event_id"]), {"day": d["day"], "event_id": d["event_id"]})
+            for m in MEASURES:
+                if d.get(m):
+                    bucket[m] = bucket.get(m, 0) + d[m]
+        return [b for b in buckets.values() if any(b.get(m) for m in MEASURES)]
+
+    def record(self, deltas: Iterable[Dict]) -> None:
+        """
+        Add deltas ({"day", "event_id", <measure>: amount, ...}) to their buckets.
+        Best effort: the bookings and payments stay the source of truth, so a
+        failure here is reported and left for rebuild() rather than failing the caller.
+        """
+        if not self.available:
+            return
+        merged = self._merge(deltas)
+        if not merged:
+            return
+        try:
+            # The function returns its bucket count; None only when it is not deployed
+            if self._rpc("bump_event_daily_stats", {"p_deltas": merged}) is None:
+                for delta in merged:
+                    self._bump(delta)
+            self._written()
+        except APIError as e:
+            if e.code in TABLE_NOT_FOUND:
+                self.available = False
+            else:
+                print("Rollup update warning:", e)
+        except Exception as e:
+            print("Rollup update warning:", e)
+
+    def _bump(self, delta: Dict) -> None:
+        """
+        Python fallback: insert the bucket, or compare-and-set its counters.
+        """
+        changes = {m: delta[m] for m in MEASURES if delta.get(m)}
+        for _ in range(MAX_BUMP_RETRIES):
+            resp = self._sb.table(self.table).select("*")\
+                       .eq("day", delta["day"]).eq("event_id", delta["event_id"]).limit(1).execute()
+            row = self._first(resp)
+            if row is None:
+                try:
+                    self._sb.table(self.table).insert({"day": delta["day"], "event_id": delta["event_id"],
+                                                       **changes}).execute()
+                    return
+                except APIError as e:
+                    if e.code != UNIQUE_VIOLATION:
+                        raise
+                    continue  # created concurrently: bump it instead
+            query = self._sb.table(self.table).update({m: row[m] + v for m, v in changes.items()}).eq("id", row["id"])
+            for m in changes:
+                query = query.eq(m, row[m])
+            if query.execute().data:
+                return
+        raise DAOError(f"Rollup bucket {delta['day']}/{delta['event_id']} is busy")
+
+    def revenue_between(self, start: date, end: date) -> Optional[float]:
+        """
+        Net paid revenue of bookings made from `start` to `end` (inclusive);
+        None when the rollup table is not deployed.
+        """
+        if not self.available:
+            return None
+        try:
+            total = self._rpc("report_rollup_revenue", {"p_from": start.isoformat(), "p_to": end.isoformat()})
+            if total is not None:
+                return float(total)
+            revenue, after = 0.0, None
+            while True:
+                query = self._sb.table(self.table).select("id,revenue")\
+                            .gte("day", start.isoformat()).lte("day", end.isoformat())
+                if after is not None:
+                    query = query.gt("id", after)
+                page = query.order("id").limit(SCAN_PAGE_SIZE).execute().data or []
+                revenue += sum(r["revenue"] for r in page)
+                if len(page) < SCAN_PAGE_SIZE:
+                    return float(revenue)
+                after = page[-1]["id"]
+        except APIError as e:
+            self._check_table(e)
+            return None
+
+    def delete_for_event(self, event_id: int) -> List[Dict]:
+        if not self.available:
+            return []
+        try:
+            resp = self._sb.table(self.table).delete().eq("event_id", event_id).execute()
+            self._written()
+            return resp.data or []
+        except APIError as e:
+            self._check_table(e)
+            return []
+
+    def rebuild(self) -> int:
+        """
+        Recompute every bucket from bookings and payments; returns the number of buckets.
+        """
+        count = self._rpc("rebuild_event_daily_stats", {})
+        if count is not None:
+            self.available = True
+            self._written()
+            return int(count)
+        # Python fallback: one projected scan of payments and bookings each
+        paid: Dict[int, float] = {}
+        for p in PaymentDAO(self._sb).iter_payments(columns=["booking_id", "amount", "status"]):
+            if p["status"] == "PAID":
+                paid[p["booking_id"]] = paid.get(p["booking_id"], 0) + p["amount"]
+        deltas = []
+        for b in BookingDAO(self._sb).iter_bookings(columns=["event_id", "seats", "status", "created_at"]):
+            cancelled = b["status"] == "CANCELLED"
+            deltas.append(booking_delta(b, bookings=1, seats_booked=b["seats"], cancellations=int(cancelled),
+                                        seats_cancelled=b["seats"] if cancelled else 0,
+                                        revenue=paid.get(b["booking_id"], 0)))
+        buckets = [{m: 0 for m in MEASURES} | b for b in self._merge(deltas)]
+        self._sb.table(self.table).delete().gte("id", 0).execute()
+        for start in range(0, len(buckets), SCAN_PAGE_SIZE):
+            self._sb.table(self.table).insert(buckets[start:start + SCAN_PAGE_SIZE]).execute()
+        self._written()
+        self.available = True
+        return len(buckets)
@@ -0,0 +1,48 @@
+# src/dao/table_versions.py
+import threading
+from typing import Callable, Dict, Iterable, List, Tuple
+
+class TableVersions:
+    """
+    Per-table write counters. DAOs bump a table after every write they make,
+    so anything derived from a set of tables (cached report results, the
+    columnar snapshot) is current exactly while their counters are unchanged.
+    Counters are per process; listeners are called after each bump.
+    """
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._listeners: List[Callable[[Dict[str, int]], None]] = []
+        self._lock = threading.Lock()
+
+    def bump(self, *tables: str) -> None:
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+            current = dict(self._versions)
+        for listener in self._listeners:
+            listener(current)
+
+    def get(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """
+        The current counters of `tables`, in the given order.
+        """
+        with self._lock:
+            return tuple(self._versions.get(t, 0) for t in tables)
+
+    def all(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._versions)
+
+    def restore(self, saved: Dict[str, int]) -> None:
+        """
+        Continue from counters saved by an earlier run; never moves a counter back.
+        """
+        with self._lock:
+            for table, version in saved.items():
+                self._versions[table] = max(self._versions.get(table, 0), int(version))
+
+    def listen(self, listener: Callable[[Dict[str, int]], None]) -> None:
+        self._listeners.append(listener)
+
+# Process-wide counters bumped by every DAO (src/dao/base_dao.py, src/dao/async_dao.py)
+TABLE_VERSIONS = TableVersions()
@@ -0,0 +1,229 @@
+# src/services/analytics.py
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List
+from src.dao.base_dao import SCAN_PAGE_SIZE, pages
+from src.dao.booking_dao import BookingDAO
+from src.dao.event_dao import EventDAO
+from src.dao.customer_dao import CustomerDAO
+from src.dao.payment_dao import PaymentDAO
+from src.services.reporting_service import ReportingError
+
+# Payment status per booking; 0 means the booking has no payment
+PAYMENT_STATUS_CODES = {"PENDING": 1, "PAID": 2, "REFUNDED": 3}
+
+class ColumnarUnavailableError(ReportingError):
+    """Columnar reports need numpy, which is an optional dependency."""
+    pass
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise ColumnarUnavailableError("Columnar reports require numpy (pip install numpy)")
+    return np
+
+class BookingSnapshot:
+    """
+    Columnar copy of bookings, events, customers and payments for analytics.
+    Events and customers are held as arrays sorted by id, and bookings refer to
+    them by position (-1 when the snapshot lacks the row), so joins are array
+    indexing and group-bys are bincounts. Payments are folded into two columns
+    aligned with the bookings. Timestamps are datetime64[s], UTC.
+    """
+    def __init__(self, np: Any, columns: Dict[str, Any], loaded_at: float):
+        self._np = np
+        self.event_ids = columns["event_ids"]          # int64, ascending
+        self.event_titles = columns["event_titles"]    # object
+        self.cust_ids = columns["cust_ids"]            # int64, ascending
+        self.cust_names = columns["cust_names"]        # object
+        self.booking_ids = columns["booking_ids"]      # int64, ascending
+        self.booking_event = columns["booking_event"]  # int32 position in event_ids
+        self.booking_cust = columns["booking_cust"]    # int32 position in cust_ids
+        self.seats = columns["seats"]                  # int32
+        self.cancelled = columns["cancelled"]          # bool
+        self.created_at = columns["created_at"]        # datetime64[s]
+        self.paid_amount = columns["paid_amount"]      # float64, sum of PAID payments
+        self.payment_status = columns["payment_status"]  # int8, see PAYMENT_STATUS_CODES
+        self.loaded_at = loaded_at
+
+    def __len__(self) -> int:
+        return len(self.booking_ids)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by the numeric columns (titles and names are Python strings on top).
+        """
+        return sum(a.nbytes for a in (self.event_ids, self.cust_ids, self.booking_ids, self.booking_event,
+                                      self.booking_cust, self.seats, self.cancelled, self.created_at,
+                                      self.paid_amount, self.payment_status))
+
+    def _top(self, values: Any, candidates: Any, limit: int) -> Any:
+        """
+        Positions of the `limit` largest values among `candidates`, largest first.
+        """
+        np = self._np
+        if limit < len(candidates):
+            candidates = candidates[np.argpartition(-values[candidates], limit - 1)[:limit]]
+        return candidates[np.argsort(-values[candidates], kind="stable")]
+
+    def _per_event(self, weights: Any, mask: Any | None = None):
+        np = self._np
+        keep = self.booking_event >= 0
+        if mask is not None:
+            keep &= mask
+        codes = self.booking_event[keep]
+        n = len(self.event_ids)
+        return (np.bincount(codes, weights=weights[keep], minlength=n),
+                np.flatnonzero(np.bincount(codes, minlength=n)))
+
+    def _day_range(self, start: date, end: date):
+        np = self._np
+        return (self.created_at >= np.datetime64(start, "s")) & \
+               (self.created_at < np.datetime64(end + timedelta(days=1), "s"))
+
+    def event_seats(self, limit: int = 5) -> List[Dict]:
+        """
+        [{"event_id", "title", "seats_sold"}] for the best-selling events (as ReportDAO.event_seats).
+        """
+        seats, booked = self._per_event(self.seats)
+        return [{"event_id": int(self.event_ids[i]), "title": self.event_titles[i], "seats_sold": int(seats[i])}
+                for i in self._top(seats, booked, limit)]
+
+    def customer_bookings(self, min_bookings: int = 0) -> List[Dict]:
+        """
+        [{"cust_id", "name", "bookings"}] for customers with more than `min_bookings` bookings.
+        """
+        np = self._np
+        codes = self.booking_cust[self.booking_cust >= 0]
+        counts = np.bincount(codes, minlength=len(self.cust_ids))
+        return [{"cust_id": int(self.cust_ids[i]), "name": self.cust_names[i], "bookings": int(counts[i])}
+                for i in np.flatnonzero(counts > min_bookings)]
+
+    def revenue_between(self, start: date, end: date) -> float:
+        """
+        Paid revenue (net of refunds) of bookings made from `start` to `end`, inclusive.
+        """
+        return float(self.paid_amount[self._day_range(start, end)].sum())
+
+    def revenue_by_event(self, limit: int = 10) -> List[Dict]:
+        """
+        [{"event_id", "title", "revenue", "seats_sold", "cancellations"}], highest paid revenue first.
+        """
+        np = self._np
+        revenue, booked = self._per_event(self.paid_amount)
+        seats, _ = self._per_event(self.seats)
+        cancelled, _ = self._per_event(self.cancelled.astype(np.int32))
+        return [{"event_id": int(self.event_ids[i]), "title": self.event_titles[i], "revenue": float(revenue[i]),
+                 "seats_sold": int(seats[i]), "cancellations": int(cancelled[i])}
+                for i in self._top(revenue, booked, limit)]
+
+    def daily_sales(self, start: date, end: date) -> List[Dict]:
+        """
+        [{"day", "bookings", "seats", "cancellations", "revenue"}] for every day from `start` to `end`.
+        """
+        np = self._np
+        mask = self._day_range(start, end)
+        offsets = (self.created_at[mask].astype("datetime64[D]") - np.datetime64(start, "D")).astype(np.int64)
+        days = (end - start).days + 1
+        bookings = np.bincount(offsets, minlength=days)
+        seats = np.bincount(offsets, weights=self.seats[mask], minlength=days)
+        cancelled = np.bincount(offsets, weights=self.cancelled[mask], minlength=days)
+        revenue = np.bincount(offsets, weights=self.paid_amount[mask], minlength=days)
+        return [{"day": (start + timedelta(days=d)).isoformat(), "bookings": int(bookings[d]), "seats": int(seats[d]),
+                 "cancellations": int(cancelled[d]), "revenue": float(revenue[d])} for d in range(days)]
+
+class SnapshotLoader:
+    """
+    Pages the tables (projected keyset scans, pk order) into a BookingSnapshot.
+    Each page becomes small arrays that are concatenated once, so peak memory
+    is about twice the snapshot's column bytes.
+    """
+    def __init__(self, booking_dao: BookingDAO = None, event_dao: EventDAO = None,
+                 customer_dao: CustomerDAO = None, payment_dao: PaymentDAO = None,
+                 page_size: int = SCAN_PAGE_SIZE):
+        self.booking_dao = booking_dao or BookingDAO()
+        self.event_dao = event_dao or EventDAO(self.booking_dao.client)
+        self.customer_dao = customer_dao or CustomerDAO(self.booking_dao.client)
+        self.payment_dao = payment_dao or PaymentDAO(self.booking_dao.client)
+        self.page_size = page_size
+
+    def _columns(self, np: Any, rows: Iterable[Dict], spec: Dict[str, Callable[[List[Dict]], Any]]) -> Dict[str, Any]:
+        """
+        Build one array per `spec` entry ({name: page -> array}) from the rows, page by page.
+        """
+        chunks: Dict[str, List[Any]] = {name: [] for name in spec}
+        for page in pages(rows, self.page_size):
+            for name, build in spec.items():
+                chunks[name].append(build(page))
+        return {name: np.concatenate(parts) if parts else build([])
+                for (name, build), parts in zip(spec.items(), chunks.values())}
+
+    @staticmethod
+    def _code(np: Any, ids: Any, values: Any) -> Any:
+        """
+        Position of each value in the ascending `ids`, or -1 when absent.
+        """
+        if not len(ids):
+            return np.full(len(values), -1, dtype=np.int32)
+        pos = np.minimum(np.searchsorted(ids, values), len(ids) - 1)
+        return np.where(ids[pos] == values, pos, -1).astype(np.int32)
+
+    def load(self) -> BookingSnapshot:
+        np = _numpy()
+
+        def ints(column: str, dtype: Any = np.int64):
+            return lambda page: np.fromiter((r[column] for r in page), dtype=dtype, count=len(page))
+
+        def objects(column: str):
+            return lambda page: np.array([r[column] for r in page], dtype=object)
+
+        def timestamps(page: List[Dict]) -> Any:
+            # "YYYY-MM-DDTHH:MM:SS" prefix: drops fractions and the UTC offset
+            return np.array([str(r["created_at"]) for r in page], dtype="U19").astype("datetime64[s]")
+
+        # Events and customers first: bookings made later simply fall outside the joins
+        events = self._columns(np, self.event_dao.iter_events(self.page_size, columns=["event_id", "title"]),
+                               {"event_ids": ints("event_id"), "event_titles": objects("title")})
+        customers = self._columns(np, self.customer_dao.iter_customers(self.page_size, columns=["cust_id", "name"]),
+                                  {"cust_ids": ints("cust_id"), "cust_names": objects("name")})
+        bookings = self._columns(np, self.booking_dao.iter_bookings(
+                                     self.page_size, columns=["event_id", "cust_id", "seats", "status", "created_at"]), {
+            "booking_ids": ints("booking_id"),
+            "event_id": ints("event_id"),
+            "cust_id": ints("cust_id"),
+            "seats": ints("seats", np.int32),
+            "cancelled": lambda page: np.fromiter((r["status"] == "CANCELLED" for r in page), dtype=bool, count=len(page)),
+            "created_at": timestamps,
+        })
+        payments = self._columns(np, self.payment_dao.iter_payments(
+                                     self.page_size, columns=["booking_id", "amount", "status"]), {
+            "booking_id": ints("booking_id"),
+            "amount": lambda page: np.fromiter((r["amount"] or 0 for r in page), dtype=np.float64, count=len(page)),
+            "status": lambda page: np.fromiter((PAYMENT_STATUS_CODES.get(r["status"], 0) for r in page),
+                                               dtype=np.int8, count=len(page)),
+        })
+
+        # Fold payments onto their bookings
+        booking_ids = bookings["booking_ids"]
+        pay_code = self._code(np, booking_ids, payments["booking_id"])
+        found = pay_code >= 0
+        paid = found & (payments["status"] == PAYMENT_STATUS_CODES["PAID"])
+        paid_amount = np.zeros(len(booking_ids), dtype=np.float64)
+        np.add.at(paid_amount, pay_code[paid], payments["amount"][paid])
+        payment_status = np.zeros(len(booking_ids), dtype=np.int8)
+        payment_status[pay_code[found]] = payments["status"][found]
+
+        return BookingSnapshot(np, {
+            **events,
+            **customers,
+            "booking_ids": booking_ids,
+            "booking_event": self._code(np, events["event_ids"], bookings["event_id"]),
+            "booking_cust": self._code(np, customers["cust_ids"], bookings["cust_id"]),
+            "seats": bookings["seats"],
+            "cancelled": bookings["cancelled"],
+            "created_at": bookings["created_at"],
+            "paid_amount": paid_amount,
+            "payment_status": payment_status,
+        }, time.time())
@@ -0,0 +1,257 @@
+# src/services/async_services.py
+import asyncio
+import random
+from typing import Dict, Iterable, List
+from datetime import date, datetime, timedelta
+from src.dao.base_dao import DAOError, ConflictError
+from src.dao.async_dao import AsyncBookingDAO, AsyncEventDAO, AsyncCustomerDAO, AsyncPaymentDAO, AsyncReportDAO
+from src.dao.rollup_dao import RollupDAO, booking_delta
+from src.services.booking_service import BookingError, MAX_RESERVE_RETRIES, RETRY_BACKOFF_SECONDS, EVENT_STOCK_COLUMNS
+from src.services.payment_service import PaymentError
+from src.services.reporting_service import ReportingError
+
+async def _record(rollups: RollupDAO, deltas: List[Dict]) -> None:
+    # RollupDAO is synchronous: its bumps run on a worker thread
+    if deltas and rollups.available:
+        await asyncio.to_thread(rollups.record, deltas)
+
+class AsyncPaymentService:
+    def __init__(self, dao: AsyncPaymentDAO = None, booking_dao: AsyncBookingDAO = None,
+                 rollups: RollupDAO = None):
+        self.dao = dao or AsyncPaymentDAO()
+        # Paid revenue is added to the daily rollup of the booking's event, as in PaymentService
+        self.booking_dao = booking_dao or AsyncBookingDAO()
+        self.rollups = rollups or RollupDAO()
+
+    async def _record_revenue(self, payments: List[Dict], sign: int) -> None:
+        payments = [p for p in payments if p]
+        if not payments or not self.rollups.available:
+            return
+        bookings = await self.booking_dao.get_bookings_by_ids((p["booking_id"] for p in payments),
+                                                              ["event_id", "created_at"])
+        await _record(self.rollups, [booking_delta(bookings[p["booking_id"]], revenue=sign * p["amount"])
+                                     for p in payments if p["booking_id"] in bookings])
+
+    async def create_pending_payment(self, booking_id: int, amount: float) -> Dict:
+        return await self.dao.create_payment(booking_id, amount)
+
+    async def process_payment(self, booking_id: int, method: str) -> Dict:
+        payment = await self.dao.get_payment_by_booking(booking_id, ["status"])
+        if not payment:
+            raise PaymentError(f"No payment found for booking {booking_id}")
+        if payment["status"] == "PAID":
+            raise PaymentError("Payment is already completed")
+        if payment["status"] != "PENDING":
+            raise PaymentError(f"Payment is {payment['status']} and cannot be paid")
+        paid = await self.dao.mark_paid(booking_id, method, status="PENDING")
+        if not paid:
+            raise PaymentError("Payment was changed concurrently, please retry")
+        await self._record_revenue([paid], 1)
+        return paid
+
+    async def refund_payment(self, booking_id: int) -> Dict:
+        payment = await self.dao.get_payment_by_booking(booking_id, ["status"])
+        if not payment:
+            raise PaymentError(f"No payment found for booking {booking_id}")
+        if payment["status"] == "REFUNDED":
+            raise PaymentError("Payment is already refunded")
+        refunded = await self.dao.refund_payment(booking_id, status=payment["status"])
+        if not refunded:
+            raise PaymentError("Payment was changed concurrently, please retry")
+        if payment["status"] == "PAID":
+            await self._record_revenue([refunded], -1)
+        return refunded
+
+    async def refund_payments_for_bookings(self, booking_ids: Iterable[int]) -> List[Dict]:
+        if not self.rollups.available:
+            return await self.dao.refund_payments_for_bookings(booking_ids)
+        # Paid ones first, so their amounts can be taken off the revenue rollups
+        booking_ids = list(booking_ids)
+        paid = await self.dao.refund_payments_for_bookings(booking_ids, status="PAID")
+        await self._record_revenue(paid, -1)
+        return paid + await self.dao.refund_payments_for_bookings(booking_ids)
+
+    async def delete_payments_for_bookings(self, booking_ids: Iterable[int]) -> List[Dict]:
+        return await self.dao.delete_payments_for_bookings(booking_ids)
+
+class AsyncBookingService:
+    """
+    Async counterpart of BookingService. Steps that do not depend on each
+    other (the customer and event reads, the writes of a cancellation) are
+    awaited together with asyncio.gather.
+    """
+    def __init__(self,
+                 booking_dao: AsyncBookingDAO = None,
+                 event_dao: AsyncEventDAO = None,
+                 customer_dao: AsyncCustomerDAO = None,
+                 payment_service: AsyncPaymentService = None,
+                 max_retries: int = MAX_RESERVE_RETRIES,
+                 rollups: RollupDAO = None):
+        self.booking_dao = booking_dao or AsyncBookingDAO()
+        self.event_dao = event_dao or AsyncEventDAO()
+        self.customer_dao = customer_dao or AsyncCustomerDAO()
+        self.rollups = rollups or RollupDAO()
+        self.payment_service = payment_service or AsyncPaymentService(booking_dao=self.booking_dao,
+                                                                      rollups=self.rollups)
+        self.max_retries = max_retries
+
+    async def _backoff(self, attempt: int) -> None:
+        await asyncio.sleep(random.uniform(0, RETRY_BACKOFF_SECONDS * (2 ** attempt)))
+
+    async def _adjust_capacity(self, event_id: int, delta: int, event: Dict | None = None) -> Dict:
+        """
+        Compare-and-set `delta` seats onto an event; `event` skips the first read.
+        """
+        if event is None:
+            event = await self.event_dao.get_event_by_id(event_id, EVENT_STOCK_COLUMNS)
+        for attempt in range(self.max_retries):
+            if not event:
+                raise BookingError(f"Event not found: {event_id}")
+            if event.get("capacity", 0) + delta < 0:
+                raise BookingError("Not enough seats available")
+            updated = await self.event_dao.compare_and_set_capacity(
+                event_id, event["capacity"], event["capacity"] + delta)
+            if updated:
+                return updated
+            await self._backoff(attempt)
+            event = await self.event_dao.get_event_by_id(event_id, EVENT_STOCK_COLUMNS)
+        raise BookingError("Event is busy, please retry")
+
+    async def _record_booked(self, bookings: List[Dict]) -> None:
+        await _record(self.rollups, [booking_delta(b, bookings=1, seats_booked=b["seats"]) for b in bookings])
+
+    async def _record_cancelled(self, bookings: List[Dict]) -> None:
+        await _record(self.rollups, [booking_delta(b, cancellations=1, seats_cancelled=b["seats"])
+                                     for b in bookings])
+
+    async def book_event(self, cust_id: int, event_id: int, seats: int) -> Dict:
+        if seats <= 0:
+            raise BookingError("Seats must be greater than 0")
+
+        for attempt in range(self.max_retries):
+            try:
+                booking = await self.booking_dao.reserve_booking(cust_id, event_id, seats)
+                break
+            except ConflictError:
+                await self._backoff(attempt)
+            except DAOError as e:
+                raise BookingError(str(e))
+        else:
+            raise BookingError("Event is busy, please retry")
+        if booking is not None:
+            await self._record_booked([booking])
+            return booking
+
+        # Fallback: both lookups as two concurrent requests, then decrement, booking and payment
+        customer, event = await asyncio.gather(
+            self.customer_dao.get_customer_by_id(cust_id, ["cust_id"]),
+            self.event_dao.get_event_by_id(event_id, EVENT_STOCK_COLUMNS))
+        if not customer:
+            raise BookingError(f"Customer not found: {cust_id}")
+        if not event:
+            raise BookingError(f"Event not found: {event_id}")
+
+        event = await self._adjust_capacity(event_id, -seats, event)
+        try:
+            booking = await self.booking_dao.create_booking(cust_id, event_id, seats)
+            try:
+                await self.payment_service.create_pending_payment(booking["booking_id"], seats * event["price"])
+            except Exception:
+                await self.booking_dao.delete_booking(booking["booking_id"])
+                raise
+        except Exception:
+            await self._adjust_capacity(event_id, seats)
+            raise
+        await self._record_booked([booking])
+        return booking
+
+    async def get_booking(self, booking_id: int) -> Dict:
+        booking = await self.booking_dao.get_booking_by_id(booking_id)
+        if not booking:
+            raise BookingError("Booking not found")
+        return booking
+
+    async def _refund_quietly(self, booking_id: int) -> None:
+        try:
+            await self.payment_service.refund_payment(booking_id)
+        except PaymentError as e:
+            print("Payment refund warning:", e)
+
+    async def cancel_booking(self, booking_id: int) -> Dict:
+        booking = await self.get_booking(booking_id)
+        if booking.get("status") == "CANCELLED":
+            raise BookingError("Booking is already cancelled")
+        # Only the call whose conditional update (status = BOOKED) wins releases the seats
+        rows = await self.booking_dao.cancel_bookings([booking_id])
+        if not rows:
+            raise BookingError("Booking is already cancelled")
+        cancelled = rows[0]
+        # Refund and seat release touch different rows
+        await asyncio.gather(
+            self._refund_quietly(booking_id),
+            self._adjust_capacity(cancelled["event_id"], cancelled["seats"]))
+        await self._record_cancelled([cancelled])
+        return cancelled
+
+    async def cancel_bookings(self, booking_ids: Iterable[int]) -> List[Dict]:
+        """
+        Cancel many bookings; the refunds and each event's seat release run concurrently.
+        """
+        cancelled = await self.booking_dao.cancel_bookings(booking_ids)
+        if not cancelled:
+            return []
+        seats_by_event: Dict[int, int] = {}
+        for b in cancelled:
+            seats_by_event[b["event_id"]] = seats_by_event.get(b["event_id"], 0) + b["seats"]
+        await asyncio.gather(
+            self.payment_service.refund_payments_for_bookings(b["booking_id"] for b in cancelled),
+            *(self._adjust_capacity(event_id, seats) for event_id, seats in seats_by_event.items()))
+        await self._record_cancelled(cancelled)
+        return cancelled
+
+class AsyncReportingService:
+    def __init__(self, report_dao: AsyncReportDAO = None, rollups: RollupDAO = None):
+        self.report_dao = report_dao or AsyncReportDAO()
+        self.rollups = rollups or RollupDAO()
+
+    async def top_selling_events(self, limit: int = 5) -> List[Dict]:
+        try:
+            rows = await self.report_dao.event_seats(limit)
+            return [{"event": r["title"], "seats_sold": r["seats_sold"]} for r in rows]
+        except Exception as e:
+            raise ReportingError(str(e))
+
+    async def total_revenue_last_month(self) -> float:
+        last_month = datetime.now() - timedelta(days=30)
+        try:
+            revenue = await asyncio.to_thread(self.rollups.revenue_between, last_month.date(), date.today())
+            if revenue is None:
+                # Rollups not deployed: sum the PAID payments of those bookings instead
+                return await self.report_dao.paid_revenue_since(last_month.date())
+            return revenue
+        except Exception as e:
+            raise ReportingError(str(e))
+
+    async def total_bookings_per_customer(self) -> List[Dict]:
+        try:
+            rows = await self.report_dao.customer_bookings()
+            return [{"customer": r["name"], "total_bookings": r["bookings"]} for r in rows]
+        except Exception as e:
+            raise ReportingError(str(e))
+
+    async def customers_with_multiple_bookings(self, min_bookings: int = 2) -> List[Dict]:
+        try:
+            rows = await self.report_dao.customer_bookings(min_bookings)
+            return [{"customer": r["name"], "bookings": r["bookings"]} for r in rows]
+        except Exception as e:
+            raise ReportingError(str(e))
+
+    async def dashboard(self) -> Dict:
+        """
+        Every report at once; the queries run concurrently.
+        """
+        top, revenue, per_customer, repeat = await asyncio.gather(
+            self.top_selling_events(), self.total_revenue_last_month(),
+            self.total_bookings_per_customer(), self.customers_with_multiple_bookings())
+        return {"top_selling_events": top, "revenue_last_month": revenue,
+                "bookings_per_customer": per_customer, "repeat_customers": repeat}
@@ -1,9 +1,22 @@
 # src/services/booking_service.py
-from typing import Dict
+import random
+import time
+from typing import Dict, Iterable, List
+from src.dao.base_dao import DAOError, ConflictError
 from src.dao.booking_dao import BookingDAO
 from src.dao.event_dao import EventDAO
 from src.dao.customer_dao import CustomerDAO
+from src.dao.rollup_dao import RollupDAO, booking_delta
 from src.services.payment_service import PaymentService, PaymentError
+from src.services.seat_inventory import SeatInventory
+
+# Attempts before giving up on a contended event row, and base backoff between them
+MAX_RESERVE_RETRIES = 5
+RETRY_BACKOFF_SECONDS = 0.02
+# All a seat reservation needs from the event row
+EVENT_STOCK_COLUMNS = ["event_id", "capacity", "price"]
+# Rejection raised by reserve_booking(s) (sql/booking.sql) and the fallback alike
+NOT_ENOUGH_SEATS = "Not enough seats available"
 
 class BookingError(Exception):
     """Custom exception for booking-related errors."""
@@ -14,38 +27,207 @@ class BookingService:
                  booking_dao: BookingDAO = None, 
                  event_dao: EventDAO = None, 
                  customer_dao: CustomerDAO = None, 
-                 payment_service: PaymentService = None):
+                 payment_service: PaymentService = None,
+                 inventory: SeatInventory = None,
+                 max_retries: int = MAX_RESERVE_RETRIES,
+                 rollups: RollupDAO = None):
         # Dependency injection
         self.booking_dao = booking_dao or BookingDAO()
         self.event_dao = event_dao or EventDAO()
         self.customer_dao = customer_dao or CustomerDAO()
         self.payment_service = payment_service or PaymentService()
+        self.inventory = inventory or SeatInventory(self.event_dao)
+        self.max_retries = max_retries
+        # Daily per-event sales buckets, kept current by every booking and cancellation
+        self.rollups = rollups or RollupDAO(self.booking_dao.client)
+
+    def _backoff(self, attempt: int) -> None:
+        # Full jitter so competing workers do not retry in lockstep
+        time.sleep(random.uniform(0, RETRY_BACKOFF_SECONDS * (2 ** attempt)))
+
+    def _adjust_capacity(self, event_id: int, delta: int, event: Dict | None = None) -> Dict:
+        """
+        Atomically add `delta` seats to an event (negative to reserve) with a
+        compare-and-set on the current capacity, retrying a bounded number of times.
+        `event` (with EVENT_STOCK_COLUMNS) saves the first read when the caller has it.
+        """
+        if event is None:
+            event = self.event_dao.get_event_by_id(event_id, EVENT_STOCK_COLUMNS)
+        for attempt in range(self.max_retries):
+            if not event:
+                raise BookingError(f"Event not found: {event_id}")
+            if event.get("capacity", 0) + delta < 0:
+                raise BookingError(NOT_ENOUGH_SEATS)
+            updated = self.event_dao.compare_and_set_capacity(
+                event_id, event["capacity"], event["capacity"] + delta)
+            if updated:
+                self.inventory.reconcile(updated)
+                return updated
+            # Lost the race: another booking changed capacity, re-read and retry
+            self._backoff(attempt)
+            event = self.event_dao.get_event_by_id(event_id, EVENT_STOCK_COLUMNS)
+        raise BookingError("Event is busy, please retry")
+
+    def _record_booked(self, bookings: List[Dict]) -> None:
+        self.rollups.record(booking_delta(b, bookings=1, seats_booked=b["seats"]) for b in bookings)
+
+    def _record_cancelled(self, bookings: List[Dict]) -> None:
+        self.rollups.record(booking_delta(b, cancellations=1, seats_cancelled=b["seats"]) for b in bookings)
 
     def book_event(self, cust_id: int, event_id: int, seats: int) -> Dict:
-        # Validate customer
-        customer = self.customer_dao.get_customer_by_id(cust_id)
+        if seats <= 0:
+            raise BookingError("Seats must be greater than 0")
+        # Sold-out (or too small) events are rejected from the inventory, which
+        # reads the event at most once per refresh interval
+        seats_left = self.inventory.seats_left(event_id)
+        if seats_left is None:
+            raise BookingError(f"Event not found: {event_id}")
+        if seats > seats_left:
+            raise BookingError(NOT_ENOUGH_SEATS)
+
+        # Preferred path: one stored procedure reserves seats and writes booking + payment
+        for attempt in range(self.max_retries):
+            try:
+                booking = self.booking_dao.reserve_booking(cust_id, event_id, seats)
+                break
+            except ConflictError:
+                self._backoff(attempt)
+            except DAOError as e:
+                if str(e) == NOT_ENOUGH_SEATS:
+                    self.inventory.record_shortage(event_id, seats)
+                else:
+                    self.inventory.invalidate(event_id)
+                raise BookingError(str(e))
+        else:
+            raise BookingError("Event is busy, please retry")
+        if booking is not None:
+            self.inventory.adjust(event_id, -seats)
+            self._record_booked([booking])
+            return booking
+
+        # Fallback: conditional decrement, then booking and payment with compensation
+        customer = self.customer_dao.get_customer_by_id(cust_id, ["cust_id"])
         if not customer:
             raise BookingError(f"Customer not found: {cust_id}")
 
-        # Validate event and capacity
-        event = self.event_dao.get_event_by_id(event_id)
-        if not event:
-            raise BookingError(f"Event not found: {event_id}")
-        if seats > event.get("capacity", 0):
-            raise BookingError("Not enough seats available")
+        event = self._adjust_capacity(event_id, -seats)
+        try:
+            booking = self.booking_dao.create_booking(cust_id, event_id, seats)
+            amount = seats * event["price"]
+            try:
+                self.payment_service.create_pending_payment(booking["booking_id"], amount)
+            except Exception:
+                self.booking_dao.delete_booking(booking["booking_id"])
+                raise
+        except Exception:
+            # Give the seats back so a failed write never leaks capacity
+            self._adjust_capacity(event_id, seats)
+            raise
 
-        # Reduce event capacity
-        new_capacity = event["capacity"] - seats
-        self.event_dao.update_event(event_id, {"capacity": new_capacity})
+        self._record_booked([booking])
+        return booking
 
-        # Create booking
-        booking = self.booking_dao.create_booking(cust_id, event_id, seats)
+    def book_many(self, requests: List[Dict], atomic: bool = False) -> List[Dict]:
+        """
+        Book many {"cust_id", "event_id", "seats"} requests in a handful of round trips:
+        one bulk read each for customers and events, one reservation for the batch,
+        then batched booking and payment inserts.
+        Returns one {"request", "booking", "error"} result per request, in order.
+        Requests that fail validation get their own error and the rest are booked
+        all-or-nothing; with `atomic`, any invalid request rejects the whole batch.
+        """
+        results = [{"request": r, "booking": None, "error": None} for r in requests]
+        customers = self.customer_dao.get_customers_by_ids((r.get("cust_id") for r in requests), ["cust_id"])
+        events = self.event_dao.get_events_by_ids((r.get("event_id") for r in requests), EVENT_STOCK_COLUMNS)
+        for event in events.values():
+            self.inventory.reconcile(event)
 
-        # Create pending payment
-        amount = seats * event["price"]
-        self.payment_service.create_pending_payment(booking["booking_id"], amount)
+        # Seats left per event as read, handed out in request order
+        seats_left = {eid: e["capacity"] for eid, e in events.items()}
+        valid: List[int] = []
+        for i, r in enumerate(requests):
+            seats = r.get("seats") or 0
+            if seats <= 0:
+                results[i]["error"] = "Seats must be greater than 0"
+            elif r.get("cust_id") not in customers:
+                results[i]["error"] = f"Customer not found: {r.get('cust_id')}"
+            elif r.get("event_id") not in events:
+                results[i]["error"] = f"Event not found: {r.get('event_id')}"
+            elif seats > seats_left[r["event_id"]]:
+                results[i]["error"] = NOT_ENOUGH_SEATS
+            else:
+                seats_left[r["event_id"]] -= seats
+                valid.append(i)
 
-        return booking
+        if not valid:
+            return results
+        if atomic and len(valid) < len(requests):
+            for i in valid:
+                results[i]["error"] = "Batch rejected: another request is invalid"
+            return results
+
+        items = [{"cust_id": requests[i]["cust_id"], "event_id": requests[i]["event_id"],
+                  "seats": int(requests[i]["seats"])} for i in valid]
+        try:
+            bookings = self._reserve_many(items, events)
+        except BookingError as e:
+            for i in valid:
+                results[i]["error"] = str(e)
+            return results
+        for i, booking in zip(valid, bookings):
+            results[i]["booking"] = booking
+        self._record_booked(bookings)
+        return results
+
+    def _reserve_many(self, items: List[Dict], events: Dict[int, Dict]) -> List[Dict]:
+        """
+        Book validated items all-or-nothing; returns the bookings in item order.
+        """
+        seats_by_event: Dict[int, int] = {}
+        for item in items:
+            seats_by_event[item["event_id"]] = seats_by_event.get(item["event_id"], 0) + item["seats"]
+
+        for attempt in range(self.max_retries):
+            try:
+                bookings = self.booking_dao.reserve_bookings(items)
+                break
+            except ConflictError:
+                self._backoff(attempt)
+            except DAOError as e:
+                if str(e) == NOT_ENOUGH_SEATS:
+                    # The batch does not say which event ran short: record what is left in all of them
+                    for event in self.event_dao.get_events_by_ids(seats_by_event, ["event_id", "capacity"]).values():
+                        self.inventory.reconcile(event)
+                else:
+                    for event_id in seats_by_event:
+                        self.inventory.invalidate(event_id)
+                raise BookingError(str(e))
+        else:
+            raise BookingError("Event is busy, please retry")
+        if bookings is not None:
+            for event_id, seats in seats_by_event.items():
+                self.inventory.adjust(event_id, -seats)
+            return bookings
+
+        # Fallback: one compare-and-set per event, then one insert each for bookings and payments
+        reserved: Dict[int, Dict] = {}
+        try:
+            for event_id, seats in seats_by_event.items():
+                reserved[event_id] = self._adjust_capacity(event_id, -seats, events[event_id])
+            bookings = self.booking_dao.create_bookings(items)
+            try:
+                self.payment_service.create_pending_payments(
+                    [{"booking_id": b["booking_id"], "amount": b["seats"] * reserved[b["event_id"]]["price"]}
+                     for b in bookings])
+            except Exception:
+                self.booking_dao.delete_bookings(b["booking_id"] for b in bookings)
+                raise
+        except Exception:
+            # Release every event already reserved so the batch leaves no trace
+            for event_id in reserved:
+                self._adjust_capacity(event_id, seats_by_event[event_id])
+            raise
+        return bookings
 
     def get_booking(self, booking_id: int) -> Dict:
         booking = self.booking_dao.get_booking_by_id(booking_id)
@@ -57,9 +239,14 @@ class BookingService:
         booking = self.booking_dao.get_booking_by_id(booking_id)
         if not booking:
             raise BookingError("Booking not found")
+        if booking.get("status") == "CANCELLED":
+            raise BookingError("Booking is already cancelled")
 
-        # Update booking status
-        self.booking_dao.update_booking(booking_id, {"status": "CANCELLED"})
+        # Update booking status only if it is still BOOKED, so concurrent cancels release seats once
+        rows = self.booking_dao.cancel_bookings([booking_id])
+        if not rows:
+            raise BookingError("Booking is already cancelled")
+        cancelled = rows[0]
 
         # Refund payment
         try:
@@ -68,8 +255,47 @@ class BookingService:
             print("Payment refund warning:", e)
 
         # Restore event capacity
-        event = self.event_dao.get_event_by_id(booking["event_id"])
-        self.event_dao.update_event(event["event_id"], {"capacity": event["capacity"] + booking["seats"]})
+        self._adjust_capacity(cancelled["event_id"], cancelled["seats"])
+
+        self._record_cancelled([cancelled])
+        return cancelled
 
-        return self.booking_dao.get_booking_by_id(booking_id)
+    def cancel_bookings(self, booking_ids: Iterable[int]) -> List[Dict]:
+        """
+        Cancel many bookings with set-based writes: one status update and one
+        refund per chunk of ids, then one capacity release per affected event.
+        Bookings that are missing or already cancelled are skipped.
+        """
+        cancelled = self.booking_dao.cancel_bookings(booking_ids)
+        if not cancelled:
+            return []
+        self.payment_service.refund_payments_for_bookings(b["booking_id"] for b in cancelled)
 
+        seats_by_event: Dict[int, int] = {}
+        for b in cancelled:
+            seats_by_event[b["event_id"]] = seats_by_event.get(b["event_id"], 0) + b["seats"]
+        for event_id, seats in seats_by_event.items():
+            self._adjust_capacity(event_id, seats)
+        self._record_cancelled(cancelled)
+        return cancelled
+
+    def delete_event_cascade(self, event_id: int) -> Dict:
+        """
+        Delete an event with its bookings, payments and sales rollups: payments are
+        refunded and removed per chunk of booking ids, bookings in one delete, then the event.
+        """
+        if not self.event_dao.get_event_by_id(event_id, ["event_id"]):
+            raise BookingError(f"Event not found: {event_id}")
+        booking_ids = [b["booking_id"] for b in self.booking_dao.iter_bookings_for_event(event_id, ["booking_id"])]
+        refunded = self.payment_service.refund_payments_for_bookings(booking_ids)
+        payments = self.payment_service.delete_payments_for_bookings(booking_ids)
+        bookings = self.booking_dao.delete_bookings_for_event(event_id)
+        event = self.event_dao.delete_event(event_id)
+        self.rollups.delete_for_event(event_id)
+        self.inventory.invalidate(event_id)
+        return {
+            "event": event,
+            "bookings_deleted": len(bookings),
+            "payments_refunded": len(refunded),
+            "payments_deleted": len(payments),
+        }
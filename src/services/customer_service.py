@@ -1,21 +1,32 @@
 # src/services/customer_service.py
 from typing import Dict, List
+from src.dao.base_dao import DuplicateKeyError
 from src.dao.customer_dao import CustomerDAO
+from src.services.email_index import EmailIndex, normalize_email
 
 class CustomerError(Exception):
     """Custom exception for customer-related errors."""
     pass
 
 class CustomerService:
-    def __init__(self, dao: CustomerDAO):
+    def __init__(self, dao: CustomerDAO, emails: EmailIndex = None):
         self.dao = dao
+        # Known emails, checked locally before the database's unique constraint
+        self.emails = emails or EmailIndex(dao)
 
     def add_customer(self, name: str, email: str, phone: str, city: str | None = None) -> Dict:
-        # Validate email uniqueness
-        existing = self.dao.get_customer_by_email(email)
-        if existing:
+        # Validate email uniqueness: known duplicates never reach the database, and the
+        # unique constraint catches the rest in the insert itself (no check-then-insert race)
+        email = normalize_email(email)
+        if self.emails.contains(email):
             raise CustomerError(f"Customer with email '{email}' already exists.")
-        return self.dao.create_customer(name, email, phone, city)
+        try:
+            customer = self.dao.create_customer(name, email, phone, city)
+        except DuplicateKeyError:
+            self.emails.add(email)
+            raise CustomerError(f"Customer with email '{email}' already exists.")
+        self.emails.add(email)
+        return customer
 
     def get_customer(self, cust_id: int) -> Dict:
         customer = self.dao.get_customer_by_id(cust_id)
@@ -24,24 +35,36 @@ class CustomerService:
         return customer
 
     def update_customer(self, cust_id: int, fields: Dict) -> Dict:
-        # Optional: validate fields (like email uniqueness)
+        old_email = None
         if 'email' in fields:
-            existing = self.dao.get_customer_by_email(fields['email'])
-            if existing and existing['cust_id'] != cust_id:
+            fields = {**fields, "email": normalize_email(fields["email"])}
+            current = self.dao.get_customer_by_id(cust_id, ["email"])
+            old_email = normalize_email(current["email"]) if current and current.get("email") else None
+            if fields["email"] != old_email and self.emails.contains(fields["email"]):
                 raise CustomerError(f"Email '{fields['email']}' already used by another customer.")
-        updated = self.dao.update_customer(cust_id, fields)
+        try:
+            updated = self.dao.update_customer(cust_id, fields)
+        except DuplicateKeyError:
+            self.emails.add(fields["email"])
+            raise CustomerError(f"Email '{fields['email']}' already used by another customer.")
         if not updated:
             raise CustomerError(f"Failed to update customer with id: {cust_id}")
+        if 'email' in fields and fields["email"] != old_email:
+            if old_email:
+                self.emails.discard(old_email)
+            self.emails.add(fields["email"])
         return updated
 
     def delete_customer(self, cust_id: int) -> Dict:
         deleted = self.dao.delete_customer(cust_id)
         if not deleted:
             raise CustomerError(f"Customer not found with id: {cust_id}")
+        if deleted.get("email"):
+            self.emails.discard(deleted["email"])
         return deleted
 
     def list_customers(self, limit: int = 100) -> List[Dict]:
         return self.dao.list_customers(limit)
 
-    def search_customers(self, email: str | None = None, city: str | None = None) -> List[Dict]:
-        return self.dao.search_customers(email=email, city=city)
+    def search_customers(self, email: str | None = None, city: str | None = None, limit: int = 100) -> List[Dict]:
+        return self.dao.search_customers(email=email, city=city, limit=limit)
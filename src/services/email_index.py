@@ -0,0 +1,79 @@
+# src/services/email_index.py
+import hashlib
+import threading
+import time
+from typing import Set
+from src.dao.base_dao import SCAN_PAGE_SIZE
+from src.dao.customer_dao import CustomerDAO
+
+# Seconds before the set is re-read, dropping emails freed by other processes
+EMAIL_INDEX_REFRESH_SECONDS = 300.0
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+def _email_hash(email: str) -> int:
+    # 64-bit digests: a fraction of the memory of the strings, collisions negligible
+    return int.from_bytes(hashlib.blake2b(email.encode("utf-8"), digest_size=8).digest(), "big")
+
+class EmailIndex:
+    """
+    In-process set of hashed customer emails, warmed by one projected paged
+    scan and kept current by this process's writes. It lets signups reject
+    known duplicates without a database round trip; the unique constraint on
+    customers.email (sql/customers.sql) stays the authority for everything else.
+    """
+    def __init__(self, dao: CustomerDAO = None, refresh_interval: float = EMAIL_INDEX_REFRESH_SECONDS,
+                 page_size: int = SCAN_PAGE_SIZE):
+        self.dao = dao or CustomerDAO()
+        self.refresh_interval = refresh_interval
+        self.page_size = page_size
+        self._hashes: Set[int] | None = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._warming = threading.Lock()
+        # Changes made while a warm-up scan is running, replayed onto its result
+        self._added: Set[int] = set()
+        self._discarded: Set[int] = set()
+
+    def _warm(self) -> None:
+        with self._warming:
+            if self._hashes is not None and time.monotonic() - self._loaded_at < self.refresh_interval:
+                return  # another thread just finished warming
+            with self._lock:
+                self._added.clear()
+                self._discarded.clear()
+            hashes = {_email_hash(normalize_email(c["email"]))
+                      for c in self.dao.iter_customers(page_size=self.page_size, columns=["email"])
+                      if c.get("email")}
+            with self._lock:
+                self._hashes = (hashes | self._added) - self._discarded
+                self._loaded_at = time.monotonic()
+
+    def _ensure_warm(self) -> None:
+        if self._hashes is None or time.monotonic() - self._loaded_at >= self.refresh_interval:
+            self._warm()
+
+    def contains(self, email: str) -> bool:
+        self._ensure_warm()
+        return _email_hash(normalize_email(email)) in self._hashes
+
+    def add(self, email: str) -> None:
+        h = _email_hash(normalize_email(email))
+        with self._lock:
+            self._added.add(h)
+            self._discarded.discard(h)
+            if self._hashes is not None:
+                self._hashes.add(h)
+
+    def discard(self, email: str) -> None:
+        h = _email_hash(normalize_email(email))
+        with self._lock:
+            self._discarded.add(h)
+            self._added.discard(h)
+            if self._hashes is not None:
+                self._hashes.discard(h)
+
+    def __len__(self) -> int:
+        self._ensure_warm()
+        return len(self._hashes)
@@ -10,12 +10,18 @@ class EventService:
     def __init__(self, dao: EventDAO):
         self.dao = dao
 
-    def add_event(self, title: str, date: str, location: str, capacity: int, price: float) -> Dict:
-        # Basic validation
+    @staticmethod
+    def validate_event(capacity: int, price: float) -> None:
+        """
+        Basic validation shared by add_event and the bulk importer.
+        """
         if capacity <= 0:
             raise EventError("Event capacity must be greater than 0")
         if price < 0:
             raise EventError("Event price cannot be negative")
+
+    def add_event(self, title: str, date: str, location: str, capacity: int, price: float) -> Dict:
+        self.validate_event(capacity, price)
         return self.dao.create_event(title, date, location, capacity, price)
 
     def get_event(self, event_id: int) -> Dict:
@@ -39,5 +45,7 @@ class EventService:
     def list_events(self, limit: int = 100) -> List[Dict]:
         return self.dao.list_events(limit)
     
-    def search_events(self, title: str | None = None, date: str | None = None, location: str | None = None) -> List[Dict]:
-        return self.dao.search_events(title=title, date=date, location=location)
+    def search_events(self, title: str | None = None, date: str | None = None, location: str | None = None,
+                      date_from: str | None = None, date_to: str | None = None, limit: int = 100) -> List[Dict]:
+        return self.dao.search_events(title=title, date=date, location=location,
+                                      date_from=date_from, date_to=date_to, limit=limit)
@@ -0,0 +1,167 @@
+# src/services/export_service.py
+import csv
+import json
+import os
+from typing import Dict, Iterable, Iterator, List
+from src.dao.base_dao import pages
+from src.dao.customer_dao import CustomerDAO
+from src.dao.event_dao import EventDAO
+from src.dao.booking_dao import BookingDAO
+from src.dao.payment_dao import PaymentDAO
+
+EXPORT_TABLES = ("customers", "events", "bookings", "payments")
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+DEFAULT_PAGE_SIZE = 1000
+# Joined lookups remembered across pages before the memo is reset
+MAX_MEMO_ROWS = 50_000
+
+EVENT_JOIN_COLUMNS = ["title", "date", "price"]
+CUSTOMER_JOIN_COLUMNS = ["name", "email"]
+
+class ExportError(Exception):
+    """Custom exception for export-related errors."""
+    pass
+
+class _CsvWriter:
+    def __init__(self, path: str):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = None
+
+    def write(self, page: List[Dict]) -> None:
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=list(page[0]), extrasaction="ignore")
+            self._writer.writeheader()
+        self._writer.writerows(page)
+
+    def close(self) -> None:
+        self._file.close()
+
+class _JsonlWriter:
+    def __init__(self, path: str):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, page: List[Dict]) -> None:
+        self._file.writelines(json.dumps(row, default=str) + "\n" for row in page)
+
+    def close(self) -> None:
+        self._file.close()
+
+class _ParquetWriter:
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ExportError("Parquet export requires pyarrow (pip install pyarrow)")
+        self._pa, self._pq = pa, pq
+        self._path = path
+        self._writer = None
+
+    def write(self, page: List[Dict]) -> None:
+        # One row group per page; the schema is fixed by the first page
+        if self._writer is None:
+            table = self._pa.Table.from_pylist(page)
+            self._writer = self._pq.ParquetWriter(self._path, table.schema)
+        else:
+            table = self._pa.Table.from_pylist(page, schema=self._writer.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+WRITERS = {"csv": _CsvWriter, "jsonl": _JsonlWriter, "parquet": _ParquetWriter}
+
+class ExportService:
+    """
+    Streams tables to CSV, JSONL or Parquet one keyset page at a time.
+    Bookings and payments are joined with their event and customer through bulk
+    lookups per page, so memory is bounded by the page size, not the table size.
+    """
+    def __init__(self,
+                 customer_dao: CustomerDAO = None,
+                 event_dao: EventDAO = None,
+                 booking_dao: BookingDAO = None,
+                 payment_dao: PaymentDAO = None,
+                 page_size: int = DEFAULT_PAGE_SIZE):
+        self.customer_dao = customer_dao or CustomerDAO()
+        self.event_dao = event_dao or EventDAO()
+        self.booking_dao = booking_dao or BookingDAO()
+        self.payment_dao = payment_dao or PaymentDAO()
+        self.page_size = page_size
+        self._events: Dict[int, Dict] = {}
+        self._customers: Dict[int, Dict] = {}
+
+    def _lookup(self, memo: Dict[int, Dict], ids: Iterable[int], fetch) -> Dict[int, Dict]:
+        if len(memo) > MAX_MEMO_ROWS:
+            memo.clear()
+        missing = {i for i in ids if i is not None and i not in memo}
+        if missing:
+            memo.update(fetch(missing))
+        return memo
+
+    def _join_bookings(self, page: List[Dict]) -> List[Dict]:
+        events = self._lookup(self._events, (b.get("event_id") for b in page),
+                              lambda ids: self.event_dao.get_events_by_ids(ids, EVENT_JOIN_COLUMNS))
+        customers = self._lookup(self._customers, (b.get("cust_id") for b in page),
+                                 lambda ids: self.customer_dao.get_customers_by_ids(ids, CUSTOMER_JOIN_COLUMNS))
+        rows = []
+        for b in page:
+            event = events.get(b.get("event_id"), {})
+            customer = customers.get(b.get("cust_id"), {})
+            rows.append({
+                **b,
+                **{f"event_{c}": event.get(c) for c in EVENT_JOIN_COLUMNS},
+                **{f"customer_{c}": customer.get(c) for c in CUSTOMER_JOIN_COLUMNS},
+            })
+        return rows
+
+    def _join_payments(self, page: List[Dict]) -> List[Dict]:
+        bookings = self.booking_dao.get_bookings_by_ids((p["booking_id"] for p in page),
+                                                        ["cust_id", "event_id", "seats"])
+        return self._join_bookings([
+            {**p, **{k: v for k, v in bookings.get(p["booking_id"], {}).items() if k != "booking_id"}}
+            for p in page
+        ])
+
+    def _rows(self, table: str, since: str | None) -> Iterator[List[Dict]]:
+        if table == "customers":
+            source, join = self.customer_dao.iter_customers(self.page_size, since=since), None
+        elif table == "events":
+            source, join = self.event_dao.iter_events(self.page_size, since=since), None
+        elif table == "bookings":
+            source, join = self.booking_dao.iter_bookings(self.page_size, since=since), self._join_bookings
+        elif table == "payments":
+            source, join = self.payment_dao.iter_payments(self.page_size, since=since), self._join_payments
+        else:
+            raise ExportError(f"Unknown table: {table} (expected one of {', '.join(EXPORT_TABLES)})")
+        for page in pages(source, self.page_size):
+            yield join(page) if join else page
+
+    def export(self, table: str, path: str, fmt: str | None = None, since: str | None = None) -> int:
+        """
+        Write `table` to `path` and return the number of rows written.
+        The format defaults to the file extension; `since` (YYYY-MM-DD) keeps
+        only rows created on/after that date for incremental runs.
+        The file is written under a temporary name and moved into place at the end
+        (an empty Parquet export writes no file, since Parquet needs a schema).
+        """
+        fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+        if fmt not in WRITERS:
+            raise ExportError(f"Unsupported format: {fmt} (expected one of {', '.join(EXPORT_FORMATS)})")
+        tmp_path = path + ".tmp"
+        writer = WRITERS[fmt](tmp_path)
+        count = 0
+        try:
+            for page in self._rows(table, since):
+                writer.write(page)
+                count += len(page)
+        except Exception:
+            writer.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        writer.close()
+        if os.path.exists(tmp_path):
+            os.replace(tmp_path, path)
+        return count
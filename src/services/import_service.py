@@ -0,0 +1,218 @@
+# src/services/import_service.py
+import csv
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Deque, Dict, Iterator, List, Tuple
+from src.dao.customer_dao import CustomerDAO
+from src.dao.event_dao import EventDAO
+from src.dao.booking_dao import BookingDAO
+from src.services.booking_service import BookingService
+from src.services.event_service import EventService, EventError
+from src.services.email_index import EmailIndex, normalize_email
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_WORKERS = 4
+
+class DataImportError(Exception):
+    """Custom exception for import-related errors."""
+    pass
+
+# A batch is a list of (line number, validated payload)
+Batch = List[Tuple[int, Dict]]
+
+def read_rows(path: str) -> Iterator[Tuple[int, Dict]]:
+    """
+    Stream (line number, row) pairs from a .csv or .jsonl/.ndjson file.
+    Unparseable JSON lines are yielded as {"__error__": message}.
+    """
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+    elif path.endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    row = {"__error__": f"Invalid JSON: {e}"}
+                yield line_no, row if isinstance(row, dict) else {"__error__": "Expected a JSON object"}
+    else:
+        raise DataImportError(f"Unsupported file type: {path} (expected .csv or .jsonl)")
+
+def _required(row: Dict, key: str) -> str:
+    value = row.get(key)
+    if value is None or str(value).strip() == "":
+        raise ValueError(f"Missing required field '{key}'")
+    return str(value).strip()
+
+def validate_customer(row: Dict) -> Dict:
+    payload = {"name": _required(row, "name"), "email": normalize_email(_required(row, "email")),
+               "phone": _required(row, "phone")}
+    city = str(row.get("city") or "").strip()
+    payload["city"] = city or None
+    return payload
+
+def validate_event(row: Dict) -> Dict:
+    capacity = int(_required(row, "capacity"))
+    price = float(_required(row, "price"))
+    # Same rules as EventService.add_event
+    EventService.validate_event(capacity, price)
+    return {
+        "title": _required(row, "title"),
+        "date": _required(row, "date"),
+        "location": _required(row, "location"),
+        "capacity": capacity,
+        "price": price,
+    }
+
+def validate_booking(row: Dict) -> Dict:
+    seats = int(_required(row, "seats"))
+    if seats <= 0:
+        raise ValueError("Seats must be greater than 0")
+    # Imported bookings reserve seats like any other booking, so only live ones are accepted
+    status = str(row.get("status") or "BOOKED").strip().upper()
+    if status != "BOOKED":
+        raise ValueError(f"Only BOOKED bookings can be imported (got '{row['status']}')")
+    return {"cust_id": int(_required(row, "cust_id")), "event_id": int(_required(row, "event_id")), "seats": seats}
+
+class ImportService:
+    """
+    Streams partner files into the database in multi-row batches.
+    Rows are validated as they are read; valid rows are inserted batch_size at
+    a time by a small worker pool, and a failed batch is retried row by row so
+    one bad record only costs its own row. Nothing aborts the whole load.
+    """
+    def __init__(self,
+                 customer_dao: CustomerDAO = None,
+                 event_dao: EventDAO = None,
+                 booking_dao: BookingDAO = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 workers: int = DEFAULT_WORKERS,
+                 emails: EmailIndex = None,
+                 booking_service: BookingService = None):
+        self.customer_dao = customer_dao or CustomerDAO()
+        self.event_dao = event_dao or EventDAO()
+        self.booking_dao = booking_dao or BookingDAO()
+        # Bookings go through the reservation path: capacity, pending payment and rollups
+        self.booking_service = booking_service or BookingService(self.booking_dao, self.event_dao,
+                                                                 self.customer_dao)
+        # Optional: reject rows with known emails before they cost a failed batch
+        self.emails = emails
+        self.batch_size = batch_size
+        self.workers = workers
+
+    def import_customers(self, path: str) -> Dict:
+        seen_emails = set()
+
+        def validate(row: Dict) -> Dict:
+            payload = validate_customer(row)
+            email = payload["email"]
+            if email in seen_emails:
+                raise ValueError(f"Duplicate email in file: {email}")
+            seen_emails.add(email)
+            if self.emails is not None and self.emails.contains(email):
+                raise ValueError(f"Customer with email '{email}' already exists.")
+            return payload
+
+        def insert(rows: List[Dict]) -> List[Dict]:
+            created = self.customer_dao.create_customers(rows)
+            if self.emails is not None:
+                for c in created:
+                    self.emails.add(c["email"])
+            return created
+
+        return self._run(path, validate, insert)
+
+    def import_events(self, path: str) -> Dict:
+        return self._run(path, validate_event, self.event_dao.create_events)
+
+    def import_bookings(self, path: str) -> Dict:
+        """
+        Import bookings through BookingService.book_many: each batch reserves its
+        seats all-or-nothing and gets its pending payments. A batch with a bad row
+        (unknown customer or event, not enough seats) is retried row by row.
+        """
+        return self._run(path, validate_booking, self._insert_bookings)
+
+    def import_file(self, kind: str, path: str) -> Dict:
+        importers = {
+            "customers": self.import_customers,
+            "events": self.import_events,
+            "bookings": self.import_bookings,
+        }
+        if kind not in importers:
+            raise DataImportError(f"Unknown import type: {kind}")
+        return importers[kind](path)
+
+    def _insert_bookings(self, rows: List[Dict]) -> List[Dict]:
+        results = self.booking_service.book_many(rows, atomic=True)
+        errors = [r["error"] for r in results if r["error"]]
+        if errors:
+            # Nothing was booked; report the first row's own reason, not the batch rejection
+            raise ValueError(next((e for e in errors if not e.startswith("Batch rejected")), errors[0]))
+        return [r["booking"] for r in results]
+
+    def _insert_batch(self, insert: Callable[[List[Dict]], List[Dict]], batch: Batch) -> Tuple[int, List[Dict]]:
+        """
+        Insert one batch; if the multi-row insert fails, fall back to one row at a
+        time so the bad rows can be reported individually.
+        """
+        try:
+            return len(insert([payload for _, payload in batch])), []
+        except Exception:
+            if len(batch) == 1:
+                raise
+        inserted, errors = 0, []
+        for line_no, payload in batch:
+            try:
+                inserted += len(insert([payload]))
+            except Exception as e:
+                errors.append({"line": line_no, "error": str(e)})
+        return inserted, errors
+
+    def _run(self, path: str, validate: Callable[[Dict], Dict],
+             insert: Callable[[List[Dict]], List[Dict]]) -> Dict:
+        result = {"inserted": 0, "failed": 0, "errors": []}
+        # Bounded number of batches in flight keeps memory flat for any file size
+        pending: Deque[Tuple[Batch, Future]] = deque()
+
+        def collect(batch: Batch, future: Future) -> None:
+            try:
+                inserted, errors = future.result()
+            except Exception as e:
+                inserted, errors = 0, [{"line": line_no, "error": str(e)} for line_no, _ in batch]
+            result["inserted"] += inserted
+            result["failed"] += len(errors)
+            result["errors"].extend(errors)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            def submit(batch: Batch) -> None:
+                while len(pending) >= self.workers * 2:
+                    collect(*pending.popleft())
+                pending.append((batch, pool.submit(self._insert_batch, insert, batch)))
+
+            batch: Batch = []
+            for line_no, row in read_rows(path):
+                try:
+                    if "__error__" in row:
+                        raise ValueError(row["__error__"])
+                    batch.append((line_no, validate(row)))
+                except (ValueError, TypeError, EventError) as e:
+                    result["failed"] += 1
+                    result["errors"].append({"line": line_no, "error": str(e)})
+                    continue
+                if len(batch) >= self.batch_size:
+                    submit(batch)
+                    batch = []
+            if batch:
+                submit(batch)
+            while pending:
+                collect(*pending.popleft())
+
+        result["errors"].sort(key=lambda e: e["line"])
+        return result
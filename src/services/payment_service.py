@@ -1,15 +1,40 @@
 # src/services/payment_service.py
-from typing import Dict
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from src.dao.booking_dao import BookingDAO
 from src.dao.payment_dao import PaymentDAO
+from src.dao.rollup_dao import RollupDAO, booking_delta
+
+# Per-booking outcomes of process_payments() / refund_payments()
+OUTCOME_PAID = "paid"
+OUTCOME_REFUNDED = "refunded"
+OUTCOME_ALREADY_PAID = "already_paid"
+OUTCOME_ALREADY_REFUNDED = "already_refunded"
+OUTCOME_NOT_FOUND = "not_found"
+OUTCOME_DUPLICATE = "duplicate"    # booking listed earlier in the same batch
+OUTCOME_CONFLICT = "conflict"      # status changed between the read and the update
+OUTCOME_INVALID = "invalid"        # bad booking id, missing method or unpayable status
 
 class PaymentError(Exception):
     """Custom exception for payment-related errors."""
     pass
 
 class PaymentService:
-    def __init__(self, dao: PaymentDAO = None):
+    def __init__(self, dao: PaymentDAO = None, booking_dao: BookingDAO = None, rollups: RollupDAO = None):
         # Allow dependency injection, default to PaymentDAO
         self.dao = dao or PaymentDAO()
+        # Paid revenue is added to the daily rollup of the booking's event
+        self.booking_dao = booking_dao or BookingDAO(self.dao.client)
+        self.rollups = rollups or RollupDAO(self.dao.client)
+
+    def _record_revenue(self, payments: List[Dict], sign: int) -> None:
+        payments = [p for p in payments if p]
+        if not payments or not self.rollups.available:
+            return
+        bookings = self.booking_dao.get_bookings_by_ids((p["booking_id"] for p in payments),
+                                                        ["event_id", "created_at"])
+        self.rollups.record(booking_delta(bookings[p["booking_id"]], revenue=sign * p["amount"])
+                            for p in payments if p["booking_id"] in bookings)
 
     def create_pending_payment(self, booking_id: int, amount: float) -> Dict:
         """
@@ -17,24 +42,145 @@ class PaymentService:
         """
         return self.dao.create_payment(booking_id, amount)
 
+    def create_pending_payments(self, rows: List[Dict]) -> List[Dict]:
+        """
+        Create pending payments for many bookings ({"booking_id", "amount"}) at once.
+        """
+        return self.dao.create_payments(rows)
+
     def process_payment(self, booking_id: int, method: str) -> Dict:
         """
         Mark a payment as PAID with a given method (Cash/Card/UPI).
         """
-        payment = self.dao.get_payment_by_booking(booking_id)
+        payment = self.dao.get_payment_by_booking(booking_id, ["status"])
         if not payment:
             raise PaymentError(f"No payment found for booking {booking_id}")
         if payment["status"] == "PAID":
             raise PaymentError("Payment is already completed")
-        return self.dao.mark_paid(booking_id, method)
+        if payment["status"] != "PENDING":
+            raise PaymentError(f"Payment is {payment['status']} and cannot be paid")
+        # Only while still PENDING, so concurrent calls pay (and count revenue) once
+        paid = self.dao.mark_paid(booking_id, method, status="PENDING")
+        if not paid:
+            raise PaymentError("Payment was changed concurrently, please retry")
+        self._record_revenue([paid], 1)
+        return paid
 
     def refund_payment(self, booking_id: int) -> Dict:
         """
         Mark a payment as REFUNDED for a cancelled booking.
         """
-        payment = self.dao.get_payment_by_booking(booking_id)
+        payment = self.dao.get_payment_by_booking(booking_id, ["status"])
         if not payment:
             raise PaymentError(f"No payment found for booking {booking_id}")
         if payment["status"] == "REFUNDED":
             raise PaymentError("Payment is already refunded")
-        return self.dao.refund_payment(booking_id)
+        refunded = self.dao.refund_payment(booking_id, status=payment["status"])
+        if not refunded:
+            raise PaymentError("Payment was changed concurrently, please retry")
+        if payment["status"] == "PAID":
+            self._record_revenue([refunded], -1)
+        return refunded
+
+    def refund_payments_for_bookings(self, booking_ids: Iterable[int]) -> List[Dict]:
+        """
+        Refund every not-yet-refunded payment of the given bookings in bulk.
+        """
+        if not self.rollups.available:
+            return self.dao.refund_payments_for_bookings(booking_ids)
+        # Paid ones first, so their amounts can be taken off the revenue rollups
+        booking_ids = list(booking_ids)
+        paid = self.dao.refund_payments_for_bookings(booking_ids, status="PAID")
+        self._record_revenue(paid, -1)
+        return paid + self.dao.refund_payments_for_bookings(booking_ids)
+
+    def process_payments(self, batch: Iterable[Dict]) -> List[Dict]:
+        """
+        Mark many PENDING payments ({"booking_id", "method"}) as PAID: a chunked
+        read of their statuses, then one update per method and chunk. Updates only
+        match PENDING rows, so a payment settled or refunded by someone else in
+        between is reported as a conflict, not paid twice; refunded payments are
+        reported as already_refunded and never paid.
+        Returns {"booking_id", "outcome", "payment"} per item, in batch order.
+        """
+        items = [(item.get("booking_id"), str(item.get("method") or "").strip()) for item in batch]
+        results, current = self._prepare([booking_id for booking_id, _ in items], "PAID", OUTCOME_ALREADY_PAID)
+        groups: Dict[str, List[int]] = defaultdict(list)
+        for i, (_, method) in enumerate(items):
+            if results[i]["outcome"] is None:
+                payment = current[results[i]["booking_id"]]
+                if payment["status"] == "REFUNDED":
+                    results[i]["outcome"], results[i]["payment"] = OUTCOME_ALREADY_REFUNDED, payment
+                elif payment["status"] != "PENDING" or not method:
+                    results[i]["outcome"] = OUTCOME_INVALID
+                else:
+                    groups[method].append(payment["booking_id"])
+        paid: Dict[int, Dict] = {}
+        for method, booking_ids in groups.items():
+            for row in self.dao.mark_paid_many(booking_ids, method, "PENDING"):
+                paid[row["booking_id"]] = row
+        self._record_revenue(list(paid.values()), 1)
+        return self._finish(results, current, paid, OUTCOME_PAID)
+
+    def refund_payments(self, booking_ids: Iterable[Any]) -> List[Dict]:
+        """
+        Mark the payments of many bookings as REFUNDED, grouped by current status
+        like process_payments(); refunded PAID amounts leave the revenue rollups.
+        Returns {"booking_id", "outcome", "payment"} per booking, in order.
+        """
+        results, current = self._prepare(list(booking_ids), "REFUNDED", OUTCOME_ALREADY_REFUNDED)
+        groups: Dict[str, List[int]] = defaultdict(list)
+        for result in results:
+            if result["outcome"] is None:
+                groups[current[result["booking_id"]]["status"]].append(result["booking_id"])
+        refunded: Dict[int, Dict] = {}
+        for status, ids in groups.items():
+            rows = self.dao.refund_payments_for_bookings(ids, status=status)
+            if status == "PAID":
+                self._record_revenue(rows, -1)
+            refunded.update((row["booking_id"], row) for row in rows)
+        return self._finish(results, current, refunded, OUTCOME_REFUNDED)
+
+    def _prepare(self, booking_ids: List[Any], done_status: str,
+                 done_outcome: str) -> Tuple[List[Dict], Dict[int, Dict]]:
+        """
+        One result per booking id, with the outcome already set for invalid,
+        duplicate, missing and already-`done_status` payments (None otherwise),
+        plus the current payments read in chunks.
+        """
+        results: List[Dict] = []
+        seen = set()
+        for raw in booking_ids:
+            try:
+                booking_id: Optional[int] = int(raw)
+                outcome = OUTCOME_DUPLICATE if booking_id in seen else None
+            except (TypeError, ValueError):
+                booking_id, outcome = raw, OUTCOME_INVALID
+            if outcome is None:
+                seen.add(booking_id)
+            results.append({"booking_id": booking_id, "outcome": outcome, "payment": None})
+        current = self.dao.get_payments_by_bookings(seen, ["booking_id", "amount", "method", "status"])
+        for result in results:
+            if result["outcome"] is None:
+                payment = current.get(result["booking_id"])
+                if payment is None:
+                    result["outcome"] = OUTCOME_NOT_FOUND
+                elif payment["status"] == done_status:
+                    result["outcome"], result["payment"] = done_outcome, payment
+        return results, current
+
+    @staticmethod
+    def _finish(results: List[Dict], current: Dict[int, Dict], changed: Dict[int, Dict],
+                done_outcome: str) -> List[Dict]:
+        for result in results:
+            if result["outcome"] is None:
+                row = changed.get(result["booking_id"])
+                result["outcome"] = done_outcome if row else OUTCOME_CONFLICT
+                result["payment"] = row or current[result["booking_id"]]
+        return results
+
+    def delete_payments_for_bookings(self, booking_ids: Iterable[int]) -> List[Dict]:
+        """
+        Remove the payments of the given bookings in bulk.
+        """
+        return self.dao.delete_payments_for_bookings(booking_ids)
@@ -0,0 +1,177 @@
+# src/services/report_cache.py
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Sequence, Set, Tuple
+from src.dao.table_versions import TableVersions, TABLE_VERSIONS
+
+DEFAULT_TTL = 300.0
+DEFAULT_MAX_ENTRIES = 256
+# Saved table counters in the disk tier, so entries stay comparable across restarts
+VERSIONS_FILE = "versions.json"
+
+_MISSING = object()
+
+def _write_json(path: str, data: Any) -> None:
+    """
+    Write atomically: readers see the old file or the new one, never half of it.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+class ReportCache:
+    """
+    Report results keyed by report name and parameters, each tagged with the
+    versions (src/dao/table_versions.py) of the tables the report reads.
+    An entry is served while those versions are unchanged and it is younger
+    than `ttl`, so repeated views cost no database calls until a DAO writes
+    one of the tables; the TTL bounds staleness from writers in other processes.
+    With `directory`, entries (JSON) and the counters are also kept on disk
+    and survive restarts. The counter file is rewritten by every write to a
+    table some disk entry reads, before the write returns, so even after a
+    crash a restarted process never sees the counters an entry was stored
+    under again; writes to other tables do not touch the file.
+    """
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 directory: str | None = None, versions: TableVersions = TABLE_VERSIONS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.directory = directory
+        self.versions = versions
+        self._entries: "OrderedDict[str, Tuple[List[int], float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        # Tables read by entries on disk, and their counters as last saved
+        self._persisted: Set[str] = set()
+        self._saved: Dict[str, int] = {}
+        self._save_lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            try:
+                with open(os.path.join(directory, VERSIONS_FILE), encoding="utf-8") as f:
+                    saved = json.load(f)
+                versions.restore(saved)
+                self._persisted, self._saved = set(saved), dict(saved)
+            except (OSError, ValueError):
+                pass
+            versions.listen(self._on_bump)
+
+    @staticmethod
+    def _key(name: str, params: Dict[str, Any]) -> str:
+        return json.dumps([name, params], sort_keys=True, default=str)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + ".json")
+
+    def _outdated(self, tables: Sequence[str], versions: Dict[str, int]) -> bool:
+        return any(versions.get(t, 0) != self._saved.get(t) for t in tables)
+
+    def _on_bump(self, versions: Dict[str, int]) -> None:
+        # Called by every DAO write, on the writer's thread
+        if self._outdated(self._persisted, versions):
+            self._save_versions()
+
+    def _save_versions(self, tables: Sequence[str] = ()) -> None:
+        """
+        Write the counters of every persisted table (and `tables`, which join them).
+        """
+        with self._save_lock:
+            self._persisted.update(tables)
+            current = self.versions.all()
+            saved = {t: current.get(t, 0) for t in self._persisted | set(current)}
+            try:
+                _write_json(os.path.join(self.directory, VERSIONS_FILE), saved)
+                self._saved = saved
+            except OSError as e:
+                print("Report cache warning:", e)
+
+    def _fresh(self, entry_versions: List[int], stored_at: float, versions: List[int]) -> bool:
+        return entry_versions == versions and time.time() - stored_at < self.ttl
+
+    def _load(self, key: str, versions: List[int]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._fresh(entry[0], entry[1], versions):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(entry[2])
+                del self._entries[key]
+        if self.directory:
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    saved = json.load(f)
+                if saved["key"] == key and self._fresh(saved["versions"], saved["stored_at"], versions):
+                    self._remember(key, versions, saved["stored_at"], saved["value"])
+                    with self._lock:
+                        self.disk_hits += 1
+                    return saved["value"]
+            except (OSError, ValueError, KeyError):
+                pass
+        with self._lock:
+            self.misses += 1
+        return _MISSING
+
+    def _remember(self, key: str, versions: List[int], stored_at: float, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (versions, stored_at, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, name: str, params: Dict[str, Any], tables: Sequence[str],
+                       compute: Callable[[], Any]) -> Any:
+        """
+        The cached result of report `name` with `params`, or compute() stored
+        under the versions of `tables` as they were before it ran (a write
+        racing with the computation then invalidates it).
+        """
+        key = self._key(name, params)
+        versions = list(self.versions.get(tables))
+        value = self._load(key, versions)
+        if value is not _MISSING:
+            return value
+        value = compute()
+        stored_at = time.time()
+        self._remember(key, versions, stored_at, value)
+        if self.directory:
+            # The counters the entry is stored under go to disk before the entry does
+            if not self._persisted.issuperset(tables) or self._outdated(tables, self.versions.all()):
+                self._save_versions(tables)
+            try:
+                _write_json(self._path(key), {"key": key, "versions": versions, "stored_at": stored_at, "value": value})
+            except (OSError, TypeError, ValueError) as e:
+                print("Report cache warning:", e)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json") and name != VERSIONS_FILE:
+                    os.unlink(os.path.join(self.directory, name))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / total if total else 0.0,
+            }
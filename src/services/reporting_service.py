@@ -1,77 +1,149 @@
 # src/services/reporting_service.py
-from typing import List, Dict
+import time
+from typing import Any, Callable, List, Dict, Sequence
 from src.dao.booking_dao import BookingDAO
 from src.dao.event_dao import EventDAO
 from src.dao.customer_dao import CustomerDAO
-from datetime import datetime, timedelta
+from src.dao.report_dao import ReportDAO
+from src.dao.rollup_dao import RollupDAO
+from src.dao.table_versions import TABLE_VERSIONS
+from src.services.report_cache import ReportCache
+from datetime import date, datetime, timedelta
+
+# Seconds a columnar snapshot serves reports before it is reloaded
+SNAPSHOT_TTL_SECONDS = 300.0
+# Tables copied into the columnar snapshot; a write to any of them reloads it
+SNAPSHOT_TABLES = ("bookings", "events", "customers", "payments")
+# Tables behind the revenue reports (bookings and payments, or their rollups)
+REVENUE_TABLES = ("bookings", "events", "payments", "event_daily_stats")
 
 # Custom exception
 class ReportingError(Exception):
     pass
 
 class ReportingService:
-    def __init__(self, booking_dao: BookingDAO, event_dao: EventDAO, customer_dao: CustomerDAO):
+    def __init__(self, booking_dao: BookingDAO, event_dao: EventDAO, customer_dao: CustomerDAO,
+                 report_dao: ReportDAO = None, rollups: RollupDAO = None,
+                 columnar: bool = False, snapshot_ttl: float = SNAPSHOT_TTL_SECONDS,
+                 cache: ReportCache = None):
         self.booking_dao = booking_dao
         self.event_dao = event_dao
         self.customer_dao = customer_dao
+        # Aggregations run in the database (or a paged fallback), never over a capped list
+        self.report_dao = report_dao or ReportDAO(booking_dao.client)
+        # Daily per-event buckets answer date-range revenue without touching bookings
+        self.rollups = rollups or RollupDAO(self.report_dao.client)
+        # Columnar mode answers every report from an in-memory NumPy snapshot (src/services/analytics.py)
+        self.columnar = columnar
+        self.snapshot_ttl = snapshot_ttl
+        self._snapshot = None
+        self._snapshot_versions = None
+        # Optional result cache: repeated reports are free until their tables are written
+        self.cache = cache
 
-    def top_selling_events(self, limit: int = 5) -> List[Dict]:
+    def snapshot(self, refresh: bool = False):
+        """
+        The columnar snapshot of bookings, events, customers and payments,
+        loaded on first use and reloaded after a write to those tables or once
+        older than `snapshot_ttl`. Needs numpy.
+        """
+        versions = TABLE_VERSIONS.get(SNAPSHOT_TABLES)
+        if refresh or self._snapshot is None or versions != self._snapshot_versions \
+                or time.time() - self._snapshot.loaded_at >= self.snapshot_ttl:
+            from src.services.analytics import SnapshotLoader  # imports numpy lazily
+            self._snapshot = SnapshotLoader(self.booking_dao, self.event_dao, self.customer_dao).load()
+            self._snapshot_versions = versions
+        return self._snapshot
+
+    def _aggregates(self):
+        # Both sources answer event_seats() and customer_bookings() with the same rows
+        return self.snapshot() if self.columnar else self.report_dao
+
+    def _report(self, name: str, tables: Sequence[str], compute: Callable[[], Any], **params: Any) -> Any:
+        """
+        Run a report through the result cache (when configured), reporting failures as ReportingError.
+        """
         try:
-            bookings = self.booking_dao.list_bookings()
-            event_count = {}
-            for b in bookings:
-                eid = b["event_id"]
-                event_count[eid] = event_count.get(eid, 0) + b["seats"]
-
-            top_eids = sorted(event_count, key=event_count.get, reverse=True)[:limit]
-            top_events = []
-            for eid in top_eids:
-                event = self.event_dao.get_event_by_id(eid)
-                top_events.append({"event": event["title"], "seats_sold": event_count[eid]})
-            return top_events
+            if self.cache is None:
+                return compute()
+            return self.cache.get_or_compute(name, {"columnar": self.columnar, **params}, tables, compute)
+        except ReportingError:
+            raise
         except Exception as e:
             raise ReportingError(str(e))
 
+    def top_selling_events(self, limit: int = 5) -> List[Dict]:
+        def compute():
+            rows = self._aggregates().event_seats(limit)
+            return [{"event": r["title"], "seats_sold": r["seats_sold"]} for r in rows]
+        return self._report("top_selling_events", ("bookings", "events"), compute, limit=limit)
+
     def total_revenue_last_month(self) -> float:
-        try:
-            bookings = self.booking_dao.list_bookings()
-            last_month = datetime.now() - timedelta(days=30)
-            revenue = 0.0
-            for b in bookings:
-                if datetime.strptime(b["created_at"], "%Y-%m-%d") >= last_month:
-                    event = self.event_dao.get_event_by_id(b["event_id"])
-                    revenue += b["seats"] * event["price"]
+        last_month = datetime.now() - timedelta(days=30)
+
+        def compute():
+            if self.columnar:
+                return self.snapshot().revenue_between(last_month.date(), date.today())
+            revenue = self.rollups.revenue_between(last_month.date(), date.today())
+            if revenue is None:
+                # Rollups not deployed: sum the PAID payments of those bookings instead
+                return self.report_dao.paid_revenue_since(last_month.date())
             return revenue
-        except Exception as e:
-            raise ReportingError(str(e))
+        return self._report("total_revenue_last_month", REVENUE_TABLES, compute, since=last_month.date())
 
-    def total_bookings_per_customer(self) -> List[Dict]:
+    def revenue_between(self, start: date, end: date) -> float:
+        """
+        Paid revenue (net of refunds) of bookings made from `start` to `end`, inclusive.
+        """
+        if start > end:
+            raise ReportingError("Start date must not be after end date")
+
+        def compute():
+            if self.columnar:
+                return self.snapshot().revenue_between(start, end)
+            revenue = self.rollups.revenue_between(start, end)
+            if revenue is None:
+                raise ReportingError("Sales rollups are not deployed (apply sql/rollups.sql)")
+            return revenue
+        return self._report("revenue_between", REVENUE_TABLES, compute, start=start, end=end)
+
+    def revenue_by_event(self, limit: int = 10) -> List[Dict]:
+        """
+        Best-earning events with seats sold and cancellations, from the columnar snapshot.
+        """
+        def compute():
+            rows = self.snapshot().revenue_by_event(limit)
+            return [{"event": r["title"], "revenue": r["revenue"], "seats_sold": r["seats_sold"],
+                     "cancellations": r["cancellations"]} for r in rows]
+        return self._report("revenue_by_event", ("bookings", "events", "payments"), compute, limit=limit)
+
+    def daily_sales(self, start: date, end: date) -> List[Dict]:
+        """
+        Bookings, seats, cancellations and paid revenue per day, from the columnar snapshot.
+        """
+        if start > end:
+            raise ReportingError("Start date must not be after end date")
+        return self._report("daily_sales", ("bookings", "payments"),
+                            lambda: self.snapshot().daily_sales(start, end), start=start, end=end)
+
+    def rebuild_rollups(self) -> int:
+        """
+        Recompute the daily sales rollups from bookings and payments; returns the bucket count.
+        """
         try:
-            bookings = self.booking_dao.list_bookings()
-            customer_count = {}
-            for b in bookings:
-                cid = b["cust_id"]
-                customer_count[cid] = customer_count.get(cid, 0) + 1
-            result = []
-            for cid, count in customer_count.items():
-                customer = self.customer_dao.get_customer_by_id(cid)
-                result.append({"customer": customer["name"], "total_bookings": count})
-            return result
+            return self.rollups.rebuild()
         except Exception as e:
             raise ReportingError(str(e))
 
+    def total_bookings_per_customer(self) -> List[Dict]:
+        def compute():
+            rows = self._aggregates().customer_bookings()
+            return [{"customer": r["name"], "total_bookings": r["bookings"]} for r in rows]
+        return self._report("total_bookings_per_customer", ("bookings", "customers"), compute)
+
     def customers_with_multiple_bookings(self, min_bookings: int = 2) -> List[Dict]:
-        try:
-            bookings = self.booking_dao.list_bookings()
-            customer_count = {}
-            for b in bookings:
-                cid = b["cust_id"]
-                customer_count[cid] = customer_count.get(cid, 0) + 1
-            result = []
-            for cid, count in customer_count.items():
-                if count > min_bookings:
-                    customer = self.customer_dao.get_customer_by_id(cid)
-                    result.append({"customer": customer["name"], "bookings": count})
-            return result
-        except Exception as e:
-            raise ReportingError(str(e))
+        def compute():
+            rows = self._aggregates().customer_bookings(min_bookings)
+            return [{"customer": r["name"], "bookings": r["bookings"]} for r in rows]
+        return self._report("customers_with_multiple_bookings", ("bookings", "customers"), compute,
+                            min_bookings=min_bookings)
@@ -0,0 +1,103 @@
+# src/services/search_index.py
+import bisect
+import re
+import threading
+from itertools import islice
+from typing import Callable, Dict, Hashable, Iterable, List, Sequence, Set
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+def _tokens(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+class PrefixIndex:
+    """
+    In-memory inverted index over a few text columns, for type-ahead search.
+    Every word of the indexed columns maps to the ids containing it; words are
+    also kept sorted, so each query word is answered by a bisect over the words
+    it prefixes. A query matches rows containing a word starting with each of
+    its words ("jaz pu" finds "Jazz Night, Pune").
+    """
+    def __init__(self, key: str, fields: Sequence[str], label: Callable[[Dict], str] | None = None):
+        self.key = key
+        self.fields = list(fields)
+        self._label = label or (lambda row: " ".join(str(row.get(f) or "") for f in self.fields))
+        self._rows: Dict[Hashable, Dict] = {}
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._words: List[str] = []  # sorted keys of _postings
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, rows: Iterable[Dict], key: str, fields: Sequence[str],
+              label: Callable[[Dict], str] | None = None) -> "PrefixIndex":
+        index = cls(key, fields, label)
+        for row in rows:
+            index._add(row)
+        index._words = sorted(index._postings)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _row_words(self, row: Dict) -> Set[str]:
+        return {w for f in self.fields for w in _tokens(str(row.get(f) or ""))}
+
+    def _add(self, row: Dict) -> None:
+        rid = row[self.key]
+        self._rows[rid] = row
+        for word in self._row_words(row):
+            self._postings.setdefault(word, set()).add(rid)
+
+    def add(self, row: Dict) -> None:
+        """
+        Index a new row, or re-index a changed one.
+        """
+        with self._lock:
+            self._remove(row[self.key])
+            self._add(row)
+            self._words = sorted(self._postings)
+
+    def _remove(self, rid: Hashable) -> None:
+        row = self._rows.pop(rid, None)
+        if row is None:
+            return
+        for word in self._row_words(row):
+            ids = self._postings.get(word)
+            if ids is not None:
+                ids.discard(rid)
+                if not ids:
+                    del self._postings[word]
+
+    def remove(self, rid: Hashable) -> None:
+        with self._lock:
+            self._remove(rid)
+            self._words = sorted(self._postings)
+
+    def _prefixed(self, prefix: str) -> Set[Hashable]:
+        ids: Set[Hashable] = set()
+        start = bisect.bisect_left(self._words, prefix)
+        for word in self._words[start:]:
+            if not word.startswith(prefix):
+                break
+            ids |= self._postings[word]
+        return ids
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """
+        Rows matching every word of `query` by prefix, in key order; the first rows for an empty query.
+        """
+        with self._lock:
+            words = _tokens(query)
+            if not words:
+                return list(islice(self._rows.values(), limit))
+            # Rarest word first keeps the intersection small
+            matches = sorted((self._prefixed(w) for w in words), key=len)
+            ids = set.intersection(*matches)
+            return [self._rows[rid] for rid in sorted(ids)[:limit]]
+
+    def get(self, rid: Hashable) -> Dict | None:
+        return self._rows.get(rid)
+
+    def label(self, rid: Hashable) -> str:
+        row = self._rows.get(rid)
+        return self._label(row) if row is not None else str(rid)
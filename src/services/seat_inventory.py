@@ -0,0 +1,91 @@
+# src/services/seat_inventory.py
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from src.dao.event_dao import EventDAO
+
+# Seconds a cached availability figure is trusted before re-reading the event
+REFRESH_INTERVAL_SECONDS = 5.0
+# Number of lock stripes; events hash onto stripes so different events rarely contend
+LOCK_STRIPES = 64
+
+class SeatInventory:
+    """
+    In-process cache of remaining seats per event.
+    The database stays the source of truth: the cache only rejects requests that
+    cannot fit, and is reconciled from rows returned by successful writes and
+    re-read from the database once an entry is older than the refresh interval.
+    """
+    def __init__(self, event_dao: EventDAO = None,
+                 refresh_interval: float = REFRESH_INTERVAL_SECONDS, stripes: int = LOCK_STRIPES):
+        self.event_dao = event_dao or EventDAO()
+        self.refresh_interval = refresh_interval
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._seats: Dict[int, Tuple[int, float]] = {}  # event_id -> (seats left, loaded at)
+
+    def _lock(self, event_id: int) -> threading.Lock:
+        return self._locks[hash(event_id) % len(self._locks)]
+
+    def _fresh(self, event_id: int) -> Optional[int]:
+        entry = self._seats.get(event_id)
+        if entry and time.monotonic() - entry[1] < self.refresh_interval:
+            return entry[0]
+        return None
+
+    def seats_left(self, event_id: int) -> Optional[int]:
+        """
+        Remaining seats for an event (None if the event does not exist).
+        Served from memory while fresh; otherwise one database read.
+        """
+        seats = self._fresh(event_id)
+        if seats is not None:
+            return seats
+        with self._lock(event_id):
+            # Another thread may have refreshed it while we waited
+            seats = self._fresh(event_id)
+            if seats is not None:
+                return seats
+            event = self.event_dao.get_event_by_id(event_id, ["event_id", "capacity"])
+            if not event:
+                self._seats.pop(event_id, None)
+                return None
+            self._seats[event_id] = (event["capacity"], time.monotonic())
+            return event["capacity"]
+
+    def can_fit(self, event_id: int, seats: int) -> bool:
+        """
+        False only when the cache knows the request cannot fit; True means
+        "worth trying" and the atomic database write decides.
+        """
+        known = self._fresh(event_id)
+        return known is None or seats <= known
+
+    def reconcile(self, event: Dict) -> None:
+        """
+        Record the authoritative capacity from an event row returned by a write.
+        """
+        with self._lock(event["event_id"]):
+            self._seats[event["event_id"]] = (event["capacity"], time.monotonic())
+
+    def adjust(self, event_id: int, delta: int) -> None:
+        """
+        Apply a committed change we have no event row for; keeps the entry's age.
+        """
+        with self._lock(event_id):
+            entry = self._seats.get(event_id)
+            if entry:
+                self._seats[event_id] = (max(entry[0] + delta, 0), entry[1])
+
+    def record_shortage(self, event_id: int, seats: int) -> None:
+        """
+        The database rejected `seats` seats: at most seats - 1 are left (0 for a
+        sold-out event), so smaller requests are tried but this one is not again.
+        """
+        with self._lock(event_id):
+            entry = self._seats.get(event_id)
+            known = entry[0] if entry else seats - 1
+            self._seats[event_id] = (max(min(known, seats - 1), 0), time.monotonic())
+
+    def invalidate(self, event_id: int) -> None:
+        with self._lock(event_id):
+            self._seats.pop(event_id, None)
@@ -0,0 +1,37 @@
+# src/storage/backend.py
+from typing import Any, Dict, List, Protocol
+
+class StorageResponse(Protocol):
+    data: List[Dict]
+
+class StorageQuery(Protocol):
+    """
+    The subset of the PostgREST query builder the DAOs use. Filters and
+    modifiers return the builder so calls chain; execute() runs the request.
+    """
+    def select(self, columns: str = "*", **kwargs: Any) -> "StorageQuery": ...
+    def insert(self, rows: Dict | List[Dict], **kwargs: Any) -> "StorageQuery": ...
+    def upsert(self, rows: Dict | List[Dict], **kwargs: Any) -> "StorageQuery": ...
+    def update(self, fields: Dict, **kwargs: Any) -> "StorageQuery": ...
+    def delete(self, **kwargs: Any) -> "StorageQuery": ...
+    def eq(self, column: str, value: Any) -> "StorageQuery": ...
+    def neq(self, column: str, value: Any) -> "StorageQuery": ...
+    def gt(self, column: str, value: Any) -> "StorageQuery": ...
+    def gte(self, column: str, value: Any) -> "StorageQuery": ...
+    def lt(self, column: str, value: Any) -> "StorageQuery": ...
+    def lte(self, column: str, value: Any) -> "StorageQuery": ...
+    def in_(self, column: str, values: List[Any]) -> "StorageQuery": ...
+    def ilike(self, column: str, pattern: str) -> "StorageQuery": ...
+    def order(self, column: str, desc: bool = False, **kwargs: Any) -> "StorageQuery": ...
+    def limit(self, size: int, **kwargs: Any) -> "StorageQuery": ...
+    def execute(self) -> StorageResponse: ...
+
+class StorageClient(Protocol):
+    """
+    What the DAOs need from a backend: the Supabase client satisfies it, and so
+    does SQLiteClient (src/storage/sqlite_client.py). Backends without the SQL
+    functions in sql/ raise NotImplementedError from rpc(), and the DAOs fall
+    back to their Python implementations.
+    """
+    def table(self, name: str) -> StorageQuery: ...
+    def rpc(self, fn: str, params: Dict | None = None) -> Any: ...
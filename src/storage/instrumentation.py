@@ -0,0 +1,204 @@
+# src/storage/instrumentation.py
+import bisect
+import json
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WRITE_OPS = ("insert", "upsert", "update", "delete")
+
+def _size(value: Any) -> int:
+    if value is None:
+        return 0
+    return len(json.dumps(value, default=str, separators=(",", ":")))
+
+class _OpStats:
+    __slots__ = ("count", "errors", "seconds", "rows", "sent_bytes", "received_bytes", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.sent_bytes = 0
+        self.received_bytes = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # last one is +Inf
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound (seconds) of the bucket holding the q-th request; inf past the last bound.
+        """
+        target, seen = q * self.count, 0
+        for bound, n in zip((*LATENCY_BUCKETS, float("inf")), self.buckets):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+class QueryMetrics:
+    """
+    Per (table, operation) request counters and latency histograms.
+    Disabled metrics cost one attribute check per query; see InstrumentedClient.
+    """
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._stats: Dict[Tuple[str, str], _OpStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, table: str, op: str, seconds: float, rows: int = 0,
+               sent_bytes: int = 0, received_bytes: int = 0, error: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.get((table, op))
+            if stats is None:
+                stats = self._stats[(table, op)] = _OpStats()
+            stats.count += 1
+            stats.errors += error
+            stats.seconds += seconds
+            stats.rows += rows
+            stats.sent_bytes += sent_bytes
+            stats.received_bytes += received_bytes
+            stats.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+    def total_requests(self) -> int:
+        with self._lock:
+            return sum(s.count for s in self._stats.values())
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self) -> List[Dict]:
+        """
+        One summary row per (table, op), busiest first; latencies in milliseconds.
+        """
+        with self._lock:
+            items = [(key, stats) for key, stats in self._stats.items()]
+            rows = [{
+                "table": table,
+                "op": op,
+                "requests": s.count,
+                "errors": s.errors,
+                "avg_ms": round(1000 * s.seconds / s.count, 3),
+                "p50_ms": round(1000 * s.quantile(0.5), 3),
+                "p95_ms": round(1000 * s.quantile(0.95), 3),
+                "total_ms": round(1000 * s.seconds, 3),
+                "rows": s.rows,
+                "sent_bytes": s.sent_bytes,
+                "received_bytes": s.received_bytes,
+            } for (table, op), s in items]
+        return sorted(rows, key=lambda r: r["requests"], reverse=True)
+
+    def prometheus(self) -> str:
+        """
+        The metrics in Prometheus text exposition format.
+        """
+        with self._lock:
+            items = sorted(self._stats.items())
+            lines = [
+                "# HELP db_request_duration_seconds Wall time of storage requests.",
+                "# TYPE db_request_duration_seconds histogram",
+            ]
+            for (table, op), s in items:
+                labels = f'table="{table}",op="{op}"'
+                cumulative = 0
+                for bound, n in zip(LATENCY_BUCKETS, s.buckets):
+                    cumulative += n
+                    lines.append(f'db_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'db_request_duration_seconds_bucket{{{labels},le="+Inf"}} {s.count}')
+                lines.append(f"db_request_duration_seconds_sum{{{labels}}} {s.seconds:.6f}")
+                lines.append(f"db_request_duration_seconds_count{{{labels}}} {s.count}")
+            for name, help_text, attr in (
+                    ("db_request_errors_total", "Storage requests that raised.", "errors"),
+                    ("db_request_rows_total", "Rows returned by storage requests.", "rows"),
+                    ("db_request_sent_bytes_total", "JSON bytes sent (write payloads, RPC params).", "sent_bytes"),
+                    ("db_request_received_bytes_total", "JSON bytes of returned rows.", "received_bytes")):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for (table, op), s in items:
+                    lines.append(f'{name}{{table="{table}",op="{op}"}} {getattr(s, attr)}')
+        return "\n".join(lines) + "\n"
+
+class _InstrumentedQuery:
+    """
+    Forwards builder calls to the wrapped query and times execute().
+    """
+    def __init__(self, metrics: QueryMetrics, table: str, query: Any, op: str = "select", payload: Any = None):
+        self._metrics = metrics
+        self._table = table
+        self._query = query
+        self._op = op
+        self._payload = payload
+
+    def __getattr__(self, name: str):
+        method = getattr(self._query, name)
+
+        def chain(*args, **kwargs):
+            if name in WRITE_OPS:
+                self._op = name
+                self._payload = args[0] if args else None
+            self._query = method(*args, **kwargs)
+            return self
+        return chain
+
+    def _record(self, start: float, resp: Any, error: bool) -> None:
+        data = getattr(resp, "data", None)
+        self._metrics.record(self._table, self._op, time.perf_counter() - start,
+                             rows=len(data) if isinstance(data, list) else int(data is not None),
+                             sent_bytes=_size(self._payload), received_bytes=_size(data), error=error)
+
+    def execute(self) -> Any:
+        start = time.perf_counter()
+        try:
+            resp = self._query.execute()
+        except Exception:
+            self._record(start, None, True)
+            raise
+        self._record(start, resp, False)
+        return resp
+
+class _InstrumentedAsyncQuery(_InstrumentedQuery):
+    async def execute(self) -> Any:
+        start = time.perf_counter()
+        try:
+            resp = await self._query.execute()
+        except Exception:
+            self._record(start, None, True)
+            raise
+        self._record(start, resp, False)
+        return resp
+
+class InstrumentedClient:
+    """
+    Wraps a storage client (Supabase or local) so every request is recorded
+    in `metrics`. When metrics are disabled the wrapped client's own query
+    builders are returned untouched.
+    """
+    _query_class = _InstrumentedQuery
+
+    def __init__(self, client: Any, metrics: QueryMetrics):
+        self._client = client
+        self.metrics = metrics
+
+    def table(self, name: str) -> Any:
+        query = self._client.table(name)
+        if not self.metrics.enabled:
+            return query
+        return self._query_class(self.metrics, name, query)
+
+    def rpc(self, fn: str, params: Dict | None = None, *args, **kwargs) -> Any:
+        query = self._client.rpc(fn, params, *args, **kwargs)
+        if not self.metrics.enabled:
+            return query
+        return self._query_class(self.metrics, fn, query, "rpc", params)
+
+    def __getattr__(self, name: str) -> Any:
+        # auth, storage, realtime, ... pass straight through
+        return getattr(self._client, name)
+
+class AsyncInstrumentedClient(InstrumentedClient):
+    _query_class = _InstrumentedAsyncQuery
+
+# Process-wide metrics shared by every client handed out by src.config
+METRICS = QueryMetrics()
@@ -0,0 +1,313 @@
+# src/storage/sqlite_client.py
+import asyncio
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Tuple
+from postgrest.exceptions import APIError
+
+SCHEMA = """
+create table if not exists customers (
+    cust_id integer primary key autoincrement,
+    name text not null,
+    email text,
+    phone text,
+    city text,
+    created_at text not null default (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+create table if not exists events (
+    event_id integer primary key autoincrement,
+    title text not null,
+    date text,
+    location text,
+    capacity integer not null default 0,
+    price real not null default 0,
+    created_at text not null default (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+create table if not exists bookings (
+    booking_id integer primary key autoincrement,
+    cust_id integer not null references customers (cust_id),
+    event_id integer not null references events (event_id),
+    seats integer not null,
+    status text not null default 'BOOKED',
+    created_at text not null default (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+create table if not exists payments (
+    payment_id integer primary key autoincrement,
+    booking_id integer not null references bookings (booking_id),
+    amount real not null,
+    method text,
+    status text not null default 'PENDING',
+    created_at text not null default (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+create table if not exists event_daily_stats (
+    id integer primary key autoincrement,
+    day text not null,
+    event_id integer not null,
+    bookings integer not null default 0,
+    seats_booked integer not null default 0,
+    cancellations integer not null default 0,
+    seats_cancelled integer not null default 0,
+    revenue real not null default 0,
+    unique (day, event_id)
+);
+create index if not exists event_daily_stats_event_id_idx on event_daily_stats (event_id);
+create index if not exists bookings_event_id_idx on bookings (event_id);
+create index if not exists bookings_cust_id_idx on bookings (cust_id);
+create index if not exists bookings_created_at_idx on bookings (created_at);
+create index if not exists payments_booking_id_idx on payments (booking_id);
+create index if not exists customers_created_at_idx on customers (created_at);
+create index if not exists events_created_at_idx on events (created_at);
+create index if not exists payments_created_at_idx on payments (created_at);
+create unique index if not exists customers_email_key on customers (email);
+-- NOCASE indexes let SQLite's case-insensitive LIKE 'text%' use them
+create index if not exists customers_email_nocase_idx on customers (email collate nocase);
+create index if not exists customers_city_idx on customers (city collate nocase);
+create index if not exists events_title_idx on events (title collate nocase);
+create index if not exists events_date_idx on events (date);
+"""
+
+# Postgres error codes for the constraint violations SQLite reports
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+CONSTRAINT_VIOLATION = "23000"
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+def _quote(name: str) -> str:
+    name = name.strip()
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid column or table name: {name!r}")
+    return f'"{name}"'
+
+def _api_error(e: sqlite3.Error) -> APIError:
+    """
+    Report SQLite errors the way PostgREST does, so DAOs handle both backends alike.
+    """
+    message = str(e)
+    if isinstance(e, sqlite3.IntegrityError):
+        if "UNIQUE" in message:
+            code = UNIQUE_VIOLATION
+        elif "FOREIGN KEY" in message:
+            code = FOREIGN_KEY_VIOLATION
+        else:
+            code = CONSTRAINT_VIOLATION
+    else:
+        code = "SQLITE"
+    return APIError({"code": code, "message": message, "hint": None, "details": None})
+
+class SQLiteResponse:
+    def __init__(self, data: List[Dict]):
+        self.data = data
+        self.count = None
+
+class SQLiteQuery:
+    """
+    Builds one statement from the PostgREST-style calls (see StorageQuery).
+    Writes return the affected rows, like PostgREST's return=representation.
+    """
+    def __init__(self, client: "SQLiteClient", table: str):
+        self._client = client
+        self._table = _quote(table)
+        self._op = "select"
+        self._columns = "*"
+        self._payload: Any = None
+        self._on_conflict: str | None = None
+        self._where: List[str] = []
+        self._params: List[Any] = []
+        self._order: List[str] = []
+        self._limit: int | None = None
+
+    def select(self, columns: str = "*", **kwargs: Any) -> "SQLiteQuery":
+        self._columns = columns
+        return self
+
+    def insert(self, rows: Dict | List[Dict], **kwargs: Any) -> "SQLiteQuery":
+        self._op, self._payload = "insert", rows
+        return self
+
+    def upsert(self, rows: Dict | List[Dict], on_conflict: str = "", **kwargs: Any) -> "SQLiteQuery":
+        self._op, self._payload, self._on_conflict = "upsert", rows, on_conflict or None
+        return self
+
+    def update(self, fields: Dict, **kwargs: Any) -> "SQLiteQuery":
+        self._op, self._payload = "update", fields
+        return self
+
+    def delete(self, **kwargs: Any) -> "SQLiteQuery":
+        self._op = "delete"
+        return self
+
+    def _filter(self, column: str, op: str, value: Any) -> "SQLiteQuery":
+        self._where.append(f"{_quote(column)} {op} ?")
+        self._params.append(value)
+        return self
+
+    def eq(self, column: str, value: Any) -> "SQLiteQuery":
+        if value is None:
+            self._where.append(f"{_quote(column)} is null")
+            return self
+        return self._filter(column, "=", value)
+
+    def neq(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter(column, "<>", value)
+
+    def gt(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter(column, ">", value)
+
+    def gte(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter(column, ">=", value)
+
+    def lt(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter(column, "<", value)
+
+    def lte(self, column: str, value: Any) -> "SQLiteQuery":
+        return self._filter(column, "<=", value)
+
+    def in_(self, column: str, values: List[Any]) -> "SQLiteQuery":
+        values = list(values)
+        if not values:
+            self._where.append("0")
+            return self
+        self._where.append(f"{_quote(column)} in ({','.join('?' * len(values))})")
+        self._params.extend(values)
+        return self
+
+    def ilike(self, column: str, pattern: str) -> "SQLiteQuery":
+        # SQLite's LIKE is already case-insensitive for ASCII; PostgREST also accepts * as wildcard
+        return self._filter(column, "like", pattern.replace("*", "%"))
+
+    def order(self, column: str, desc: bool = False, **kwargs: Any) -> "SQLiteQuery":
+        self._order.append(f"{_quote(column)} {'desc' if desc else 'asc'}")
+        return self
+
+    def limit(self, size: int, **kwargs: Any) -> "SQLiteQuery":
+        self._limit = int(size)
+        return self
+
+    def _returning(self) -> str:
+        if self._columns.strip() == "*":
+            return "*"
+        return ",".join(_quote(c) for c in self._columns.split(","))
+
+    def _where_sql(self) -> str:
+        return f" where {' and '.join(self._where)}" if self._where else ""
+
+    def _statements(self) -> List[Tuple[str, List[Any]]]:
+        if self._op == "select":
+            sql = f"select {self._returning()} from {self._table}{self._where_sql()}"
+            if self._order:
+                sql += f" order by {', '.join(self._order)}"
+            if self._limit is not None:
+                sql += f" limit {self._limit}"
+            return [(sql, self._params)]
+        if self._op == "update":
+            assignments = ", ".join(f"{_quote(c)} = ?" for c in self._payload)
+            sql = f"update {self._table} set {assignments}{self._where_sql()} returning *"
+            return [(sql, [*self._payload.values(), *self._params])]
+        if self._op == "delete":
+            return [(f"delete from {self._table}{self._where_sql()} returning *", self._params)]
+
+        rows = self._payload if isinstance(self._payload, list) else [self._payload]
+        statements = []
+        for row in rows:
+            columns = [_quote(c) for c in row]
+            sql = f"insert into {self._table} ({', '.join(columns)}) values ({', '.join('?' * len(row))})"
+            if self._op == "upsert":
+                target = self._on_conflict or self._client.primary_key(self._table.strip('"'))
+                updates = ", ".join(f"{c} = excluded.{c}" for c in columns)
+                sql += f" on conflict ({', '.join(_quote(c) for c in target.split(','))}) do update set {updates}"
+            statements.append((sql + " returning *", list(row.values())))
+        return statements
+
+    def execute(self) -> SQLiteResponse:
+        return SQLiteResponse(self._client.run(self._statements()))
+
+class SQLiteClient:
+    """
+    Local storage backend with the same query-builder surface as the Supabase
+    client, on SQLite (a file, or ":memory:"). One connection is shared by all
+    threads and statements are serialized, which is what SQLite allows anyway.
+    """
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self._pks: Dict[str, str] = {}
+        with self._lock:
+            self._conn.execute("pragma foreign_keys = on")
+            if path != ":memory:":
+                self._conn.execute("pragma journal_mode = wal")
+            self._conn.executescript(SCHEMA)
+
+    def table(self, name: str) -> SQLiteQuery:
+        return SQLiteQuery(self, name)
+
+    def rpc(self, fn: str, params: Dict | None = None) -> Any:
+        # The plpgsql functions in sql/ do not exist here; DAOs use their fallbacks
+        raise NotImplementedError(fn)
+
+    def primary_key(self, table: str) -> str:
+        if table not in self._pks:
+            with self._lock:
+                info = self._conn.execute(f"pragma table_info({_quote(table)})").fetchall()
+            self._pks[table] = next(r["name"] for r in info if r["pk"])
+        return self._pks[table]
+
+    def run(self, statements: List[Tuple[str, List[Any]]]) -> List[Dict]:
+        """
+        Run the statements of one request in a single transaction; returns every row produced.
+        """
+        rows: List[Dict] = []
+        with self._lock:
+            try:
+                self._conn.execute("begin")
+                for sql, params in statements:
+                    rows.extend(dict(r) for r in self._conn.execute(sql, params).fetchall())
+                self._conn.execute("commit")
+            except sqlite3.Error as e:
+                self._conn.execute("rollback")
+                raise _api_error(e) from e
+        return rows
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class _AsyncQuery:
+    def __init__(self, query: Any):
+        self._query = query
+
+    def __getattr__(self, name: str):
+        method = getattr(self._query, name)
+
+        def chain(*args, **kwargs):
+            self._query = method(*args, **kwargs)
+            return self
+        return chain
+
+    async def execute(self) -> Any:
+        return await asyncio.to_thread(self._query.execute)
+
+class AsyncClientAdapter:
+    """
+    Gives a sync backend the async client surface the async DAOs use;
+    each request runs in a worker thread.
+    """
+    def __init__(self, client: Any):
+        self._client = client
+
+    def table(self, name: str) -> _AsyncQuery:
+        return _AsyncQuery(self._client.table(name))
+
+    def rpc(self, fn: str, params: Dict | None = None) -> _AsyncQuery:
+        # Deferred to execute(), where the async DAOs expect NotImplementedError
+        return _AsyncQuery(_DeferredRpc(self._client, fn, params))
+
+class _DeferredRpc:
+    def __init__(self, client: Any, fn: str, params: Dict | None):
+        self._client, self._fn, self._params = client, fn, params
+
+    def execute(self) -> Any:
+        return self._client.rpc(self._fn, self._params).execute()
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+
+# Tests never talk to the Supabase project configured in .env: anything that
+# falls back to the shared client gets the in-memory SQLite backend instead
+os.environ["DB_BACKEND"] = "memory"
@@ -0,0 +1,18 @@
+# tests/test_app.py
+from streamlit.testing.v1 import AppTest
+
+def test_new_event_shows_up_in_the_cached_view():
+    # conftest.py puts the app on the in-memory backend
+    at = AppTest.from_file("../app.py", default_timeout=30).run()
+    at.radio[0].set_value("View Events").run()
+    at.radio[0].set_value("Add Event").run()
+    at.text_input(key="event_title").input("Gala")
+    at.text_input(key="event_location").input("Pune")
+    at.number_input(key="event_capacity").set_value(5)
+    next(b for b in at.button if b.label == "Save Event").click().run()
+    assert [s.value for s in at.success] == ["Event 'Gala' added successfully!"]
+
+    # The write cleared the cached events page, so the view is re-read
+    at.radio[0].set_value("View Events").run()
+    assert not at.exception
+    assert "Gala" in list(at.dataframe[0].value["title"])
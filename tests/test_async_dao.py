@@ -0,0 +1,21 @@
+# tests/test_async_dao.py
+import asyncio
+import pytest
+from src.dao.async_dao import AsyncCustomerDAO
+from src.dao.base_dao import DuplicateKeyError
+from src.storage.sqlite_client import AsyncClientAdapter, SQLiteClient
+
+def test_duplicate_email_raises_duplicate_key_error():
+    dao = AsyncCustomerDAO(AsyncClientAdapter(SQLiteClient(":memory:")))
+
+    async def run():
+        first = await dao.create_customer("Asha", "asha@example.com", "9000000000")
+        other = await dao.create_customer("Ravi", "ravi@example.com", "9000000001")
+        with pytest.raises(DuplicateKeyError):
+            await dao.create_customer("Asha K", "asha@example.com", "9000000002")
+        with pytest.raises(DuplicateKeyError):
+            await dao.create_customers([{"name": "A", "email": "a@example.com", "phone": "1"},
+                                        {"name": "R", "email": "ravi@example.com", "phone": "2"}])
+        with pytest.raises(DuplicateKeyError):
+            await dao.update_customer(other["cust_id"], {"email": first["email"]})
+    asyncio.run(run())
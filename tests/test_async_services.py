@@ -0,0 +1,29 @@
+# tests/test_async_services.py
+import asyncio
+from src.dao.async_dao import AsyncBookingDAO, AsyncCustomerDAO, AsyncEventDAO, AsyncPaymentDAO
+from src.dao.rollup_dao import RollupDAO
+from src.services.async_services import AsyncBookingService, AsyncPaymentService
+from src.services.booking_service import BookingError
+from src.storage.sqlite_client import AsyncClientAdapter, SQLiteClient
+
+def make_service():
+    sync_client = SQLiteClient(":memory:")
+    client = AsyncClientAdapter(sync_client)
+    booking_dao = AsyncBookingDAO(client)
+    rollups = RollupDAO(sync_client)
+    payments = AsyncPaymentService(AsyncPaymentDAO(client), booking_dao, rollups)
+    return AsyncBookingService(booking_dao, AsyncEventDAO(client), AsyncCustomerDAO(client), payments,
+                               rollups=rollups)
+
+def test_concurrent_cancels_release_seats_once():
+    service = make_service()
+
+    async def run():
+        customer = await service.customer_dao.create_customer("Asha", "asha@example.com", "9000000000")
+        event = await service.event_dao.create_event("Concert", "2030-01-01", "Pune", 10, 40.0)
+        booking = await service.book_event(customer["cust_id"], event["event_id"], 4)
+        outcomes = await asyncio.gather(*(service.cancel_booking(booking["booking_id"]) for _ in range(4)),
+                                        return_exceptions=True)
+        assert sum(not isinstance(o, BookingError) for o in outcomes) == 1
+        assert (await service.event_dao.get_event_by_id(event["event_id"], ["capacity"]))["capacity"] == 10
+    asyncio.run(run())
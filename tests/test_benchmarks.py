@@ -0,0 +1,23 @@
+# tests/test_benchmarks.py
+import pytest
+from benchmarks.run import CountingClient, measure, run_scale
+from src.storage.sqlite_client import SQLiteClient
+
+def test_small_run_measures_every_case():
+    result = run_scale(200, iterations=3, report_iterations=1, db=":memory:", seed_value=1)
+    assert result["rows"]["bookings"] == 200
+    skipped = [c["name"] for c in result["cases"] if "skipped" in c]
+    assert skipped == [] and all(c["round_trips_per_op"] >= 0 for c in result["cases"])
+
+def test_only_missing_features_are_skipped():
+    counter = CountingClient(SQLiteClient(":memory:"))
+
+    def missing_rpc(_):
+        raise NotImplementedError("report_event_seats")
+
+    def broken(_):
+        raise ValueError("bug")
+
+    assert "skipped" in measure("rpc", counter, missing_rpc, 1)
+    with pytest.raises(ValueError):
+        measure("broken", counter, broken, 1)
@@ -0,0 +1,115 @@
+# tests/test_booking_service.py
+import threading
+from src.dao.booking_dao import BookingDAO
+from src.dao.customer_dao import CustomerDAO
+from src.dao.event_dao import EventDAO
+from src.dao.lookup_cache import LookupCache
+from src.dao.payment_dao import PaymentDAO
+from src.dao.rollup_dao import RollupDAO
+from src.services.booking_service import BookingService, BookingError, NOT_ENOUGH_SEATS
+from src.services.payment_service import PaymentService
+from src.storage.sqlite_client import SQLiteClient
+
+def make_service():
+    client = SQLiteClient(":memory:")
+    cache = LookupCache()
+    booking_dao, event_dao = BookingDAO(client, cache), EventDAO(client, cache)
+    customer_dao, payment_dao = CustomerDAO(client, cache), PaymentDAO(client, cache)
+    rollups = RollupDAO(client)
+    payments = PaymentService(payment_dao, booking_dao, rollups)
+    return BookingService(booking_dao, event_dao, customer_dao, payments, rollups=rollups)
+
+def test_concurrent_cancels_release_seats_once():
+    service = make_service()
+    customer = service.customer_dao.create_customer("Asha", "asha@example.com", "9000000000")
+    event = service.event_dao.create_event("Concert", "2030-01-01", "Pune", 10, 40.0)
+    booking = service.book_event(customer["cust_id"], event["event_id"], 4)
+    # Every worker sees the booking as BOOKED in the lookup cache
+    service.booking_dao.get_booking_by_id(booking["booking_id"])
+
+    start = threading.Barrier(4)
+    outcomes = []
+
+    def cancel():
+        start.wait()
+        try:
+            service.cancel_booking(booking["booking_id"])
+            outcomes.append("cancelled")
+        except BookingError:
+            outcomes.append("rejected")
+
+    workers = [threading.Thread(target=cancel) for _ in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert outcomes.count("cancelled") == 1
+    assert service.event_dao.get_event_by_id(event["event_id"], ["capacity"])["capacity"] == 10
+
+def test_concurrent_bookings_never_oversell():
+    service = make_service()
+    customer = service.customer_dao.create_customer("Asha", "asha@example.com", "9000000000")
+    event = service.event_dao.create_event("Concert", "2030-01-01", "Pune", 10, 40.0)
+    start = threading.Barrier(8)
+    booked = []
+
+    def book():
+        start.wait()
+        try:
+            booked.append(service.book_event(customer["cust_id"], event["event_id"], 3))
+        except BookingError:
+            pass
+
+    workers = [threading.Thread(target=book) for _ in range(8)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    left = service.event_dao.get_event_by_id(event["event_id"], ["capacity"])["capacity"]
+    assert 1 <= len(booked) <= 3
+    assert left == 10 - 3 * len(booked)
+    rows = list(service.booking_dao.iter_bookings_for_event(event["event_id"], ["seats"]))
+    assert sum(r["seats"] for r in rows) == 3 * len(booked)
+
+def setup_event(service, capacity=10):
+    customer = service.customer_dao.create_customer("Asha", "asha@example.com", "9000000000")
+    event = service.event_dao.create_event("Concert", "2030-01-01", "Pune", capacity, 40.0)
+    return customer["cust_id"], event["event_id"]
+
+def test_bulk_cancel_and_cascade_delete():
+    service = make_service()
+    cust_id, event_id = setup_event(service)
+    ids = [service.book_event(cust_id, event_id, 2)["booking_id"] for _ in range(4)]
+    service.payment_service.process_payment(ids[0], "Card")
+
+    cancelled = service.cancel_bookings(ids[:2] + ids[:1])
+    assert sorted(b["booking_id"] for b in cancelled) == ids[:2]
+    assert service.event_dao.get_event_by_id(event_id, ["capacity"])["capacity"] == 6
+    assert service.payment_service.dao.get_payment_by_booking(ids[0], ["status"])["status"] == "REFUNDED"
+
+    result = service.delete_event_cascade(event_id)
+    assert (result["bookings_deleted"], result["payments_deleted"]) == (4, 4)
+    assert service.booking_dao.get_bookings_by_ids(ids) == {}
+    assert service.payment_service.dao.get_payments_by_bookings(ids) == {}
+    assert service.event_dao.get_event_by_id(event_id) is None
+
+def test_book_many_reports_invalid_requests_and_books_the_rest():
+    service = make_service()
+    cust_id, event_id = setup_event(service, capacity=5)
+    requests = [{"cust_id": cust_id, "event_id": event_id, "seats": 2},
+                {"cust_id": cust_id, "event_id": event_id, "seats": 4},  # only 3 left after the first
+                {"cust_id": 999, "event_id": event_id, "seats": 1},
+                {"cust_id": cust_id, "event_id": event_id, "seats": 3}]
+
+    atomic = service.book_many(requests, atomic=True)
+    assert all(r["booking"] is None for r in atomic)
+    assert service.event_dao.get_event_by_id(event_id, ["capacity"])["capacity"] == 5
+
+    results = service.book_many(requests)
+    assert [r["error"] for r in results] == [None, NOT_ENOUGH_SEATS, "Customer not found: 999", None]
+    assert service.event_dao.get_event_by_id(event_id, ["capacity"])["capacity"] == 0
+    payments = service.payment_service.dao.get_payments_by_bookings(
+        r["booking"]["booking_id"] for r in results if r["booking"])
+    assert sorted(p["amount"] for p in payments.values()) == [80.0, 120.0]
@@ -0,0 +1,40 @@
+# tests/test_change_bus.py
+from src.dao.change_bus import ChangeBus, CHANGE_BUS
+from src.dao.change_feed import LocalChangeFeed
+from src.services.event_service import EventService
+from tests.test_booking_service import make_service
+
+def test_dao_writes_reach_subscribers():
+    events = []
+    sub = CHANGE_BUS.subscribe(events.append, tables=["events"], sources=["dao"])
+    try:
+        service = EventService(make_service().event_dao)
+        event = service.add_event("Concert", "2030-01-01", "Pune", 10, 40.0)
+        service.update_event(event["event_id"], {"price": 50.0})
+        service.delete_event(event["event_id"])
+    finally:
+        CHANGE_BUS.unsubscribe(sub)
+    assert [(e.op, e.key) for e in events] == [(op, event["event_id"]) for op in ("insert", "update", "delete")]
+    assert events[1].new["price"] == 50.0
+
+def test_booking_publishes_seat_and_payment_changes():
+    service = make_service()
+    customer = service.customer_dao.create_customer("Asha", "asha@example.com", "9000000000")
+    event = service.event_dao.create_event("Concert", "2030-01-01", "Pune", 10, 40.0)
+    events = []
+    sub = CHANGE_BUS.subscribe(events.append, sources=["dao"])
+    try:
+        service.book_event(customer["cust_id"], event["event_id"], 3)
+    finally:
+        CHANGE_BUS.unsubscribe(sub)
+    assert {(e.table, e.op) for e in events} >= {("bookings", "insert"), ("events", "update"), ("payments", "insert")}
+
+def test_feed_events_are_filtered_by_source():
+    bus = ChangeBus()
+    feed = LocalChangeFeed(bus, ["events"])
+    local, remote = [], []
+    bus.subscribe(local.append, sources=["dao"])
+    bus.subscribe(remote.append, sources=["realtime"])
+    feed.emit_row("events", "update", {"event_id": 1, "capacity": 5}, {"event_id": 1})
+    feed.emit_row("bookings", "insert", {"booking_id": 1})  # not followed by this feed
+    assert local == [] and [(e.table, e.op, e.key) for e in remote] == [("events", "update", 1)]
@@ -0,0 +1,15 @@
+# tests/test_config.py
+from src.config import close_supabase, get_supabase
+from src.dao.booking_dao import BookingDAO
+from src.dao.customer_dao import CustomerDAO
+
+def test_daos_share_one_client():
+    # conftest.py selects the in-memory backend
+    client = get_supabase()
+    assert get_supabase() is client
+    assert CustomerDAO().client is client and BookingDAO().client is client
+
+def test_close_builds_a_fresh_client():
+    client = get_supabase()
+    close_supabase()
+    assert get_supabase() is not client
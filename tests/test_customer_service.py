@@ -0,0 +1,36 @@
+# tests/test_customer_service.py
+import pytest
+from src.dao.customer_dao import CustomerDAO
+from src.dao.lookup_cache import LookupCache
+from src.services.customer_service import CustomerService, CustomerError
+from src.storage.instrumentation import InstrumentedClient, QueryMetrics
+from src.storage.sqlite_client import SQLiteClient
+
+def make_service():
+    metrics = QueryMetrics(enabled=True)
+    return CustomerService(CustomerDAO(InstrumentedClient(SQLiteClient(":memory:"), metrics), LookupCache())), metrics
+
+def test_known_duplicates_are_rejected_without_a_write():
+    service, metrics = make_service()
+    service.add_customer("Asha", " Asha@Example.com ", "9000000000")
+    before = metrics.total_requests()
+    with pytest.raises(CustomerError):
+        service.add_customer("Asha K", "asha@example.com", "9000000001")
+    assert metrics.total_requests() == before
+
+def test_the_unique_constraint_catches_what_the_index_missed():
+    service, _ = make_service()
+    other = CustomerService(service.dao)  # another process, whose index does not know the email
+    other.emails.contains("warm@example.com")
+    service.add_customer("Asha", "asha@example.com", "9000000000")
+    with pytest.raises(CustomerError):
+        other.add_customer("Asha K", "asha@example.com", "9000000001")
+    assert other.emails.contains("asha@example.com")
+
+def test_changed_emails_are_freed():
+    service, _ = make_service()
+    customer = service.add_customer("Asha", "asha@example.com", "9000000000")
+    service.update_customer(customer["cust_id"], {"email": "asha.k@example.com"})
+    service.add_customer("Someone", "asha@example.com", "9000000001")
+    with pytest.raises(CustomerError):
+        service.update_customer(customer["cust_id"], {"email": "ASHA@example.com"})
@@ -0,0 +1,46 @@
+# tests/test_dao.py
+from src.dao.event_dao import EventDAO
+from src.storage.instrumentation import InstrumentedClient, QueryMetrics
+from src.storage.sqlite_client import SQLiteClient
+
+def counted_dao():
+    metrics = QueryMetrics(enabled=True)
+    return EventDAO(InstrumentedClient(SQLiteClient(":memory:"), metrics)), metrics
+
+def test_writes_return_rows_in_one_request():
+    dao, metrics = counted_dao()
+    event = dao.create_event("Concert", "2030-01-01", "Pune", 10, 40.0)
+    updated = dao.update_event(event["event_id"], {"price": 50.0})
+    deleted = dao.delete_event(event["event_id"])
+    assert metrics.total_requests() == 3
+    assert event["title"] == "Concert" and updated["price"] == 50.0 and deleted["event_id"] == event["event_id"]
+    assert dao.update_event(event["event_id"], {"price": 60.0}) is None
+
+def test_bulk_lookup_uses_one_request_per_chunk():
+    dao, metrics = counted_dao()
+    dao.create_events([{"title": f"Event {i}", "date": "2030-01-01", "location": "Pune", "capacity": 5,
+                        "price": 10.0} for i in range(450)])
+    before = metrics.total_requests()
+    ids = list(range(1, 451)) + [1, None, 10_000]
+    events = dao.get_events_by_ids(ids, ["title"])
+    assert metrics.total_requests() - before == 3  # 451 distinct ids in chunks of 200
+    assert len(events) == 450 and events[7] == {"event_id": 7, "title": "Event 6"}
+
+def test_keyset_pages_cover_every_row_once():
+    dao, _ = counted_dao()
+    dao.create_events([{"title": f"Event {i}", "date": "2030-01-01", "location": "Pune", "capacity": i % 3,
+                        "price": 10.0} for i in range(25)])
+    ids = [e["event_id"] for e in dao.iter_events(page_size=4, columns=["event_id"])]
+    assert ids == list(range(1, 26))
+    first = dao.fetch_page(None, 10, where={"capacity": 0})
+    second = dao.fetch_page(first[-1]["event_id"], 10, where={"capacity": 0})
+    assert len(first) == 9 and second == []
+
+def test_projected_reads_return_only_the_requested_columns():
+    dao, _ = counted_dao()
+    event = dao.create_event("Concert", "2030-01-01", "Pune", 10, 40.0)
+    assert dao.get_event_by_id(event["event_id"], ["title", "price"]) == {"title": "Concert", "price": 40.0}
+    assert dao.list_events(columns=["title"]) == [{"title": "Concert"}]
+    # Keyed reads always carry the key, so callers can index the result
+    assert dao.get_events_by_ids([event["event_id"]], ["capacity"]) == \
+        {event["event_id"]: {"event_id": event["event_id"], "capacity": 10}}
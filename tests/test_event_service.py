@@ -0,0 +1,23 @@
+# tests/test_event_service.py
+import pytest
+from src.dao.event_dao import EventDAO
+from src.dao.lookup_cache import LookupCache
+from src.dao.table_versions import TABLE_VERSIONS
+from src.services.event_service import EventService, EventError
+from src.storage.sqlite_client import SQLiteClient
+
+def make_service():
+    return EventService(EventDAO(SQLiteClient(":memory:"), LookupCache()))
+
+def test_add_event_bumps_the_events_version():
+    service = make_service()
+    before = TABLE_VERSIONS.get(["events"])
+    event = service.add_event("Concert", "2030-01-01", "Pune", 10, 40.0)
+    assert TABLE_VERSIONS.get(["events"]) != before
+    assert service.get_event(event["event_id"])["title"] == "Concert"
+
+def test_add_event_validates_before_writing():
+    service = make_service()
+    with pytest.raises(EventError):
+        service.add_event("Concert", "2030-01-01", "Pune", 0, 40.0)
+    assert service.list_events() == []
@@ -0,0 +1,73 @@
+# tests/test_export_import.py
+import json
+from src.services.export_service import ExportService
+from src.services.import_service import ImportService
+from tests.test_booking_service import make_service
+
+def export_service(service, page_size=2):
+    return ExportService(service.customer_dao, service.event_dao, service.booking_dao,
+                         service.payment_service.dao, page_size=page_size)
+
+def import_service(service):
+    return ImportService(service.customer_dao, service.event_dao, service.booking_dao,
+                         batch_size=2, booking_service=service)
+
+def test_customers_and_events_round_trip(tmp_path):
+    source = make_service()
+    for i in range(5):
+        source.customer_dao.create_customer(f"Customer {i}", f"c{i}@example.com", f"900000000{i}",
+                                            "Pune" if i % 2 else None)
+        source.event_dao.create_event(f"Event {i}", "2030-01-0%d" % (i + 1), "Pune", 10 + i, 40.0 + i)
+    exporter = export_service(source)
+    assert exporter.export("customers", str(tmp_path / "customers.csv")) == 5
+    assert exporter.export("events", str(tmp_path / "events.jsonl")) == 5
+
+    target = make_service()
+    importer = import_service(target)
+    assert importer.import_customers(str(tmp_path / "customers.csv"))["inserted"] == 5
+    assert importer.import_events(str(tmp_path / "events.jsonl"))["inserted"] == 5
+
+    def rows(dao_list, columns):
+        return sorted(tuple(r[c] for c in columns) for r in dao_list(100))
+    customer_columns = ["name", "email", "phone", "city"]
+    event_columns = ["title", "date", "location", "capacity", "price"]
+    assert rows(target.customer_dao.list_customers, customer_columns) == \
+        rows(source.customer_dao.list_customers, customer_columns)
+    assert rows(target.event_dao.list_events, event_columns) == rows(source.event_dao.list_events, event_columns)
+
+def test_bookings_export_joins_event_and_customer(tmp_path):
+    service = make_service()
+    customer = service.customer_dao.create_customer("Asha", "asha@example.com", "9000000000")
+    event = service.event_dao.create_event("Concert", "2030-01-01", "Pune", 10, 40.0)
+    for _ in range(3):
+        service.book_event(customer["cust_id"], event["event_id"], 1)
+    path = tmp_path / "bookings.jsonl"
+    assert export_service(service).export("bookings", str(path)) == 3
+    rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert {(r["event_title"], r["customer_email"], r["seats"]) for r in rows} == \
+        {("Concert", "asha@example.com", 1)}
+
+def test_bad_rows_are_reported_by_line(tmp_path):
+    service = make_service()
+    customer = service.customer_dao.create_customer("Asha", "asha@example.com", "9000000000")
+    event = service.event_dao.create_event("Concert", "2030-01-01", "Pune", 5, 40.0)
+    path = tmp_path / "bookings.jsonl"
+    rows = [{"cust_id": customer["cust_id"], "event_id": event["event_id"], "seats": 2},
+            {"cust_id": customer["cust_id"], "event_id": event["event_id"], "seats": 2, "status": "CANCELLED"},
+            {"cust_id": customer["cust_id"], "event_id": event["event_id"], "seats": 2},
+            {"cust_id": customer["cust_id"], "event_id": event["event_id"], "seats": 2},  # over capacity
+            {"cust_id": 999, "event_id": event["event_id"], "seats": 1}]
+    path.write_text("\n".join(json.dumps(r) for r in rows) + "\n{not json\n", encoding="utf-8")
+
+    result = import_service(service).import_bookings(str(path))
+    assert result["inserted"] == 2
+    assert [e["line"] for e in result["errors"]] == [2, 4, 5, 6]
+    assert service.event_dao.get_event_by_id(event["event_id"], ["capacity"])["capacity"] == 1
+
+def test_duplicate_emails_in_a_file_are_rejected(tmp_path):
+    path = tmp_path / "customers.csv"
+    path.write_text("name,email,phone\nAsha,asha@example.com,1\nAsha K,ASHA@example.com,2\nRavi,,3\n",
+                    encoding="utf-8")
+    result = import_service(make_service()).import_customers(str(path))
+    assert result["inserted"] == 1
+    assert [e["line"] for e in result["errors"]] == [3, 4]
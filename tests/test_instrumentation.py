@@ -0,0 +1,27 @@
+# tests/test_instrumentation.py
+import pytest
+from postgrest.exceptions import APIError
+from src.storage.instrumentation import InstrumentedClient, QueryMetrics
+from src.storage.sqlite_client import SQLiteClient
+
+def test_requests_are_recorded_per_table_and_operation():
+    metrics = QueryMetrics(enabled=True)
+    client = InstrumentedClient(SQLiteClient(":memory:"), metrics)
+    row = {"name": "Asha", "email": "asha@example.com", "phone": "9000000000"}
+    client.table("customers").insert(row).execute()
+    client.table("customers").select("*").eq("email", "asha@example.com").execute()
+    with pytest.raises(APIError):
+        client.table("customers").insert(row).execute()
+
+    stats = {(r["table"], r["op"]): r for r in metrics.snapshot()}
+    assert stats[("customers", "insert")]["requests"] == 2 and stats[("customers", "insert")]["errors"] == 1
+    assert stats[("customers", "select")]["rows"] == 1
+    assert 'db_request_duration_seconds_count{table="customers",op="select"} 1' in metrics.prometheus()
+
+def test_disabled_metrics_leave_queries_untouched():
+    metrics = QueryMetrics()
+    sqlite = SQLiteClient(":memory:")
+    client = InstrumentedClient(sqlite, metrics)
+    assert type(client.table("events")) is type(sqlite.table("events"))
+    client.table("events").select("*").execute()
+    assert metrics.total_requests() == 0
@@ -0,0 +1,29 @@
+# tests/test_lookup_cache.py
+from src.dao.event_dao import EventDAO
+from src.dao.lookup_cache import LookupCache
+from src.storage.instrumentation import InstrumentedClient, QueryMetrics
+from src.storage.sqlite_client import SQLiteClient
+
+def test_lru_eviction_and_ttl():
+    cache = LookupCache(max_size=2, ttls={"events": 0.0})
+    cache.put("customers", 1, {"cust_id": 1})
+    cache.put("customers", 2, {"cust_id": 2})
+    cache.get("customers", 1)
+    cache.put("customers", 3, {"cust_id": 3})
+    assert cache.get("customers", 2) is None and cache.get("customers", 1) == {"cust_id": 1}
+    assert cache.stats()["evictions"] == 1
+    cache.put("events", 1, {"event_id": 1})
+    assert cache.get("events", 1) is None  # expired at once
+
+def test_point_lookups_are_served_from_cache_until_written():
+    metrics = QueryMetrics(enabled=True)
+    dao = EventDAO(InstrumentedClient(SQLiteClient(":memory:"), metrics), LookupCache())
+    event = dao.create_event("Concert", "2030-01-01", "Pune", 10, 40.0)
+    dao.get_event_by_id(event["event_id"])
+    before = metrics.total_requests()
+    assert dao.get_event_by_id(event["event_id"])["price"] == 40.0
+    assert metrics.total_requests() == before
+    dao.update_event(event["event_id"], {"price": 50.0})
+    assert dao.get_event_by_id(event["event_id"])["price"] == 50.0
+    dao.delete_event(event["event_id"])
+    assert dao.get_event_by_id(event["event_id"]) is None
@@ -0,0 +1,48 @@
+# tests/test_payment_service.py
+from datetime import date
+import pytest
+from src.services.payment_service import PaymentError, OUTCOME_ALREADY_PAID, OUTCOME_ALREADY_REFUNDED, \
+    OUTCOME_DUPLICATE, OUTCOME_INVALID, OUTCOME_NOT_FOUND, OUTCOME_PAID
+from tests.test_booking_service import make_service
+
+def book(service, seats=2):
+    customer = service.customer_dao.create_customer("Asha", "asha@example.com", "9000000000")
+    event = service.event_dao.create_event("Concert", "2030-01-01", "Pune", 10, 40.0)
+    return [service.book_event(customer["cust_id"], event["event_id"], seats)["booking_id"] for _ in range(3)]
+
+def revenue(service):
+    today = date.today()
+    return service.payment_service.rollups.revenue_between(today, today)
+
+def test_bulk_payments_report_each_outcome():
+    service = make_service()
+    payments = service.payment_service
+    pending, paid, refunded = book(service)
+    payments.process_payment(paid, "Card")
+    payments.refund_payment(refunded)
+
+    results = payments.process_payments([
+        {"booking_id": pending, "method": "UPI"},
+        {"booking_id": paid, "method": "Cash"},
+        {"booking_id": refunded, "method": "Cash"},
+        {"booking_id": pending, "method": "UPI"},
+        {"booking_id": 999, "method": "Cash"},
+        {"booking_id": "x", "method": "Cash"},
+    ])
+
+    assert [r["outcome"] for r in results] == [OUTCOME_PAID, OUTCOME_ALREADY_PAID, OUTCOME_ALREADY_REFUNDED,
+                                               OUTCOME_DUPLICATE, OUTCOME_NOT_FOUND, OUTCOME_INVALID]
+    assert payments.dao.get_payment_by_booking(refunded, ["status"])["status"] == "REFUNDED"
+    # Two 80.0 payments went through, the refunded one is not added back
+    assert revenue(service) == 160.0
+
+def test_refunded_payment_cannot_be_paid():
+    service = make_service()
+    payments = service.payment_service
+    booking_id = book(service)[0]
+    payments.refund_payment(booking_id)
+
+    with pytest.raises(PaymentError):
+        payments.process_payment(booking_id, "Card")
+    assert payments.dao.get_payment_by_booking(booking_id, ["status"])["status"] == "REFUNDED"
+    assert revenue(service) == 0
@@ -0,0 +1,57 @@
+# tests/test_report_cache.py
+import json
+from src.dao.table_versions import TableVersions
+from src.services.report_cache import ReportCache, VERSIONS_FILE
+
+def restart(directory):
+    """A new process: fresh counters, same cache directory. Nothing is saved on the way out."""
+    return ReportCache(directory=str(directory), versions=TableVersions())
+
+def counting(value):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return value
+    return compute, calls
+
+def test_memory_entries_follow_table_versions():
+    versions = TableVersions()
+    cache = ReportCache(versions=versions)
+    compute, calls = counting({"seats": 3})
+    assert cache.get_or_compute("top", {}, ["bookings"], compute) == {"seats": 3}
+    assert cache.get_or_compute("top", {}, ["bookings"], compute) == {"seats": 3}
+    versions.bump("customers")
+    cache.get_or_compute("top", {}, ["bookings"], compute)
+    assert len(calls) == 1
+    versions.bump("bookings")
+    cache.get_or_compute("top", {}, ["bookings"], compute)
+    assert len(calls) == 2
+
+def test_disk_entries_survive_a_restart(tmp_path):
+    cache = ReportCache(directory=str(tmp_path), versions=TableVersions())
+    cache.get_or_compute("top", {"limit": 5}, ["bookings", "events"], lambda: [1, 2])
+    compute, calls = counting([9])
+    cache = restart(tmp_path)
+    assert cache.get_or_compute("top", {"limit": 5}, ["bookings", "events"], compute) == [1, 2]
+    assert calls == [] and cache.stats()["disk_hits"] == 1
+
+def test_write_before_a_crash_invalidates_disk_entries(tmp_path):
+    versions = TableVersions()
+    cache = ReportCache(directory=str(tmp_path), versions=versions)
+    cache.get_or_compute("top", {}, ["bookings"], lambda: ["old"])
+    versions.bump("bookings")  # a DAO write, then the process dies
+    cache = restart(tmp_path)
+    assert cache.get_or_compute("top", {}, ["bookings"], lambda: ["new"]) == ["new"]
+
+def test_writes_to_other_tables_leave_the_versions_file_alone(tmp_path):
+    versions = TableVersions()
+    cache = ReportCache(directory=str(tmp_path), versions=versions)
+    cache.get_or_compute("top", {}, ["bookings"], lambda: [])
+    path = tmp_path / VERSIONS_FILE
+    saved = json.loads(path.read_text())
+    path.unlink()
+    versions.bump("customers")
+    assert not path.exists()
+    versions.bump("bookings")
+    assert json.loads(path.read_text())["bookings"] == saved["bookings"] + 1
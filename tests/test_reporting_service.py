@@ -0,0 +1,54 @@
+# tests/test_reporting_service.py
+import asyncio
+from src.dao.async_dao import AsyncReportDAO
+from src.dao.report_dao import ReportDAO
+from src.services.async_services import AsyncReportingService
+from src.services.reporting_service import ReportingService
+from src.storage.sqlite_client import AsyncClientAdapter
+from tests.test_booking_service import make_service
+
+def sell(service):
+    """Three bookings of one event: one paid, one paid then refunded, one pending."""
+    customer = service.customer_dao.create_customer("Asha", "asha@example.com", "9000000000")
+    event = service.event_dao.create_event("Concert", "2030-01-01", "Pune", 10, 40.0)
+    paid, refunded, _ = (service.book_event(customer["cust_id"], event["event_id"], 2)["booking_id"]
+                         for _ in range(3))
+    service.payment_service.process_payment(paid, "Card")
+    service.payment_service.process_payment(refunded, "UPI")
+    service.payment_service.refund_payment(refunded)
+    # Repricing the event must not change the revenue already taken
+    service.event_dao.update_event(event["event_id"], {"price": 100.0})
+    return service
+
+def test_revenue_without_rollups_counts_paid_payments():
+    service = sell(make_service())
+    client = service.booking_dao.client
+    reports = ReportingService(service.booking_dao, service.event_dao, service.customer_dao,
+                               ReportDAO(client), service.rollups)
+    assert reports.total_revenue_last_month() == 80.0
+    service.rollups.available = False
+    assert reports.total_revenue_last_month() == 80.0
+
+def test_async_revenue_without_rollups_counts_paid_payments():
+    service = sell(make_service())
+    service.rollups.available = False
+    reports = AsyncReportingService(AsyncReportDAO(AsyncClientAdapter(service.booking_dao.client)), service.rollups)
+    assert asyncio.run(reports.total_revenue_last_month()) == 80.0
+
+def test_reports_default_to_the_injected_client():
+    service = make_service()
+    reports = ReportingService(service.booking_dao, service.event_dao, service.customer_dao)
+    assert reports.report_dao.client is service.booking_dao.client
+    assert reports.rollups.client is service.booking_dao.client
+    sell(service)
+    assert reports.top_selling_events() == [{"event": "Concert", "seats_sold": 6}]
+
+def test_columnar_reports_match_the_database():
+    service = sell(make_service())
+    args = (service.booking_dao, service.event_dao, service.customer_dao)
+    rows = ReportingService(*args)
+    columnar = ReportingService(*args, columnar=True)
+    columnar.snapshot_ttl = 0  # reload on every report
+    for report in ("top_selling_events", "total_revenue_last_month", "total_bookings_per_customer",
+                   "customers_with_multiple_bookings"):
+        assert getattr(columnar, report)() == getattr(rows, report)(), report
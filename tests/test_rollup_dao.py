@@ -0,0 +1,48 @@
+# tests/test_rollup_dao.py
+from datetime import date
+from types import SimpleNamespace
+from src.dao.rollup_dao import RollupDAO
+from src.storage.sqlite_client import SQLiteClient
+from tests.test_booking_service import make_service
+
+class BumpRpcClient(SQLiteClient):
+    """SQLite with a deployed bump_event_daily_stats that returns its bucket count."""
+    def __init__(self):
+        super().__init__(":memory:")
+        self.bumped = []
+
+    def rpc(self, fn, params=None):
+        if fn != "bump_event_daily_stats":
+            return super().rpc(fn, params)
+        self.bumped.append(params["p_deltas"])
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=len(params["p_deltas"])))
+
+def stats(rollups):
+    rows = rollups._sb.table(rollups.table).select("*").execute().data
+    return sorted((r["day"], r["event_id"], r["bookings"], r["seats_booked"], r["cancellations"],
+                   r["seats_cancelled"], r["revenue"]) for r in rows)
+
+def test_record_uses_the_rpc_once():
+    client = BumpRpcClient()
+    rollups = RollupDAO(client)
+    rollups.record([{"day": "2030-01-01", "event_id": 1, "bookings": 1},
+                    {"day": "2030-01-01", "event_id": 1, "seats_booked": 3}])
+    assert client.bumped == [[{"day": "2030-01-01", "event_id": 1, "bookings": 1, "seats_booked": 3}]]
+    # The count came back, so neither the Python fallback ran nor was the RPC marked missing
+    assert stats(rollups) == []
+    assert "bump_event_daily_stats" not in rollups._missing_rpcs
+
+def test_rebuild_matches_live_counters():
+    service = make_service()
+    customer = service.customer_dao.create_customer("Asha", "asha@example.com", "9000000000")
+    event = service.event_dao.create_event("Concert", "2030-01-01", "Pune", 10, 40.0)
+    kept = service.book_event(customer["cust_id"], event["event_id"], 2)
+    cancelled = service.book_event(customer["cust_id"], event["event_id"], 3)
+    service.payment_service.process_payment(kept["booking_id"], "Card")
+    service.cancel_booking(cancelled["booking_id"])
+
+    rollups = service.rollups
+    live = stats(rollups)
+    assert rollups.rebuild() == 1
+    assert stats(rollups) == live
+    assert rollups.revenue_between(date.today(), date.today()) == 80.0
@@ -0,0 +1,22 @@
+# tests/test_search_index.py
+from src.services.search_index import PrefixIndex
+
+EVENTS = [{"event_id": 1, "title": "Jazz Night", "location": "Pune"},
+          {"event_id": 2, "title": "Jazz Brunch", "location": "Mumbai"},
+          {"event_id": 3, "title": "Rock Night", "location": "Pune"}]
+
+def test_every_query_word_matches_a_word_prefix():
+    index = PrefixIndex.build(EVENTS, "event_id", ["title", "location"])
+    assert [e["event_id"] for e in index.search("jaz")] == [1, 2]
+    assert [e["event_id"] for e in index.search("NIGHT pu")] == [1, 3]
+    assert [e["event_id"] for e in index.search("jaz pu")] == [1]
+    assert index.search("azz") == []
+    assert len(index.search("", limit=2)) == 2
+
+def test_changes_are_reindexed():
+    index = PrefixIndex.build(EVENTS, "event_id", ["title", "location"])
+    index.add({"event_id": 1, "title": "Blues Night", "location": "Pune"})
+    index.add({"event_id": 4, "title": "Jazz Picnic", "location": "Goa"})
+    index.remove(2)
+    assert [e["event_id"] for e in index.search("jazz")] == [4]
+    assert index.label(1) == "Blues Night Pune" and index.label(9) == "9"
@@ -0,0 +1,30 @@
+# tests/test_seat_inventory.py
+from src.dao.event_dao import EventDAO
+from src.services.seat_inventory import SeatInventory
+from src.storage.instrumentation import InstrumentedClient, QueryMetrics
+from src.storage.sqlite_client import SQLiteClient
+
+def make_inventory(capacity):
+    metrics = QueryMetrics(enabled=True)
+    dao = EventDAO(InstrumentedClient(SQLiteClient(":memory:"), metrics))
+    event = dao.create_event("Concert", "2030-01-01", "Pune", capacity, 40.0)
+    return SeatInventory(dao), event["event_id"], metrics
+
+def test_seats_are_read_once_per_refresh_interval():
+    inventory, event_id, metrics = make_inventory(10)
+    before = metrics.total_requests()
+    assert inventory.seats_left(event_id) == 10
+    inventory.adjust(event_id, -4)
+    assert inventory.seats_left(event_id) == 6 and not inventory.can_fit(event_id, 7)
+    assert metrics.total_requests() - before == 1
+    assert inventory.seats_left(999) is None
+
+def test_shortage_rejects_only_requests_that_cannot_fit():
+    inventory, event_id, _ = make_inventory(10)
+    inventory.record_shortage(event_id, 3)  # someone else took the seats
+    assert inventory.seats_left(event_id) == 2
+    assert inventory.can_fit(event_id, 2) and not inventory.can_fit(event_id, 3)
+    inventory.reconcile({"event_id": event_id, "capacity": 8})
+    assert inventory.can_fit(event_id, 8)
+    inventory.invalidate(event_id)
+    assert inventory.seats_left(event_id) == 10
@@ -0,0 +1,38 @@
+# tests/test_sqlite_client.py
+import pytest
+from postgrest.exceptions import APIError
+from src.dao.base_dao import UNIQUE_VIOLATION
+from src.storage.sqlite_client import SQLiteClient
+
+@pytest.fixture
+def client():
+    client = SQLiteClient(":memory:")
+    client.table("events").insert([
+        {"title": f"Event {i}", "date": "2030-01-01", "location": "Pune", "capacity": i, "price": 10.0}
+        for i in range(1, 6)]).execute()
+    return client
+
+def test_filters_order_and_limit(client):
+    rows = client.table("events").select("event_id,capacity").gte("capacity", 2).neq("capacity", 4)\
+               .in_("capacity", [1, 2, 3, 4, 5]).order("capacity", desc=True).limit(2).execute().data
+    assert rows == [{"event_id": 5, "capacity": 5}, {"event_id": 3, "capacity": 3}]
+    assert client.table("events").select("*").in_("event_id", []).execute().data == []
+
+def test_writes_return_the_affected_rows(client):
+    updated = client.table("events").update({"capacity": 0}).lt("capacity", 3).execute().data
+    assert sorted(r["event_id"] for r in updated) == [1, 2]
+    deleted = client.table("events").delete().eq("capacity", 0).execute().data
+    assert len(deleted) == 2 and all(r["capacity"] == 0 for r in deleted)
+    # A conditional update that matches nothing returns no rows
+    assert client.table("events").update({"capacity": 9}).eq("event_id", 1).execute().data == []
+
+def test_constraint_errors_use_postgres_codes(client):
+    row = {"name": "Asha", "email": "asha@example.com", "phone": "9000000000"}
+    client.table("customers").insert(row).execute()
+    with pytest.raises(APIError) as e:
+        client.table("customers").insert(row).execute()
+    assert e.value.code == UNIQUE_VIOLATION
+
+def test_rpc_is_left_to_the_dao_fallbacks(client):
+    with pytest.raises(NotImplementedError):
+        client.rpc("report_event_seats", {"p_limit": 5})